@@ -11,6 +11,7 @@ import io
 from datetime import datetime
 from config import *
 from ai_models import AIModelManager
+from auth import get_current_user
 
 class AdvancedFeatures:
     def __init__(self):
@@ -119,6 +120,8 @@ class AdvancedFeatures:
         
         st.info("Upload multiple text files to convert them into audiobooks simultaneously.")
         
+        self._show_resumable_jobs()
+        
         # File upload for batch processing
         uploaded_files = st.file_uploader(
             "Upload Multiple Files",
@@ -179,59 +182,70 @@ class AdvancedFeatures:
                     "parallel": parallel_processing
                 })
     
+    def _show_resumable_jobs(self):
+        """Offer to resume batch jobs that did not finish"""
+        from batch_jobs import BatchJob
+
+        owner = get_current_user()
+        unfinished = [job for job in BatchJob.list_jobs(owner=owner) if not job.is_complete()]
+        if not unfinished:
+            return
+
+        st.markdown("### ⏯️ Unfinished Batch Jobs")
+        for job in unfinished:
+            completed, total = job.progress()
+            col1, col2 = st.columns([3, 1])
+
+            with col1:
+                st.write(f"📦 {job.job_id} — {completed}/{total} files done "
+                         f"({job.settings['tone']}, {job.settings['voice']}) · updated {job.manifest['updated_at'][:16]}")
+
+            with col2:
+                if st.button("▶️ Resume", key=f"resume_{job.job_id}") and job.load().owned_by(owner):
+                    self._run_batch_job(job)
+
     def _process_batch_files(self, files, settings):
         """Process multiple files in batch"""
+        from batch_jobs import BatchJob
+
+        # Read uploads on the script thread; workers only see plain bytes
+        file_data = [(file.name, file.getvalue()) for file in files]
+        
+        # Re-running the same files with the same settings resumes the user's existing job
+        job = BatchJob.create_or_resume(file_data, settings, owner=get_current_user())
+        self._run_batch_job(job, file_data)
+    
+    def _run_batch_job(self, job, file_data=None):
+        """Run (or resume) a checkpointed batch job"""
+        from batch_executor import BatchExecutor
+
         st.markdown("### 🔄 Batch Processing Progress")
         
         progress_bar = st.progress(0)
         status_text = st.empty()
         results_container = st.container()
         
-        total_files = len(files)
-        processed_files = []
+        settings = job.settings
+        file_data = file_data or job.inputs()
+        total_files = len(file_data)
+        workers = BATCH_MAX_WORKERS if settings.get('parallel') else 1
         
-        for i, file in enumerate(files):
-            status_text.text(f"Processing {file.name}... ({i+1}/{total_files})")
-            
-            try:
-                # Extract text from file
-                if file.name.endswith('.txt'):
-                    text_content = file.read().decode('utf-8')
-                elif file.name.endswith('.pdf'):
-                    from utils import extract_text_from_pdf
-                    text_content = extract_text_from_pdf(file)
-                else:
-                    continue
-                
-                # Process with AI
-                rewritten_text = self.ai_manager.rewrite_text_with_tone(
-                    text_content, settings['tone'], settings['intensity'], settings['language']
-                )
-                
-                # Generate audio (simulated)
-                audio_data = self.ai_manager.generate_speech(
-                    rewritten_text, settings['voice'], settings['language']
-                )
-                
-                processed_files.append({
-                    "filename": file.name,
-                    "original_text": text_content,
-                    "rewritten_text": rewritten_text,
-                    "audio_data": audio_data,
-                    "status": "success"
-                })
-                
-            except Exception as e:
-                processed_files.append({
-                    "filename": file.name,
-                    "status": "error",
-                    "error": str(e)
-                })
-            
-            progress_bar.progress((i + 1) / total_files)
-            time.sleep(1)  # Simulate processing time
+        completed, _ = job.progress()
+        if completed:
+            st.info(f"⏯️ Resuming job {job.job_id}: {completed}/{total_files} files already done")
+        status_text.text(f"Processing {total_files - completed} files with {workers} worker(s)...")
+        
+        def on_result(result, completed, total):
+            progress_bar.progress(completed / total)
+            icon = "✅" if result['status'] == 'success' else "❌"
+            status_text.text(f"{icon} Finished {result['filename']} ({completed}/{total})")
+        
+        started = time.time()
+        executor = BatchExecutor(self.ai_manager, max_workers=workers)
+        processed_files = executor.run(file_data, settings, on_result=on_result, job=job)
+        elapsed = time.time() - started
         
-        status_text.text("✅ Batch processing complete!")
+        status_text.text(f"✅ Batch processing complete! {total_files} files in {elapsed:.1f}s")
         
         # Show results
         with results_container:
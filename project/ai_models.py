@@ -3,7 +3,6 @@ EchoVerse AI Models Integration
 Handles Hugging Face API calls for text rewriting and speech synthesis
 """
 
-import streamlit as st
 import requests
 import json
 import time
@@ -11,51 +10,90 @@ import base64
 import io
 from config import *
 from utils import call_huggingface_api, chunk_text
+from rate_limits import provider_slot
+from events import StreamlitSink
+from tracing import span, traced, current_span
+import metrics
+import tts_backends
+from circuit_breaker import get_breaker, OPEN, CircuitOpenError
+from hedging import hedged
+from single_flight import coalesce
+from prompt_packing import get_packer, build_packed_prompt, packed_schema, parse_packed_response
+from chunk_planner import plan_chunks, join_chunks, observe_expansion, expected_output_tokens
 
 class AIModelManager:
-    def __init__(self):
+    def __init__(self, event_sink=None):
         self.text_model = TEXT_TO_TEXT_MODEL
         self.tts_model = TEXT_TO_SPEECH_MODEL
         self.api_key = HF_API_KEY
+        # Pages render events with Streamlit; headless and parallel runners pass a NullSink or LoggingSink
+        self.events = event_sink or StreamlitSink()
         
+    @traced("rewrite")
     def rewrite_text_with_tone(self, text, tone, intensity, language="English"):
         """Rewrite text with specified tone and intensity using Gemini AI"""
         if not text.strip():
             return text
 
         # Use Gemini AI for substantial rewriting
-        st.info("🎭 Rewriting text with AI to enhance content and apply tone...")
+        self.events.info("🎭 Rewriting text with AI to enhance content and apply tone...", stage="rewrite", bytes=len(text))
 
-        return self._rewrite_with_gemini(text, tone, intensity, language)
+        with metrics.histogram("echoverse_rewrite_seconds", "End-to-end rewrite latency").time():
+            rewritten = self._rewrite_with_gemini(text, tone, intensity, language)
+        metrics.counter("echoverse_rewrite_characters_total", "Characters sent through the rewriter").inc(len(text))
+        return rewritten
 
     def _rewrite_with_gemini(self, text, tone, intensity, language="English"):
         """Rewrite text using local tone + Gemini enhancement (no HF API)"""
         try:
             # Step 1: Apply tone locally (fast and reliable)
-            st.info("🔄 Step 1: Applying tone adaptation...")
+            self.events.info("🔄 Step 1: Applying tone adaptation...", stage="tone")
             local_rewritten = self._apply_tone_locally(text, tone, intensity, language)
 
-            # Step 2: Use Gemini for enhancement (reliable)
-            st.info("✨ Step 2: Enhancing content with Gemini AI...")
-            final_rewritten = self._enhance_with_gemini(local_rewritten, tone, intensity, language)
+            # Step 2: Use Gemini for enhancement (reliable), in chunks whose answers fit the output budget
+            self.events.info("✨ Step 2: Enhancing content with Gemini AI...", stage="enhance", provider="gemini")
+            chunks = plan_chunks(local_rewritten, tone, intensity)
+            if len(chunks) == 1:
+                return self._enhance_with_gemini(local_rewritten, tone, intensity, language)
 
-            return final_rewritten
+            enhanced_chunks = []
+            for i, chunk in enumerate(chunks):
+                self.events.debug(f"Enhancing chunk {i+1}/{len(chunks)}", stage="enhance", provider="gemini",
+                                  chunk_index=i, total_chunks=len(chunks), bytes=len(chunk))
+                enhanced_chunks.append(self._enhance_with_gemini(chunk.strip(), tone, intensity, language))
+            return join_chunks(chunks, enhanced_chunks)
 
         except Exception as e:
             # Fallback to just local tone adaptation
             return self._apply_tone_locally(text, tone, intensity, language)
 
 
+    @traced("gemini_enhance")
     def _enhance_with_gemini(self, text, tone, intensity, language="English"):
         """Use Gemini to enhance and expand the content"""
         try:
             from config import GOOGLE_GEMINI_API_KEY
-            import requests
 
             if not GOOGLE_GEMINI_API_KEY:
-                st.info("⚠️ Gemini API not available, returning Granite result...")
+                self.events.info("⚠️ Gemini API not available, returning Granite result...", stage="enhance", provider="gemini")
                 return text
 
+            # While Gemini is degraded, skip the network and keep the locally toned text
+            if get_breaker("gemini").rejecting():
+                self.events.warning("⚡ Gemini is degraded, using the local tone rewrite...", stage="enhance",
+                                    provider="gemini")
+                return text
+
+            # Small jobs arriving together (batch files, several sessions) share one packed request
+            if PROMPT_PACKING and len(text) <= PACK_JOB_MAX_CHARS:
+                started = time.time()
+                packed = get_packer().submit((tone, intensity, language), text,
+                                             lambda texts: self._enhance_packed(texts, tone, intensity))
+                if packed is not None:
+                    self.events.success(f"✅ Content enhanced with Gemini AI! ({len(packed.split())} words, packed)",
+                                        stage="enhance", provider="gemini", latency=time.time() - started)
+                    return packed
+
             # Create optimized enhancement prompt for Gemini
             prompt = f"""Enhance this text with {tone} tone. Add details and make it engaging for audio. Keep it concise but improved:
 
@@ -63,8 +101,6 @@ class AIModelManager:
 
 Enhanced version:"""
 
-            url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={GOOGLE_GEMINI_API_KEY}"
-
             payload = {
                 "contents": [{
                     "parts": [{
@@ -75,31 +111,141 @@ Enhanced version:"""
                     "temperature": 0.7,
                     "topK": 20,
                     "topP": 0.8,
-                    "maxOutputTokens": 1500,  # Reduced for speed
+                    "maxOutputTokens": GEMINI_MAX_OUTPUT_TOKENS,
                 }
             }
 
-            headers = {"Content-Type": "application/json"}
-            response = requests.post(url, json=payload, headers=headers, timeout=15)  # Faster timeout
+            started = time.time()
+            response = self._call_gemini(payload, prompt)
+            latency = time.time() - started
 
             if response.status_code == 200:
-                result = response.json()
-                if "candidates" in result and len(result["candidates"]) > 0:
-                    candidate = result["candidates"][0]
-                    if "content" in candidate and "parts" in candidate["content"]:
-                        parts = candidate["content"]["parts"]
-                        if len(parts) > 0 and "text" in parts[0]:
-                            enhanced_text = parts[0]["text"].strip()
-                            st.success(f"✅ Content enhanced with Gemini AI! ({len(enhanced_text.split())} words)")
-                            return enhanced_text
-
-            st.info("⚠️ Gemini enhancement failed, returning Granite result...")
+                enhanced_text, finish_reason = self._candidate_text(response.json())
+                if enhanced_text:
+                    # A truncated answer is continued rather than cut short
+                    continuations = 0
+                    while finish_reason == "MAX_TOKENS" and continuations < GEMINI_MAX_CONTINUATIONS:
+                        continuations += 1
+                        self.events.debug(f"Gemini answer hit the output limit, continuing ({continuations})...",
+                                          stage="enhance", provider="gemini")
+                        piece, finish_reason = self._continue_gemini(prompt, enhanced_text, payload["generationConfig"])
+                        if not piece:
+                            break
+                        enhanced_text += piece
+                    latency = time.time() - started
+
+                    if finish_reason == "MAX_TOKENS":
+                        metrics.counter("echoverse_gemini_truncated_total", "Gemini answers still truncated after continuing").inc()
+                        self.events.warning("⚠️ Gemini answer was cut off, keeping the complete local rewrite...",
+                                            stage="enhance", provider="gemini", latency=latency)
+                        return text
+
+                    enhanced_text = enhanced_text.strip()
+                    observe_expansion(tone, intensity, text, enhanced_text)
+                    self.events.success(f"✅ Content enhanced with Gemini AI! ({len(enhanced_text.split())} words)",
+                                        stage="enhance", provider="gemini", latency=latency, bytes=len(response.content))
+                    return enhanced_text
+
+            self.events.warning("⚠️ Gemini enhancement failed, returning Granite result...",
+                                stage="enhance", provider="gemini", latency=latency)
+            return text
+
+        except CircuitOpenError:
+            self.events.warning("⚡ Gemini is degraded, using the local tone rewrite...", stage="enhance",
+                                provider="gemini")
             return text
 
         except Exception as e:
-            st.info(f"⚠️ Gemini error: {str(e)}, returning Granite result...")
+            self.events.warning(f"⚠️ Gemini error: {str(e)}, returning Granite result...", stage="enhance", provider="gemini")
             return text
 
+    def _candidate_text(self, result):
+        """(text, finishReason) of the first Gemini candidate; text is None if there is none"""
+        candidates = result.get("candidates") or [{}]
+        candidate = candidates[0]
+        parts = candidate.get("content", {}).get("parts") or [{}]
+        return parts[0].get("text"), candidate.get("finishReason")
+
+    def _continue_gemini(self, prompt, partial, generation_config):
+        """Ask Gemini to carry on from a truncated answer; returns (text, finishReason)"""
+        payload = {
+            "contents": [
+                {"role": "user", "parts": [{"text": prompt}]},
+                {"role": "model", "parts": [{"text": partial}]},
+                {"role": "user", "parts": [{"text": "Continue exactly where you stopped. Do not repeat anything."}]}
+            ],
+            "generationConfig": generation_config
+        }
+        response = self._call_gemini(payload, prompt)
+        if response.status_code != 200:
+            return None, None
+        return self._candidate_text(response.json())
+
+    def _enhance_packed(self, texts, tone, intensity):
+        """Enhance several small texts with one Gemini request; None if the answer cannot be split back"""
+        prompt = build_packed_prompt(texts, tone)
+        payload = {
+            "contents": [{
+                "parts": [{
+                    "text": prompt
+                }]
+            }],
+            "generationConfig": {
+                "temperature": 0.7,
+                "topK": 20,
+                "topP": 0.8,
+                "maxOutputTokens": min(8192, int(sum(expected_output_tokens(text, tone, intensity) for text in texts) * 1.25)
+                                       + 100 * len(texts)),
+                "responseMimeType": "application/json",
+                "responseSchema": packed_schema(len(texts))
+            }
+        }
+
+        with span("gemini_packed", jobs=len(texts), request_bytes=len(prompt)):
+            response = self._call_gemini(payload, prompt)
+        if response.status_code != 200:
+            return None
+        return parse_packed_response(response.json(), len(texts))
+
+    def _call_gemini(self, payload, prompt):
+        """POST a generateContent request, hedged, coalesced and reported to the Gemini circuit breaker.
+
+        Raises CircuitOpenError while the circuit turns calls away.
+        """
+        import requests
+
+        url = f"{GOOGLE_GEMINI_API_BASE}/{GEMINI_MODEL}:generateContent?key={GOOGLE_GEMINI_API_KEY}"
+        headers = {"Content-Type": "application/json"}
+        breaker = get_breaker("gemini")
+
+        def send():
+            with span("gemini.generateContent", request_bytes=len(prompt)) as http_span:
+                with provider_slot("gemini") as slot:
+                    response = requests.post(url, json=payload, headers=headers, timeout=15)  # Faster timeout
+                    slot.observe(response)
+                http_span.set(status_code=response.status_code, response_bytes=len(response.content))
+            return response
+
+        def fetch():
+            # Taken here, where record() always follows, so a half-open probe is never lost
+            if not breaker.allow():
+                raise CircuitOpenError("Gemini circuit is open")
+            fetch_started = time.time()
+            try:
+                response = hedged("gemini", send, lambda response: response.status_code == 200)
+            except Exception:
+                breaker.record(False, time.time() - fetch_started)
+                raise
+            breaker.record(response.status_code < 500 and response.status_code != 429, time.time() - fetch_started)
+            return response
+
+        # Sessions enhancing the same text at the same moment share one request
+        response = coalesce("gemini", (GEMINI_MODEL, payload), fetch)
+        metrics.counter("echoverse_gemini_responses_total", "Gemini responses by HTTP status",
+                        status=response.status_code).inc()
+        return response
+
+    @traced("tone_local")
     def _apply_tone_locally(self, text, tone, intensity, language="English"):
         """Apply tone adaptation locally without API calls"""
         import re
@@ -153,20 +299,20 @@ Enhanced version:"""
                 # Capitalize properly
                 rewritten = ". ".join([s.strip().capitalize() for s in rewritten.split(". ") if s.strip()])
 
-                st.success(f"✅ Applied {tone} tone with {intensity} intensity!")
+                self.events.success(f"✅ Applied {tone} tone with {intensity} intensity!", stage="tone")
                 return rewritten
 
         # Return original text if no tone adaptation
-        st.info("ℹ️ Using original text (Neutral tone)")
+        self.events.info("ℹ️ Using original text (Neutral tone)", stage="tone")
         return text
     
+    @traced("rewrite_chunked")
     def process_text_in_chunks(self, text, tone, intensity, language="English", progress_callback=None):
         """Process long text in chunks for better results"""
-        if len(text) <= 2000:
+        # Split into chunks whose rewrites fit Gemini's output budget
+        chunks = plan_chunks(text, tone, intensity)
+        if len(chunks) == 1:
             return self.rewrite_text_with_tone(text, tone, intensity, language)
-        
-        # Split into chunks
-        chunks = chunk_text(text, 1500)  # Smaller chunks for better processing
         rewritten_chunks = []
         
         total_chunks = len(chunks)
@@ -174,28 +320,46 @@ Enhanced version:"""
         for i, chunk in enumerate(chunks):
             if progress_callback:
                 progress_callback(i / total_chunks, f"Processing chunk {i+1}/{total_chunks}")
+            self.events.debug(f"Processing chunk {i+1}/{total_chunks}", stage="rewrite",
+                              chunk_index=i, total_chunks=total_chunks, bytes=len(chunk))
             
-            rewritten_chunk = self.rewrite_text_with_tone(chunk, tone, intensity, language)
+            with span("rewrite_chunk", chunk_index=i, bytes=len(chunk)):
+                rewritten_chunk = self.rewrite_text_with_tone(chunk.strip(), tone, intensity, language)
             rewritten_chunks.append(rewritten_chunk)
             
-            # Small delay to avoid rate limiting
-            time.sleep(1)
+            # Small delay to avoid rate limiting (nothing to space out while Gemini is skipped)
+            if get_breaker("gemini").state != OPEN:
+                time.sleep(1)
         
         if progress_callback:
             progress_callback(1.0, "Processing complete!")
         
-        return " ".join(rewritten_chunks)
+        return join_chunks(chunks, rewritten_chunks)
     
-    def generate_speech(self, text, voice="lisa", language="English"):
-        """Generate speech from text using TTS model"""
+    @traced("tts")
+    def generate_speech(self, text, voice="lisa", language="English", prefer=None):
+        """Generate speech from text on the best available TTS backend, trying the prefer backend first if given"""
         if not text.strip():
             return None
 
-        st.info("🎤 Generating audio using Google TTS...")
-
-        # Skip Hugging Face TTS for now and go directly to reliable Google TTS
-        return self._generate_speech_fallback(text, voice, language)
+        with metrics.histogram("echoverse_tts_seconds", "End-to-end speech synthesis latency").time():
+            audio_info = None
+            backends = tts_backends.registry.select(language)
+            backends.sort(key=lambda backend: backend.name != prefer)
+            for backend in backends:
+                audio_info = self._generate_speech_with(backend, text, voice, language)
+                if audio_info:
+                    break
+            else:
+                audio_info = self._create_demo_audio(text, voice, language)
+
+        metrics.counter("echoverse_tts_requests_total", "Speech synthesis requests by outcome",
+                        outcome="ok" if audio_info else "failed").inc()
+        if audio_info:
+            metrics.counter("echoverse_audio_bytes_total", "Audio bytes synthesized").inc(audio_info.get("file_size", 0))
+        return audio_info
     
+    @traced("tts_chunked")
     def generate_speech_in_chunks(self, text, voice="lisa", language="English", progress_callback=None):
         """Generate speech for long text in chunks"""
         if len(text) <= 1000:  # Reduced chunk size for better API compatibility
@@ -204,18 +368,27 @@ Enhanced version:"""
         # Split into smaller chunks for TTS
         chunks = chunk_text(text, 800)  # Smaller chunks work better
         audio_chunks = []
-        all_audio_data = []
+        spoken_chunks = []
 
         total_chunks = len(chunks)
 
         for i, chunk in enumerate(chunks):
             if progress_callback:
                 progress_callback(i / total_chunks, f"Generating audio chunk {i+1}/{total_chunks}")
+            self.events.debug(f"Generating audio chunk {i+1}/{total_chunks}", stage="tts",
+                              chunk_index=i, total_chunks=total_chunks, bytes=len(chunk))
 
-            audio_chunk = self.generate_speech(chunk, voice, language)
+            # Every chunk stays on the first chunk's backend so the parts share one format
+            backend_name = audio_chunks[0].get("backend") if audio_chunks else None
+            with span("tts_chunk", chunk_index=i, bytes=len(chunk)):
+                audio_chunk = self.generate_speech(chunk, voice, language, prefer=backend_name)
             if audio_chunk and audio_chunk.get("audio_data"):
-                audio_chunks.append(audio_chunk)
-                all_audio_data.append(audio_chunk["audio_data"])
+                if audio_chunks and audio_chunk.get("backend") != backend_name:
+                    audio_chunk = self._switch_chunk_backend(spoken_chunks, audio_chunks, audio_chunk, chunk,
+                                                             voice, language)
+                if audio_chunk:
+                    audio_chunks.append(audio_chunk)
+                    spoken_chunks.append(chunk)
 
             # Small delay between chunks to avoid rate limiting
             time.sleep(2)
@@ -224,18 +397,18 @@ Enhanced version:"""
             progress_callback(1.0, "Audio generation complete!")
 
         # Combine all audio data
-        if all_audio_data:
-            combined_audio_data = b''.join(all_audio_data)
-
-            # Save combined audio
-            import tempfile
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-            temp_file.write(combined_audio_data)
-            temp_file.close()
+        if audio_chunks:
+            audio_format = audio_chunks[0].get("format", "mp3")
+            all_audio_data = [audio_chunk["audio_data"] for audio_chunk in audio_chunks]
+            if audio_format == "wav":
+                # Each WAV part has its own header; MP3 frames can simply follow each other
+                combined_audio_data = tts_backends.join_wav(all_audio_data)
+            else:
+                combined_audio_data = b''.join(all_audio_data)
 
             combined_audio = {
                 "audio_data": combined_audio_data,
-                "audio_file": temp_file.name,
+                "format": audio_format,
                 "chunks": audio_chunks,
                 "total_duration": sum(chunk.get("duration", 0) for chunk in audio_chunks),
                 "voice": voice,
@@ -248,181 +421,76 @@ Enhanced version:"""
 
         return None
 
-    def _generate_speech_fallback(self, text, voice="lisa", language="English"):
-        """Fallback TTS using Google Text-to-Speech"""
-        try:
-            from gtts import gTTS
-            import tempfile
-            import os
-
-            # Optimize text length for faster processing
-            if len(text) > 10000:
-                text = text[:10000] + "..."
-                st.info("ℹ️ Text optimized for faster audio generation")
-
-            # Map language names to gTTS language codes
-            lang_map = {
-                "English": "en",
-                "Spanish": "es",
-                "Hindi": "hi",
-                "French": "fr",
-                "German": "de",
-                "Italian": "it",
-                "Portuguese": "pt",
-                "Chinese": "zh",
-                "Japanese": "ja",
-                "Korean": "ko"
-            }
-
-            lang_code = lang_map.get(language, "en")
-
-            # Create gTTS object with optimized settings
-            try:
-                tts = gTTS(text=text, lang=lang_code, slow=False, tld='com')
-            except Exception as e:
-                st.error(f"❌ Error creating TTS object: {str(e)}")
-                # Try with English as fallback
-                if lang_code != "en":
-                    st.info("🔄 Trying with English language...")
-                    tts = gTTS(text=text, lang="en", slow=False)
-                else:
-                    raise e
-
-            # Save to temporary file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
-
-            try:
-                tts.save(temp_file.name)
-            except Exception as e:
-                st.error(f"❌ Error saving audio file: {str(e)}")
-                return None
-
-            # Verify file was created and has content
-            if not os.path.exists(temp_file.name) or os.path.getsize(temp_file.name) == 0:
-                st.error("❌ Audio file was not created properly")
-                return None
-
-            # Read the audio data
-            with open(temp_file.name, 'rb') as f:
-                audio_data = f.read()
-
-            if len(audio_data) == 0:
-                st.error("❌ Generated audio file is empty")
-                return None
-
-            audio_info = {
-                "audio_data": audio_data,
-                "audio_file": temp_file.name,
-                "text": text[:100] + "..." if len(text) > 100 else text,
-                "voice": f"Google TTS ({voice})",
-                "language": language,
-                "duration": len(text.split()) / 150,  # Estimate duration
-                "generated_at": time.time(),
-                "file_size": len(audio_data),
-                "format": "mp3"
-            }
+    def _switch_chunk_backend(self, spoken_chunks, audio_chunks, audio_chunk, chunk, voice, language):
+        """A chunk fell back to another backend: redo the earlier chunks there, or drop it if that fails.
+
+        Returns the chunk to keep (or None); audio_chunks is replaced in place.
+        """
+        backend = tts_backends.registry.get(audio_chunk.get("backend"))
+        if backend is not None:
+            self.events.warning(f"⚠️ Switching the whole audiobook to {backend.label} so every chunk has one format",
+                                stage="tts", provider=backend.name)
+            redone = []
+            for earlier in spoken_chunks:
+                earlier_audio = self._generate_speech_with(backend, earlier, voice, language)
+                if not earlier_audio:
+                    break
+                redone.append(earlier_audio)
+            else:
+                audio_chunks[:] = redone
+                return audio_chunk
+
+        self.events.error(f"❌ Skipped an audio chunk that could only be made in another format: {chunk[:40]}...",
+                          stage="tts")
+        return None
 
-            st.success("✅ Audio generated successfully using Google TTS!")
-            return audio_info
+    def _generate_speech_with(self, backend, text, voice="lisa", language="English"):
+        """Synthesize on one backend; returns None (after reporting why) if it fails"""
+        if backend.max_chars and len(text) > backend.max_chars:
+            text = text[:backend.max_chars] + "..."
+            self.events.info(f"ℹ️ Text shortened to {backend.max_chars} characters for {backend.label}")
 
-        except ImportError:
-            st.error("❌ Google TTS not available. Installing...")
-            try:
-                import subprocess
-                import sys
-                subprocess.check_call([sys.executable, "-m", "pip", "install", "gtts"])
-                st.success("✅ Google TTS installed! Please try again.")
-                return None
-            except:
-                st.error("❌ Failed to install Google TTS. Please run: pip install gtts")
-                return None
-        except Exception as e:
-            st.error(f"❌ Google TTS failed: {str(e)}")
-            st.info("🔄 Trying Windows TTS as final fallback...")
-            return self._generate_speech_windows_tts(text, voice, language)
+        self.events.info(f"🎤 Generating audio using {backend.label}...", stage="tts", provider=backend.name,
+                         bytes=len(text))
 
-    def _generate_speech_windows_tts(self, text, voice="lisa", language="English"):
-        """Windows TTS fallback using pyttsx3"""
+        started = time.time()
         try:
-            import pyttsx3
-            import tempfile
-            import os
-
-            # Limit text length
-            if len(text) > 3000:
-                text = text[:3000] + "..."
-                st.warning("⚠️ Text truncated to 3000 characters for Windows TTS")
-
-            # Initialize TTS engine
-            engine = pyttsx3.init()
-
-            # Set properties
-            voices = engine.getProperty('voices')
-            if voices:
-                # Try to find a suitable voice
-                for v in voices:
-                    if 'female' in v.name.lower() and voice.lower() in ['lisa', 'allison', 'emma']:
-                        engine.setProperty('voice', v.id)
-                        break
-                    elif 'male' in v.name.lower() and voice.lower() in ['michael', 'brian']:
-                        engine.setProperty('voice', v.id)
-                        break
-
-            # Set speech rate and volume
-            engine.setProperty('rate', 180)  # Speed of speech
-            engine.setProperty('volume', 0.9)  # Volume level (0.0 to 1.0)
-
-            # Save to temporary file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-            temp_file.close()
-
-            # Generate speech
-            engine.save_to_file(text, temp_file.name)
-            engine.runAndWait()
-
-            # Check if file was created
-            if not os.path.exists(temp_file.name) or os.path.getsize(temp_file.name) == 0:
-                st.error("❌ Windows TTS failed to create audio file")
-                return None
-
-            # Read the audio data
-            with open(temp_file.name, 'rb') as f:
-                audio_data = f.read()
-
-            audio_info = {
-                "audio_data": audio_data,
-                "audio_file": temp_file.name,
-                "text": text[:100] + "..." if len(text) > 100 else text,
-                "voice": f"Windows TTS ({voice})",
-                "language": language,
-                "duration": len(text.split()) / 150,  # Estimate duration
-                "generated_at": time.time(),
-                "file_size": len(audio_data),
-                "format": "wav"
-            }
+            with span(backend.name, request_bytes=len(text)) as backend_span:
+                audio_data = coalesce("tts", (backend.name, text, voice, language),
+                                      lambda: backend.synthesize(text, voice, language))
+                backend_span.set(bytes=len(audio_data or b""))
+            if not audio_data:
+                raise tts_backends.TTSBackendError("Generated audio is empty")
+        except Exception as e:
+            latency = time.time() - started
+            tts_backends.registry.record(backend.name, latency, len(text), ok=False)
+            self.events.error(f"❌ {backend.label} failed: {str(e)}", stage="tts", provider=backend.name,
+                              latency=latency)
+            return None
 
-            st.success("✅ Audio generated using Windows TTS!")
-            return audio_info
+        latency = time.time() - started
+        tts_backends.registry.record(backend.name, latency, len(text), ok=True)
+
+        audio_info = {
+            "audio_data": audio_data,
+            "text": text[:100] + "..." if len(text) > 100 else text,
+            "voice": f"{backend.label} ({voice})",
+            "language": language,
+            "duration": len(text.split()) / 150,  # Estimate duration
+            "generated_at": time.time(),
+            "file_size": len(audio_data),
+            "format": backend.format,
+            "backend": backend.name
+        }
 
-        except ImportError:
-            st.error("❌ Windows TTS not available. Installing pyttsx3...")
-            try:
-                import subprocess
-                import sys
-                subprocess.check_call([sys.executable, "-m", "pip", "install", "pyttsx3"])
-                st.success("✅ pyttsx3 installed! Please try again.")
-                return None
-            except:
-                st.error("❌ Failed to install pyttsx3. Please run: pip install pyttsx3")
-                return self._create_demo_audio(text, voice, language)
-        except Exception as e:
-            st.error(f"❌ Windows TTS failed: {str(e)}")
-            return self._create_demo_audio(text, voice, language)
+        self.events.success(f"✅ Audio generated successfully using {backend.label}!", stage="tts",
+                            provider=backend.name, latency=latency, bytes=len(audio_data))
+        return audio_info
 
+    @traced("demo_audio")
     def _create_demo_audio(self, text, voice="lisa", language="English"):
         """Create a demo audio file when all TTS methods fail"""
         try:
-            import tempfile
             import wave
             import numpy as np
 
@@ -438,22 +506,19 @@ Enhanced version:"""
             # Convert to 16-bit integers
             audio_signal = (audio_signal * 32767).astype(np.int16)
 
-            # Save as WAV file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
+            # Encode as WAV in memory
+            buffer = io.BytesIO()
 
-            with wave.open(temp_file.name, 'w') as wav_file:
+            with wave.open(buffer, 'wb') as wav_file:
                 wav_file.setnchannels(1)  # Mono
                 wav_file.setsampwidth(2)  # 2 bytes per sample
                 wav_file.setframerate(sample_rate)
                 wav_file.writeframes(audio_signal.tobytes())
 
-            # Read the audio data
-            with open(temp_file.name, 'rb') as f:
-                audio_data = f.read()
+            audio_data = buffer.getvalue()
 
             audio_info = {
                 "audio_data": audio_data,
-                "audio_file": temp_file.name,
                 "text": text[:100] + "..." if len(text) > 100 else text,
                 "voice": f"Demo Tone ({voice})",
                 "language": language,
@@ -463,14 +528,15 @@ Enhanced version:"""
                 "format": "wav"
             }
 
-            st.warning("⚠️ Generated demo audio tone (TTS services unavailable)")
-            st.info("💡 Install gtts or pyttsx3 for actual speech synthesis")
+            self.events.warning("⚠️ Generated demo audio tone (TTS services unavailable)")
+            self.events.info("💡 Install gtts, espeak-ng or pyttsx3 for actual speech synthesis")
             return audio_info
 
         except Exception as e:
-            st.error(f"❌ Demo audio generation failed: {str(e)}")
+            self.events.error(f"❌ Demo audio generation failed: {str(e)}")
             return None
     
+    @traced("translate")
     def translate_text(self, text, target_language):
         """Translate text to target language"""
         if target_language == "English":
@@ -488,7 +554,7 @@ Enhanced version:"""
             }
         }
         
-        response = call_huggingface_api(self.text_model, payload)
+        response = call_huggingface_api(self.text_model, payload, event_sink=self.events)
         
         if response and isinstance(response, list) and len(response) > 0:
             translated = response[0].get("generated_text", "")
@@ -497,6 +563,7 @@ Enhanced version:"""
         
         return text
     
+    @traced("summary")
     def generate_summary(self, text, max_length=200):
         """Generate a summary of the text"""
         if len(text) <= max_length:
@@ -513,7 +580,7 @@ Enhanced version:"""
             }
         }
         
-        response = call_huggingface_api(self.text_model, payload)
+        response = call_huggingface_api(self.text_model, payload, event_sink=self.events)
         
         if response and isinstance(response, list) and len(response) > 0:
             summary = response[0].get("generated_text", "")
@@ -534,7 +601,7 @@ Enhanced version:"""
         # Test text model
         try:
             test_payload = {"inputs": "Hello, this is a test."}
-            response = call_huggingface_api(self.text_model, test_payload)
+            response = call_huggingface_api(self.text_model, test_payload, event_sink=self.events)
             status["text_model"] = response is not None
         except:
             pass
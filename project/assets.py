@@ -0,0 +1,95 @@
+"""
+EchoVerse Static Assets
+Bundled CSS and Lottie files, read once per process and served with long-lived cache headers
+"""
+
+import os
+import json
+import time
+import hashlib
+import functools
+import threading
+from config import ASSETS_DIR, STATIC_ASSETS_SERVED, LOTTIE_TIMEOUT, LOTTIE_RETRY_AFTER, DOWNLOAD_BASE_URL
+
+MIME_TYPES = {
+    ".css": "text/css; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+    ".json": "application/json",
+    ".svg": "image/svg+xml",
+    ".png": "image/png",
+    ".woff2": "font/woff2"
+}
+
+_remote_lottie = {}
+_lock = threading.Lock()
+
+def asset_path(name):
+    """Resolve a bundled asset name, refusing anything outside ASSETS_DIR"""
+    root = os.path.realpath(ASSETS_DIR)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root or not os.path.isfile(path):
+        raise FileNotFoundError(f"No bundled asset named {name!r}")
+    return path
+
+@functools.lru_cache(maxsize=None)
+def read_asset(name):
+    """Return (data, version) for a bundled asset; the version is a content hash for cache busting"""
+    with open(asset_path(name), "rb") as f:
+        data = f.read()
+    return data, hashlib.sha1(data).hexdigest()[:12]
+
+def asset_mime(name):
+    return MIME_TYPES.get(os.path.splitext(name)[1].lower(), "application/octet-stream")
+
+def static_url(name):
+    """Versioned URL of an asset on the download server"""
+    _, version = read_asset(name)
+    return f"{DOWNLOAD_BASE_URL.rstrip('/')}/static/{name}?v={version}"
+
+@functools.lru_cache(maxsize=None)
+def inline_style(name):
+    """A bundled stylesheet as one <style> line, so it stays inside the surrounding markdown HTML block"""
+    css = read_asset(name)[0].decode("utf-8")
+    return "<style>" + " ".join(line.strip() for line in css.splitlines() if line.strip()) + "</style>"
+
+def stylesheet(name):
+    """HTML applying a bundled stylesheet: inline CSS, or a browser-cached <link> when the download server has a public URL"""
+    if STATIC_ASSETS_SERVED:
+        from download_server import links_enabled
+        if links_enabled():
+            return f'<link rel="stylesheet" href="{static_url(name)}">'
+    return inline_style(name)
+
+def load_lottie(source):
+    """Lottie JSON from a bundled file (static/lottie/<name>) or a URL; None if unavailable.
+
+    Bundled files are read once. Remote files are fetched once per process with a
+    timeout; failures are remembered for LOTTIE_RETRY_AFTER so an offline server
+    does not retry on every rerun.
+    """
+    if not source.startswith(("http://", "https://")):
+        try:
+            return _bundled_lottie(source)
+        except (OSError, ValueError):
+            return None
+
+    with _lock:
+        cached = _remote_lottie.get(source)
+    if cached is not None and (cached[1] is not None or time.time() - cached[0] < LOTTIE_RETRY_AFTER):
+        return cached[1]
+
+    import requests
+
+    try:
+        response = requests.get(source, timeout=LOTTIE_TIMEOUT)
+        animation = response.json() if response.status_code == 200 else None
+    except (requests.RequestException, ValueError):
+        animation = None
+
+    with _lock:
+        _remote_lottie[source] = (time.time(), animation)
+    return animation
+
+@functools.lru_cache(maxsize=None)
+def _bundled_lottie(name):
+    return json.loads(read_asset(os.path.join("lottie", name))[0])
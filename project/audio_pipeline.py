@@ -9,8 +9,64 @@ import json
 from datetime import datetime
 from ai_models import AIModelManager
 from animations import show_progress_animation, show_success_animation, show_audio_wave_animation
+from download_server import audio_download_url, bytes_download_url, file_download_url
+from tracing import traced, span, current_span, get_trace, waterfall_rows
+from events import EventSink, MultiSink
 from config import *
 
+class GenerationProgress(EventSink):
+    """Advances the progress bar and live processing panel as pipeline stage events arrive.
+
+    Each stage owns a band of the bar; chunked stages move through their band
+    as chunk events come in, so the page animates without the pipeline waiting.
+    """
+
+    STAGE_BANDS = {
+        "rewrite": (10, 20),
+        "tone": (20, 35),
+        "enhance": (35, 60),
+        "tts": (70, 95)
+    }
+
+    def __init__(self, progress_placeholder, processing_placeholder, header):
+        self.progress_placeholder = progress_placeholder
+        self.processing_placeholder = processing_placeholder
+        self.lines = [header, ""]
+        self.percent = 0
+        self.updates = 0
+
+    def handle(self, event):
+        band = self.STAGE_BANDS.get(event.stage)
+        if band is None or (event.level == "debug" and event.chunk_index is None):
+            return
+
+        start, end = band
+        if event.chunk_index is not None and event.total_chunks:
+            percent = start + (end - start) * (event.chunk_index + 1) / event.total_chunks
+        else:
+            percent = start
+        self.percent = max(self.percent, int(percent))
+
+        if event.level != "debug":
+            self.lines.append(event.message)
+
+        # Worker threads cannot draw; the next event on the script thread catches the page up
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        if get_script_run_ctx(suppress_warning=True) is None:
+            return
+
+        self.show(event.message)
+
+    def show(self, message, percent=None):
+        """Redraw the bar (and the processing panel, if it is still on screen)"""
+        if percent is not None:
+            self.percent = percent
+        self.updates += 1
+        self.progress_placeholder.markdown(show_progress_animation(self.percent, message), unsafe_allow_html=True)
+        if self.processing_placeholder is not None:
+            self.processing_placeholder.text_area("Processing", "\n".join(self.lines), height=250, disabled=True,
+                                                  key=f"live_processing_{self.updates}", label_visibility="collapsed")
+
 class AudioPipeline:
     def __init__(self):
         self.ai_manager = AIModelManager()
@@ -25,6 +81,7 @@ class AudioPipeline:
 
         st.markdown("## 🎛️ Audio Generation Settings")
         st.info("🎯 **Workflow**: Choose settings → Generate → See text comparison → Listen to audio → Download results")
+        self._show_degraded_providers()
         
         # Settings columns
         col1, col2 = st.columns(2)
@@ -75,6 +132,17 @@ class AudioPipeline:
         if st.button("🎵 Generate Audiobook", type="primary", use_container_width=True):
             self._start_generation()
     
+    def _show_degraded_providers(self):
+        """Warn when a provider's circuit is open, so slower-than-usual or simpler output is expected"""
+        from circuit_breaker import degraded_providers
+
+        breaker = degraded_providers().get("gemini")
+        if breaker is not None:
+            retry_in = breaker.retry_in()
+            next_check = f"next check in {retry_in:.0f}s" if retry_in else "checking again on the next request"
+            st.warning(f"⚡ **Degraded mode**: Gemini is failing or slow, so text is rewritten locally without AI "
+                       f"enhancement ({next_check}).")
+
     def _show_tone_settings(self):
         """Show tone and intensity settings"""
         st.markdown("### 🎭 Tone & Style")
@@ -197,8 +265,11 @@ class AudioPipeline:
             "audio_quality": audio_quality
         }
     
+    @traced("generation")
     def _start_generation(self):
         """Start the audio generation process"""
+        st.session_state.last_trace_id = current_span().trace_id
+
         # Get settings from session state
         tone = st.session_state.get('selected_tone', 'Neutral')
         intensity = st.session_state.get('selected_intensity', 'Medium')
@@ -249,6 +320,7 @@ class AudioPipeline:
 
             comparison_placeholder = st.empty()
 
+        previous_events = self.ai_manager.events
         try:
             # Step 1: Show original text first
             with comparison_placeholder:
@@ -263,30 +335,24 @@ class AudioPipeline:
                 with col2:
                     st.markdown('<div class="live-comparison processing-indicator">', unsafe_allow_html=True)
                     st.markdown("#### ⏳ Rewriting in Progress...")
-                    processing_text = f"""🎭 Applying {tone} tone with {intensity} intensity...
-
-🔄 Step 1: Applying tone adaptation...
-✨ Step 2: Gemini AI enhancing content...
-📝 Adding details and context...
-🎯 Optimizing for audio narration...
-
-AI processing in progress!"""
-                    st.text_area("Processing", processing_text, height=250, disabled=True, key="live_processing", label_visibility="collapsed")
+                    processing_placeholder = st.empty()
                     st.markdown('</div>', unsafe_allow_html=True)
 
-            # Step 1: Text Rewriting with Local + Gemini AI
-            with status_placeholder:
-                st.markdown(show_progress_animation(10, "🎭 Rewriting text with Local + Gemini AI..."), unsafe_allow_html=True)
+            # Progress follows the pipeline's own stage events instead of fixed pauses
+            progress = GenerationProgress(progress_placeholder, processing_placeholder,
+                                          f"🎭 Applying {tone} tone with {intensity} intensity...")
+            self.ai_manager.events = MultiSink(previous_events, progress)
 
-            time.sleep(0.5)  # Faster animation
+            # Step 1: Text Rewriting with Local + Gemini AI
+            progress.show("🎭 Rewriting text with Local + Gemini AI...", percent=5)
 
             rewritten_text = self.ai_manager.rewrite_text_with_tone(
                 original_text, tone, intensity, language
             )
 
             # Update progress
-            with progress_placeholder:
-                st.markdown(show_progress_animation(60, "✅ Text enhanced and rewritten with AI!"), unsafe_allow_html=True)
+            progress.processing_placeholder = None  # replaced by the comparison below
+            progress.show("✅ Text enhanced and rewritten with AI!", percent=60)
 
             # Store rewritten text
             st.session_state.rewritten_text = rewritten_text
@@ -321,25 +387,19 @@ AI processing in progress!"""
                 with col4:
                     st.metric("Applied Tone", f"{tone} ({intensity})")
 
-            time.sleep(1)  # Faster comparison view
-
             # Step 2: Audio Generation with wave animation
             with status_placeholder:
                 st.markdown(show_audio_wave_animation(), unsafe_allow_html=True)
-
-            with progress_placeholder:
-                st.markdown(show_progress_animation(70, "🎤 Generating audio narration..."), unsafe_allow_html=True)
+            progress.show("🎤 Generating audio narration...", percent=70)
 
             audio_data = self.ai_manager.generate_speech(rewritten_text, voice, language)
 
             # Store audio data
             st.session_state.audio_data = audio_data
+            st.session_state.generated_at = int(time.time())
 
             # Complete with success animation
-            with progress_placeholder:
-                st.markdown(show_progress_animation(100, "✅ Generation complete!"), unsafe_allow_html=True)
-
-            time.sleep(1)
+            progress.show("✅ Generation complete!", percent=100)
 
             with status_placeholder:
                 show_success_animation("🎉 Audiobook generated successfully!")
@@ -351,10 +411,11 @@ AI processing in progress!"""
             # Add to history
             try:
                 from history_manager import HistoryManager
-                history_manager = HistoryManager()
-                history_manager.add_generation_to_history(
-                    original_text, rewritten_text, tone, voice, language
-                )
+                with span("history_save"):
+                    history_manager = HistoryManager()
+                    history_manager.add_generation_to_history(
+                        original_text, rewritten_text, tone, voice, language
+                    )
                 st.info("💾 Generation saved to history!")
             except Exception as e:
                 pass  # Don't break if history fails
@@ -369,6 +430,8 @@ AI processing in progress!"""
 
         except Exception as e:
             st.error(f"❌ Generation failed: {str(e)}")
+        finally:
+            self.ai_manager.events = previous_events
     
     def _show_generation_summary(self, rewritten_text, audio_data):
         """Show summary of generated content"""
@@ -414,6 +477,9 @@ AI processing in progress!"""
         
         # Download options
         self._show_download_options()
+
+        # Stage timing for the last generation
+        self._show_generation_trace()
     
     def _show_text_comparison(self):
         """Show side-by-side text comparison"""
@@ -506,14 +572,17 @@ AI processing in progress!"""
                     voice = audio_data.get("voice", "Unknown")
                     st.metric("Voice", voice)
 
-                # Audio player
-                if audio_data.get("audio_file"):
+                # Audio player - stream from the download server when possible
+                audio_format = audio_data.get("format", "wav")
+                audio_url = audio_download_url(audio_data, inline=True)
+                if audio_url:
+                    st.audio(audio_url, format=f"audio/{audio_format}")
+                elif audio_data.get("audio_file"):
                     try:
                         # Read audio file and display player
                         with open(audio_data["audio_file"], "rb") as audio_file:
                             audio_bytes = audio_file.read()
                             # Determine format based on file extension or metadata
-                            audio_format = audio_data.get("format", "wav")
                             if audio_format == "mp3":
                                 st.audio(audio_bytes, format="audio/mp3")
                             else:
@@ -522,7 +591,6 @@ AI processing in progress!"""
                         st.error(f"Error loading audio file: {str(e)}")
                 elif audio_data.get("audio_data"):
                     # Direct audio data
-                    audio_format = audio_data.get("format", "wav")
                     if audio_format == "mp3":
                         st.audio(audio_data["audio_data"], format="audio/mp3")
                     else:
@@ -549,35 +617,32 @@ AI processing in progress!"""
 
         audio_data = st.session_state.get('audio_data')
         rewritten_text = st.session_state.get('rewritten_text', '')
+        timestamp = st.session_state.get('generated_at', int(time.time()))
 
         col1, col2, col3 = st.columns(3)
 
         with col1:
             st.markdown("#### 🎵 Audio Download")
-            if audio_data and audio_data.get("audio_data"):
-                # Provide real audio download
-                audio_bytes = audio_data["audio_data"]
+            if audio_data and (audio_data.get("audio_data") or audio_data.get("audio_file")):
                 audio_format = audio_data.get("format", "wav")
+                filename = f"echoverse_audio_{timestamp}.{audio_format}"
+                label = f"📥 Download Audio ({audio_format.upper()})"
 
-                if audio_format == "mp3":
-                    filename = f"echoverse_audio_{int(time.time())}.mp3"
-                    mime_type = "audio/mp3"
-                    label = "📥 Download Audio (MP3)"
-                else:
-                    filename = f"echoverse_audio_{int(time.time())}.wav"
-                    mime_type = "audio/wav"
-                    label = "📥 Download Audio (WAV)"
-
-                st.download_button(
-                    label=label,
-                    data=audio_bytes,
-                    file_name=filename,
-                    mime=mime_type,
-                    use_container_width=True
-                )
+                # Links are served on demand; only fall back to an inline payload without the server
+                audio_url = audio_download_url(audio_data, basename=f"echoverse_audio_{timestamp}")
+                if audio_url:
+                    st.link_button(label, audio_url, use_container_width=True)
+                elif audio_data.get("audio_data"):
+                    st.download_button(
+                        label=label,
+                        data=audio_data["audio_data"],
+                        file_name=filename,
+                        mime=f"audio/{audio_format}",
+                        use_container_width=True
+                    )
 
                 # Show file info
-                file_size_mb = len(audio_bytes) / (1024 * 1024)
+                file_size_mb = audio_data.get("file_size", len(audio_data.get("audio_data") or b"")) / (1024 * 1024)
                 st.caption(f"File size: {file_size_mb:.2f} MB | Format: {audio_format.upper()}")
             else:
                 st.button("📥 Download Audio", disabled=True, use_container_width=True)
@@ -586,24 +651,12 @@ AI processing in progress!"""
         with col2:
             st.markdown("#### 📄 Text Download")
             if rewritten_text:
-                st.download_button(
-                    label="📄 Download Rewritten Text",
-                    data=rewritten_text,
-                    file_name=f"echoverse_rewritten_{int(time.time())}.txt",
-                    mime="text/plain",
-                    use_container_width=True
-                )
+                self._show_text_download("📄 Download Rewritten Text", rewritten_text, f"echoverse_rewritten_{timestamp}.txt")
 
                 # Original text download
                 original_text = st.session_state.get('original_text', '')
                 if original_text:
-                    st.download_button(
-                        label="📝 Download Original Text",
-                        data=original_text,
-                        file_name=f"echoverse_original_{int(time.time())}.txt",
-                        mime="text/plain",
-                        use_container_width=True
-                    )
+                    self._show_text_download("📝 Download Original Text", original_text, f"echoverse_original_{timestamp}.txt")
             else:
                 st.button("📄 Download Text", disabled=True, use_container_width=True)
                 st.caption("Process text first")
@@ -618,31 +671,37 @@ AI processing in progress!"""
                 st.button("📦 Download Package", disabled=True, use_container_width=True)
                 st.caption("Complete generation first")
 
+    def _show_text_download(self, label, text, filename):
+        """Show a text download as a link, or an inline download button without the server"""
+        text_url = bytes_download_url(text, filename, "text/plain; charset=utf-8")
+        if text_url:
+            st.link_button(label, text_url, use_container_width=True)
+        else:
+            st.download_button(
+                label=label,
+                data=text,
+                file_name=filename,
+                mime="text/plain",
+                use_container_width=True
+            )
+
     def _create_complete_package(self):
         """Create a complete downloadable package"""
-        import zipfile
-        import io
-        import json
+        from package_builder import PackageBuilder
 
-        # Create ZIP file in memory
-        zip_buffer = io.BytesIO()
+        audio_data = st.session_state.get('audio_data')
+        original_text = st.session_state.get('original_text', '')
+        rewritten_text = st.session_state.get('rewritten_text', '')
 
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            # Add audio file
-            audio_data = st.session_state.get('audio_data')
-            if audio_data and audio_data.get("audio_data"):
-                audio_format = audio_data.get("format", "wav")
-                audio_filename = f"audiobook.{audio_format}"
-                zip_file.writestr(audio_filename, audio_data["audio_data"])
+        # Stream the package to disk: audio is stored as-is, only text gets deflated
+        with PackageBuilder() as package:
+            audio_filename = package.add_audio(audio_data) or "audiobook"
 
             # Add texts
-            original_text = st.session_state.get('original_text', '')
-            rewritten_text = st.session_state.get('rewritten_text', '')
-
             if original_text:
-                zip_file.writestr("original_text.txt", original_text)
+                package.add_bytes("original_text.txt", original_text)
             if rewritten_text:
-                zip_file.writestr("rewritten_text.txt", rewritten_text)
+                package.add_bytes("rewritten_text.txt", rewritten_text)
 
             # Add settings/metadata
             metadata = {
@@ -655,32 +714,70 @@ AI processing in progress!"""
                 "estimated_duration": audio_data.get("total_duration", 0) if audio_data else 0
             }
 
-            zip_file.writestr("metadata.json", json.dumps(metadata, indent=2))
+            package.add_json("metadata.json", metadata)
 
             # Add README
-            readme_content = """# EchoVerse Audiobook Package
+            readme_content = f"""# EchoVerse Audiobook Package
 
 This package contains:
-- audiobook.wav: Generated audio file
+- {audio_filename}: Generated audio file
 - original_text.txt: Original input text
 - rewritten_text.txt: AI-rewritten text with tone adaptation
 - metadata.json: Generation settings and information
 
 Generated by EchoVerse - AI Audiobook Creator
 """
-            zip_file.writestr("README.txt", readme_content)
+            package.add_bytes("README.txt", readme_content)
 
-        zip_buffer.seek(0)
-
-        # Provide download
-        st.download_button(
-            label="📦 Download Complete Package (ZIP)",
-            data=zip_buffer.getvalue(),
-            file_name=f"echoverse_package_{int(time.time())}.zip",
-            mime="application/zip",
-            use_container_width=True
-        )
+        st.session_state.package_path = package.path
 
+        # Provide download straight from the package file
+        package_name = f"echoverse_package_{int(time.time())}.zip"
+        package_url = file_download_url(package.path, package_name, "application/zip")
+        if package_url:
+            st.link_button("📦 Download Complete Package (ZIP)", package_url, use_container_width=True)
+        else:
+            with open(package.path, "rb") as package_file:
+                st.download_button(
+                    label="📦 Download Complete Package (ZIP)",
+                    data=package_file,
+                    file_name=package_name,
+                    mime="application/zip",
+                    use_container_width=True
+                )
 
         st.success("📦 Package created successfully!")
         st.balloons()
+
+    def _show_generation_trace(self):
+        """Show a waterfall of the stages recorded for the last generation"""
+        trace_id = st.session_state.get('last_trace_id')
+        if not trace_id:
+            return
+
+        with st.expander("⏱️ Generation Timing"):
+            spans = get_trace(trace_id)
+            rows = waterfall_rows(spans)
+            if not rows:
+                st.info("No timing data recorded for this generation.")
+                return
+
+            import plotly.graph_objects as go
+
+            labels = [f"{'· ' * row['depth']}{row['name']}" for row in rows]
+            fig = go.Figure(go.Bar(
+                y=labels,
+                x=[row["duration"] * 1000 for row in rows],
+                base=[row["offset"] * 1000 for row in rows],
+                orientation="h",
+                marker_color=["#dc3545" if row["status"] == "error" else "#28a745" for row in rows],
+                hovertext=[", ".join(f"{k}={v}" for k, v in row["attributes"].items()) for row in rows]
+            ))
+            fig.update_layout(
+                xaxis_title="Milliseconds since start",
+                yaxis={"autorange": "reversed"},
+                height=max(250, 28 * len(rows)),
+                margin={"l": 10, "r": 10, "t": 10, "b": 40}
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            st.caption(f"Trace {trace_id} · {len(rows)} spans · total {rows[0]['duration']:.2f}s")
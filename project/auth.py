@@ -8,6 +8,8 @@ import bcrypt
 import json
 import os
 from datetime import datetime
+from config import ADMIN_USERS
+import metrics
 
 # User database file
 USER_DB_FILE = "users.json"
@@ -33,7 +35,8 @@ def hash_password(password):
 
 def verify_password(password, hashed):
     """Verify password against hash"""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    with metrics.histogram("echoverse_auth_password_check_seconds", "bcrypt password verification time").time():
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
 
 def register_user(username, email, password):
     """Register a new user"""
@@ -56,6 +59,7 @@ def register_user(username, email, password):
     }
     
     save_users(users)
+    metrics.counter("echoverse_auth_signups_total", "Accounts created").inc()
     return True, "User registered successfully"
 
 def authenticate_user(username, password):
@@ -63,14 +67,17 @@ def authenticate_user(username, password):
     users = load_users()
     
     if username not in users:
+        metrics.counter("echoverse_auth_logins_total", "Login attempts by result", result="unknown_user").inc()
         return False, "Username not found"
     
     if verify_password(password, users[username]['password']):
         # Update last login
         users[username]['last_login'] = datetime.now().isoformat()
         save_users(users)
+        metrics.counter("echoverse_auth_logins_total", "Login attempts by result", result="success").inc()
         return True, "Login successful"
     
+    metrics.counter("echoverse_auth_logins_total", "Login attempts by result", result="bad_password").inc()
     return False, "Invalid password"
 
 def show_login_form():
@@ -217,3 +224,7 @@ def is_authenticated():
 def get_current_user():
     """Get current logged in username"""
     return st.session_state.get('username', None)
+
+def is_admin():
+    """Check if the current user is listed in ECHOVERSE_ADMIN_USERS"""
+    return is_authenticated() and get_current_user() in ADMIN_USERS
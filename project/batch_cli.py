@@ -0,0 +1,190 @@
+"""
+EchoVerse Headless Batch Runner
+Converts a directory of text/PDF files into audiobook packages without a browser
+
+Usage:
+    python batch_cli.py in_dir out_dir --tone Suspenseful --voice Lisa --workers 8
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from datetime import datetime
+
+# Add current directory to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import TONE_OPTIONS, INTENSITY_LEVELS, VOICE_OPTIONS, LANGUAGE_OPTIONS, ALLOWED_FILE_TYPES, BATCH_MAX_WORKERS
+
+def parse_args(argv=None):
+    """Parse command-line arguments"""
+    parser = argparse.ArgumentParser(description="Convert a folder of text/PDF files into EchoVerse audiobook packages.")
+    parser.add_argument("in_dir", help="Directory containing .txt or .pdf files")
+    parser.add_argument("out_dir", help="Directory to write packages and results.jsonl to")
+    parser.add_argument("--tone", choices=list(TONE_OPTIONS.keys()), default="Neutral")
+    parser.add_argument("--intensity", choices=list(INTENSITY_LEVELS.keys()), default="Medium")
+    parser.add_argument("--voice", choices=list(VOICE_OPTIONS.keys()), default="Lisa")
+    parser.add_argument("--language", choices=list(LANGUAGE_OPTIONS.keys()), default="English")
+    parser.add_argument("--workers", type=int, default=BATCH_MAX_WORKERS, help="Number of files processed concurrently")
+    parser.add_argument("--recursive", action="store_true", help="Also pick up files in subdirectories")
+    parser.add_argument("--quiet", action="store_true", help="Only print the final summary")
+    parser.add_argument("--verbose", action="store_true", help="Log every pipeline event")
+    return parser.parse_args(argv)
+
+def collect_files(in_dir, recursive=False):
+    """Return (relative name, bytes) pairs for every supported file in in_dir"""
+    extensions = tuple(f".{ext}" for ext in ALLOWED_FILE_TYPES)
+    paths = []
+
+    if recursive:
+        for root, _, names in os.walk(in_dir):
+            paths.extend(os.path.join(root, name) for name in names)
+    else:
+        paths = [os.path.join(in_dir, name) for name in os.listdir(in_dir)]
+
+    files = []
+    for path in sorted(paths):
+        if os.path.isfile(path) and path.lower().endswith(extensions):
+            with open(path, "rb") as f:
+                files.append((os.path.relpath(path, in_dir), f.read()))
+    return files
+
+def package_path_for(out_dir, filename):
+    """Where the package for one input file is written"""
+    stem = os.path.splitext(filename)[0].replace(os.sep, "__")
+    return os.path.join(out_dir, f"{stem}.zip")
+
+def write_package(out_dir, result, settings):
+    """Package one finished file next to the others and return the package path"""
+    from package_builder import PackageBuilder
+
+    package_path = package_path_for(out_dir, result["filename"])
+    partial_path = f"{package_path}.part"
+
+    # Written under a temporary name so an interrupted run never leaves a truncated package behind
+    with PackageBuilder(package_path=partial_path) as package:
+        audio_filename = package.add_audio(result.get("audio_data"))
+        package.add_bytes("original_text.txt", result["original_text"])
+        package.add_bytes("rewritten_text.txt", result["rewritten_text"])
+        package.add_json("metadata.json", {
+            "source": result["filename"],
+            "tone": settings["tone"],
+            "intensity": settings["intensity"],
+            "voice": settings["voice"],
+            "language": settings["language"],
+            "audio": audio_filename,
+            "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "word_count": len(result["rewritten_text"].split())
+        })
+
+    os.replace(partial_path, package_path)
+    return package_path
+
+def main(argv=None):
+    """Run a headless batch conversion"""
+    args = parse_args(argv)
+
+    from ai_models import AIModelManager
+    from batch_executor import BatchExecutor
+    from batch_jobs import BatchJob
+    from events import LoggingSink
+
+    # Pipeline events go to the log; only warnings and errors unless --verbose
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s %(levelname)s %(threadName)s %(message)s")
+
+    if not os.path.isdir(args.in_dir):
+        print(f"❌ Input directory not found: {args.in_dir}")
+        return 2
+
+    files = collect_files(args.in_dir, args.recursive)
+    if not files:
+        print(f"❌ No {', '.join(ALLOWED_FILE_TYPES)} files found in {args.in_dir}")
+        return 2
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    settings = {
+        "tone": args.tone,
+        "intensity": args.intensity,
+        "voice": args.voice,
+        "language": args.language,
+        "parallel": args.workers > 1
+    }
+
+    # Jobs live in the output directory so an interrupted run resumes where it stopped
+    job = BatchJob.create_or_resume(files, settings, jobs_dir=os.path.join(args.out_dir, ".echoverse_jobs"))
+    already_done, total = job.progress()
+
+    print(f"🎧 EchoVerse batch: {total} files, {args.workers} worker(s), job {job.job_id}")
+    if already_done:
+        print(f"⏯️ Resuming: {already_done}/{total} files already done")
+
+    stats = {"succeeded": 0, "failed": 0, "resumed": 0, "input_chars": 0, "audio_minutes": 0.0, "audio_bytes": 0}
+    results_path = os.path.join(args.out_dir, "results.jsonl")
+    started = time.time()
+
+    with open(results_path, "a", encoding="utf-8") as results_file:
+        def on_result(result, completed, total):
+            record = {
+                "filename": result["filename"],
+                "status": result["status"],
+                "finished_at": datetime.now().isoformat(),
+                "elapsed": round(result.get("elapsed", 0), 3)
+            }
+
+            resumed = result.get("resumed")
+            if result["status"] == "success" and resumed and os.path.exists(package_path_for(args.out_dir, result["filename"])):
+                # Finished in an earlier run; its package is already on disk
+                stats["resumed"] += 1
+                record["resumed"] = True
+            elif result["status"] == "success":
+                # New, or finished earlier but its package was never written: package it from the checkpoints
+                if resumed:
+                    record["repackaged"] = True
+                audio = result.get("audio_data") or {}
+                try:
+                    record["package"] = write_package(args.out_dir, result, settings)
+                except Exception as e:
+                    record["status"] = "error"
+                    record["error"] = f"Packaging failed: {e}"
+                else:
+                    stats["succeeded"] += 1
+                    stats["input_chars"] += len(result["original_text"])
+                    stats["audio_minutes"] += audio.get("total_duration", audio.get("duration", 0)) or 0
+                    stats["audio_bytes"] += audio.get("file_size", 0) or 0
+
+            if record["status"] != "success":
+                stats["failed"] += 1
+                record["error"] = record.get("error", result.get("error"))
+
+            results_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            results_file.flush()
+
+            if not args.quiet:
+                icon = "✅" if record["status"] == "success" else "❌"
+                detail = record.get("error") or f"{record['elapsed']:.1f}s"
+                print(f"{icon} [{completed}/{total}] {result['filename']} ({detail})")
+
+        executor = BatchExecutor(AIModelManager(event_sink=LoggingSink()), max_workers=args.workers)
+        executor.run(job.inputs(), settings, on_result=on_result, job=job)
+
+    elapsed = max(time.time() - started, 1e-9)
+    processed = stats["succeeded"] + stats["failed"]
+
+    print("=" * 50)
+    print(f"📊 Files: {stats['succeeded']} succeeded, {stats['failed']} failed, {stats['resumed']} resumed from earlier runs")
+    print(f"⏱️ Elapsed: {elapsed:.1f}s | {processed / elapsed * 60:.1f} files/min | {stats['input_chars'] / elapsed:,.0f} chars/s")
+    print(f"🎵 Audio: {stats['audio_minutes']:.1f} min ({stats['audio_bytes'] / (1024 * 1024):.1f} MB), "
+          f"{stats['audio_minutes'] * 60 / elapsed:.1f}x real time")
+    print(f"📝 Results: {results_path}")
+
+    import metrics
+    print(f"📈 Metrics: {metrics.registry.write_prometheus(os.path.join(args.out_dir, 'metrics.prom'))}")
+
+    return 0 if stats["failed"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
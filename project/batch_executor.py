@@ -0,0 +1,146 @@
+"""
+EchoVerse Batch Executor
+Runs extract → rewrite → synthesize for many files on a worker pool
+"""
+
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config import BATCH_MAX_WORKERS
+from tracing import span, run_in_context
+from prompt_packing import packing_scope
+import metrics
+
+class BatchExecutor:
+    def __init__(self, ai_manager, max_workers=BATCH_MAX_WORKERS):
+        self.ai_manager = ai_manager
+        self.max_workers = max(1, max_workers)
+        self._queue_depth = metrics.gauge("echoverse_batch_queue_depth", "Batch files waiting for or in a worker")
+        metrics.gauge("echoverse_batch_workers", "Size of the batch worker pool").set(self.max_workers)
+
+    def extract_text(self, filename, data):
+        """Extract text from raw file bytes"""
+        if filename.endswith('.txt'):
+            return data.decode('utf-8')
+        if filename.endswith('.pdf'):
+            from utils import extract_text_from_pdf
+            return extract_text_from_pdf(io.BytesIO(data), event_sink=self.ai_manager.events)
+        return None
+
+    def process_file(self, filename, data, settings, job=None, index=None):
+        """Run the full pipeline for one file and return its result dict.
+
+        With a job, each stage output is checkpointed to disk and stages that
+        already finished in an earlier run are loaded instead of recomputed.
+        """
+        busy = metrics.gauge("echoverse_batch_workers_busy", "Batch workers currently processing a file")
+        busy.inc()
+        # Small rewrites of files in the same job (never another user's) may share one Gemini request
+        scope = (job.manifest.get("owner"), job.job_id) if job is not None else id(self)
+        try:
+            with span("batch_file", filename=filename, bytes=len(data)), packing_scope(scope), \
+                    metrics.histogram("echoverse_batch_file_seconds", "Time to process one batch file").time():
+                result = self._process_file(filename, data, settings, job, index)
+        finally:
+            busy.dec()
+
+        metrics.counter("echoverse_batch_files_total", "Batch files processed by outcome", outcome=result["status"]).inc()
+        return result
+
+    def _process_file(self, filename, data, settings, job=None, index=None):
+        started = time.time()
+
+        def checkpoint(stage, compute):
+            with span(f"stage.{stage}") as stage_span:
+                if job is not None:
+                    cached = job.load_stage(index, stage)
+                    metrics.cache_lookup("batch_checkpoints", cached is not None)
+                    if cached is not None:
+                        stage_span.set(cache="hit")
+                        return cached
+                stage_span.set(cache="miss")
+                value = compute()
+                if job is not None and value is not None:
+                    with span("checkpoint_write"):
+                        job.save_stage(index, stage, value)
+                return value
+
+        try:
+            text_content = checkpoint("extracted", lambda: self.extract_text(filename, data))
+            if text_content is None:
+                raise ValueError("Unsupported file type or unreadable file")
+
+            # Provider calls inside the manager are capped by rate_limits.provider_slot
+            rewritten_text = checkpoint("rewritten", lambda: self.ai_manager.rewrite_text_with_tone(
+                text_content, settings['tone'], settings['intensity'], settings['language']
+            ))
+
+            audio_data = checkpoint("audio", lambda: self.ai_manager.generate_speech(
+                rewritten_text, settings['voice'], settings['language']
+            ))
+            if audio_data is None:
+                raise ValueError("Audio generation failed")
+
+            if job is not None:
+                job.mark(index, "success")
+
+            return {
+                "filename": filename,
+                "original_text": text_content,
+                "rewritten_text": rewritten_text,
+                "audio_data": audio_data,
+                "status": "success",
+                "elapsed": time.time() - started
+            }
+
+        except Exception as e:
+            if job is not None:
+                job.mark(index, "error", str(e))
+
+            return {
+                "filename": filename,
+                "status": "error",
+                "error": str(e),
+                "elapsed": time.time() - started
+            }
+
+    def run(self, files, settings, on_result=None, job=None):
+        """Process (filename, data) pairs concurrently.
+
+        on_result(result, completed, total) is called on the calling thread as each
+        file finishes, so Streamlit widgets can be updated from it. Results are
+        returned in the original file order. With a job, files that already
+        succeeded are reported from their checkpoints without being reprocessed.
+        """
+        total = len(files)
+        results = [None] * total
+        pending = list(range(total))
+        completed = 0
+
+        if job is not None:
+            pending = job.pending_indexes()
+            for index in range(total):
+                if index not in pending:
+                    results[index] = job.result(index)
+                    completed += 1
+                    if on_result:
+                        on_result(results[index], completed, total)
+
+        workers = min(self.max_workers, len(pending)) or 1
+        self._queue_depth.inc(len(pending))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="echoverse-batch") as pool:
+            futures = {
+                pool.submit(run_in_context(self.process_file, files[index][0], files[index][1], settings, job, index)): index
+                for index in pending
+            }
+
+            for future in as_completed(futures):
+                index = futures[future]
+                self._queue_depth.dec()
+                results[index] = future.result()
+                completed += 1
+                if on_result:
+                    on_result(results[index], completed, total)
+
+        return results
@@ -0,0 +1,229 @@
+"""
+EchoVerse Batch Jobs
+Durable, checkpointed batch jobs that can be resumed after a restart
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime
+from config import BATCH_JOBS_DIR
+
+STAGE_FILES = {
+    "extracted": "extracted.txt",
+    "rewritten": "rewritten.txt"
+}
+
+# Settings that change a job's output; the rest (worker count, packaging options) may differ on resume
+OUTPUT_SETTINGS = ("tone", "intensity", "voice", "language")
+
+def _atomic_write(path, data):
+    """Write a file so readers never see a partial checkpoint"""
+    tmp_path = f"{path}.tmp"
+    mode = "wb" if isinstance(data, bytes) else "w"
+    encoding = None if isinstance(data, bytes) else "utf-8"
+
+    with open(tmp_path, mode, encoding=encoding) as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def make_job_id(files, settings):
+    """Derive a stable job id from the inputs so re-running the same batch resumes it"""
+    digest = hashlib.sha256()
+    output_settings = {key: settings.get(key) for key in OUTPUT_SETTINGS}
+    digest.update(json.dumps(output_settings, sort_keys=True).encode("utf-8"))
+    for filename, data in files:
+        digest.update(filename.encode("utf-8"))
+        digest.update(hashlib.sha256(data).digest())
+    return f"batch_{digest.hexdigest()[:16]}"
+
+def owner_jobs_dir(owner, jobs_dir=None):
+    """Directory holding one user's jobs; usernames are hashed so they never form a path"""
+    jobs_dir = jobs_dir or BATCH_JOBS_DIR
+    if owner is None:
+        return jobs_dir
+    return os.path.join(jobs_dir, "users", hashlib.sha256(owner.encode("utf-8")).hexdigest()[:16])
+
+class BatchJob:
+    def __init__(self, job_id, jobs_dir=None):
+        self.job_id = job_id
+        self.job_dir = os.path.join(jobs_dir or BATCH_JOBS_DIR, job_id)
+        self.manifest_path = os.path.join(self.job_dir, "job.json")
+        self._lock = threading.RLock()
+        self.manifest = None
+
+    @classmethod
+    def create_or_resume(cls, files, settings, jobs_dir=None, owner=None):
+        """Open the owner's job for these inputs, creating it (and saving the inputs) if needed"""
+        job = cls(make_job_id(files, settings), owner_jobs_dir(owner, jobs_dir))
+
+        if os.path.exists(job.manifest_path):
+            job.load()
+            job.manifest["settings"] = dict(settings)
+            job.save()
+            return job
+
+        os.makedirs(job.job_dir, exist_ok=True)
+        entries = []
+        for index, (filename, data) in enumerate(files):
+            file_dir = job._file_dir(index)
+            os.makedirs(file_dir, exist_ok=True)
+            _atomic_write(os.path.join(file_dir, "input.bin"), data)
+            entries.append({"index": index, "filename": filename, "status": "pending", "stages": {}})
+
+        job.manifest = {
+            "id": job.job_id,
+            "created_at": datetime.now().isoformat(),
+            "updated_at": datetime.now().isoformat(),
+            "owner": owner,
+            "settings": settings,
+            "files": entries
+        }
+        job.save()
+        return job
+
+    @classmethod
+    def list_jobs(cls, jobs_dir=None, owner=None):
+        """Return the owner's jobs on disk, newest first"""
+        jobs_dir = owner_jobs_dir(owner, jobs_dir)
+        if not os.path.isdir(jobs_dir):
+            return []
+
+        jobs = []
+        for job_id in os.listdir(jobs_dir):
+            job = cls(job_id, jobs_dir)
+            if os.path.exists(job.manifest_path):
+                try:
+                    job.load()
+                except (OSError, ValueError):
+                    continue
+                if job.owned_by(owner):
+                    jobs.append(job)
+        return sorted(jobs, key=lambda job: job.manifest["updated_at"], reverse=True)
+
+    def load(self):
+        """Load the manifest from disk"""
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        return self
+
+    def owned_by(self, owner):
+        return self.manifest.get("owner") == owner
+
+    def save(self):
+        """Persist the manifest"""
+        with self._lock:
+            self.manifest["updated_at"] = datetime.now().isoformat()
+            _atomic_write(self.manifest_path, json.dumps(self.manifest, indent=2, ensure_ascii=False))
+
+    def _file_dir(self, index):
+        return os.path.join(self.job_dir, "files", f"{index:05d}")
+
+    @property
+    def settings(self):
+        return self.manifest["settings"]
+
+    def inputs(self):
+        """Return (filename, data) pairs for every file in the job"""
+        pairs = []
+        for entry in self.manifest["files"]:
+            with open(os.path.join(self._file_dir(entry["index"]), "input.bin"), "rb") as f:
+                pairs.append((entry["filename"], f.read()))
+        return pairs
+
+    def pending_indexes(self):
+        """Indexes of files that have not completed successfully"""
+        return [entry["index"] for entry in self.manifest["files"] if entry["status"] != "success"]
+
+    def progress(self):
+        """Return (completed, total) counts"""
+        files = self.manifest["files"]
+        return len([entry for entry in files if entry["status"] == "success"]), len(files)
+
+    def is_complete(self):
+        return not self.pending_indexes()
+
+    # Stage checkpoints
+
+    def load_stage(self, index, stage):
+        """Return a checkpointed stage output, or None if the stage has not finished"""
+        entry = self.manifest["files"][index]
+        if stage not in entry["stages"]:
+            return None
+
+        if stage == "audio":
+            audio = dict(entry["stages"]["audio"])
+            return audio if os.path.exists(audio.get("audio_file", "")) else None
+
+        path = os.path.join(self._file_dir(index), STAGE_FILES[stage])
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def save_stage(self, index, stage, value):
+        """Checkpoint a stage output for one file"""
+        entry = self.manifest["files"][index]
+
+        if stage == "audio":
+            audio_format = value.get("format", "wav")
+            audio_path = os.path.join(self._file_dir(index), f"audio.{audio_format}")
+            if value.get("audio_data"):
+                _atomic_write(audio_path, value["audio_data"])
+            elif value.get("audio_file") and os.path.abspath(value["audio_file"]) != audio_path:
+                with open(value["audio_file"], "rb") as f:
+                    _atomic_write(audio_path, f.read())
+
+            audio_stage = {
+                "audio_file": audio_path,
+                "format": audio_format,
+                "voice": value.get("voice"),
+                "language": value.get("language"),
+                "duration": value.get("duration", value.get("total_duration", 0)),
+                "file_size": os.path.getsize(audio_path)
+            }
+            with self._lock:
+                entry["stages"]["audio"] = audio_stage
+                entry["status"] = "running"
+                self.save()
+        else:
+            _atomic_write(os.path.join(self._file_dir(index), STAGE_FILES[stage]), value)
+            with self._lock:
+                entry["stages"][stage] = {"completed_at": time.time()}
+                entry["status"] = "running"
+                self.save()
+
+    def mark(self, index, status, error=None):
+        """Record the final status of one file"""
+        with self._lock:
+            entry = self.manifest["files"][index]
+            entry["status"] = status
+            entry["attempts"] = entry.get("attempts", 0) + 1
+            if error:
+                entry["error"] = error
+            else:
+                entry.pop("error", None)
+            self.save()
+
+    def result(self, index):
+        """Rebuild the result dict for a file from its checkpoints"""
+        entry = self.manifest["files"][index]
+        if entry["status"] != "success":
+            return {
+                "filename": entry["filename"],
+                "status": "error",
+                "error": entry.get("error", "Not processed yet")
+            }
+
+        return {
+            "filename": entry["filename"],
+            "original_text": self.load_stage(index, "extracted"),
+            "rewritten_text": self.load_stage(index, "rewritten"),
+            "audio_data": self.load_stage(index, "audio"),
+            "status": "success",
+            "resumed": True
+        }
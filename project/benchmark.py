@@ -0,0 +1,313 @@
+"""
+EchoVerse Benchmarks
+Times the text-processing hot paths and end-to-end generation against the
+local fake providers, and compares result files to catch regressions
+
+Usage:
+    python benchmark.py run                                   # full suite, 10 KB – 10 MB corpora
+    python benchmark.py run --sizes 10k,100k --e2e-sizes 1k   # quicker run
+    python benchmark.py compare baseline.json current.json --threshold 10
+    python benchmark.py imports --budget-ms 50                # cold-start import budget for the login page
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import tempfile
+import subprocess
+from datetime import datetime
+
+# Add current directory to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZES = "10k,100k,1m,10m"
+DEFAULT_E2E_SIZES = "1k,10k,50k"
+# Import budget: what importing the app costs on top of Streamlit, which the server has already loaded
+IMPORT_TARGET = "main_app"
+IMPORT_PRELOADED = ("streamlit", "streamlit_option_menu")
+DEFERRED_MODULES = ("PyPDF2", "requests", "streamlit_lottie", "plotly", "numpy", "gtts", "pyttsx3")
+WORDS = ("the", "audio", "story", "night", "river", "voice", "quietly", "remarkable", "journey", "listener",
+         "chapter", "whispered", "ancient", "library", "signal", "between", "because", "morning", "echo", "verse")
+
+def parse_size(value):
+    """Parse sizes like 10k, 1m, 2048 into bytes"""
+    value = value.strip().lower().rstrip("b")
+    multiplier = {"k": 1024, "m": 1024 * 1024}.get(value[-1:], 1)
+    return int(float(value.rstrip("km")) * multiplier)
+
+def format_size(size):
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):g}MB"
+    if size >= 1024:
+        return f"{size / 1024:g}KB"
+    return f"{size}B"
+
+def make_corpus(size, seed=42):
+    """Deterministic book-like text with chapters, headings, paragraphs and punctuation"""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    chapter = 0
+
+    while length < size:
+        if not parts or rng.random() < 0.02:
+            chapter += 1
+            heading = f"Chapter {chapter}" if chapter % 3 else f"PART {chapter // 3} THE {rng.choice(WORDS).upper()}"
+            parts.append(f"\n{heading}\n\n")
+        sentences = []
+        for _ in range(rng.randint(3, 8)):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(6, 18))]
+            words[0] = words[0].capitalize()
+            if rng.random() < 0.1:
+                words.insert(rng.randint(1, len(words) - 1), "—“quoted”—")
+            sentences.append(" ".join(words) + rng.choice(".....!?"))
+        paragraph = " ".join(sentences) + "\n\n"
+        parts.append(paragraph)
+        length += len(paragraph)
+
+    return "".join(parts)[:size]
+
+def measure(fn, min_time=0.5, max_repeats=5):
+    """Call fn repeatedly (at least once, until min_time or max_repeats) and summarise the timings"""
+    timings = []
+    started = time.perf_counter()
+    while not timings or (len(timings) < max_repeats and time.perf_counter() - started < min_time):
+        call_started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - call_started)
+
+    return {
+        "repeats": len(timings),
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "max": max(timings)
+    }
+
+def start_stub_providers(latency, jitter):
+    """Start the fake providers and point config at them (must run before config is imported)"""
+    from fake_providers import start_fake_providers, ProviderBehavior, provider_env
+
+    server = start_fake_providers(behavior=ProviderBehavior(latency=latency, jitter=jitter))
+    os.environ.update(provider_env(server.base_url))
+    os.environ.setdefault("ECHOVERSE_TRACING", "false")
+    os.environ.setdefault("ECHOVERSE_DOWNLOAD_SERVER", "false")
+    return server
+
+def micro_benchmarks(sizes, min_time, max_repeats, log):
+    """Time the pure text-processing functions on each corpus size"""
+    from utils import chunk_text, detect_chapters, generate_summary
+    from text_processor import TextProcessor
+    from ai_models import AIModelManager
+    from events import NullSink
+
+    text_processor = TextProcessor()
+    ai_manager = AIModelManager(event_sink=NullSink())
+
+    cases = {
+        "chunk_text": lambda text: chunk_text(text, 1500),
+        "clean_text": text_processor._clean_text,
+        "detect_chapters": detect_chapters,
+        "generate_summary": lambda text: generate_summary(text, 200),
+        "apply_tone_locally": lambda text: ai_manager._apply_tone_locally(text, "Suspenseful", "Medium")
+    }
+
+    results = {}
+    for size in sizes:
+        text = make_corpus(size)
+        for name, case in cases.items():
+            key = f"{name}@{format_size(size)}"
+            result = measure(lambda: case(text), min_time, max_repeats)
+            result["bytes"] = len(text.encode("utf-8"))
+            result["mb_per_s"] = result["bytes"] / (1024 * 1024) / result["median"] if result["median"] else None
+            results[key] = result
+            log(f"⏱️ {key:<28} {result['median'] * 1000:10.2f} ms  ({result['repeats']}x)")
+    return results
+
+def e2e_benchmarks(sizes, repeats, log):
+    """Time rewrite → synthesize → package for each size against the stub providers"""
+    from ai_models import AIModelManager
+    from batch_executor import BatchExecutor
+    from batch_cli import write_package
+    from events import NullSink
+
+    settings = {"tone": "Suspenseful", "intensity": "Medium", "voice": "Lisa", "language": "English"}
+    executor = BatchExecutor(AIModelManager(event_sink=NullSink()), max_workers=1)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="echoverse_bench_") as out_dir:
+        for size in sizes:
+            text = make_corpus(size)
+            key = f"e2e_rewrite_synthesize_package@{format_size(size)}"
+
+            def run_once():
+                result = executor.process_file("bench.txt", text.encode("utf-8"), settings)
+                if result["status"] != "success":
+                    raise RuntimeError(f"{key} failed: {result.get('error')}")
+                write_package(out_dir, result, settings)
+
+            result = measure(run_once, min_time=float("inf"), max_repeats=repeats)
+            result["bytes"] = len(text.encode("utf-8"))
+            results[key] = result
+            log(f"🎧 {key:<40} {result['median'] * 1000:10.1f} ms  ({result['repeats']}x)")
+    return results
+
+def run(args):
+    """Run the suite and write the results file"""
+    log = (lambda message: None) if args.quiet else print
+    server = start_stub_providers(args.latency, args.jitter)
+
+    results = {}
+    sizes = [parse_size(size) for size in args.sizes.split(",") if size]
+    e2e_sizes = [parse_size(size) for size in args.e2e_sizes.split(",") if size]
+
+    results.update(micro_benchmarks(sizes, args.min_time, args.repeats, log))
+    if e2e_sizes:
+        results.update(e2e_benchmarks(e2e_sizes, args.e2e_repeats, log))
+    server.shutdown()
+
+    document = {
+        "meta": {
+            "created_at": datetime.now().isoformat(),
+            "release": os.getenv("ECHOVERSE_RELEASE", "dev"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "provider_latency": args.latency,
+            "provider_jitter": args.jitter
+        },
+        "results": results
+    }
+
+    output = args.output or os.path.join("benchmark_results", f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+
+    print(f"📝 Results: {output}")
+    return 0
+
+def compare(args):
+    """Compare two result files; exit 1 if any benchmark slowed down by more than the threshold"""
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    with open(args.current, "r", encoding="utf-8") as f:
+        current = json.load(f)["results"]
+
+    regressions = []
+    print(f"{'benchmark':<44} {'baseline':>12} {'current':>12} {'change':>9}")
+    for key in sorted(set(baseline) | set(current)):
+        if key not in baseline or key not in current:
+            print(f"{key:<44} {'—' if key not in baseline else '':>12} {'—' if key not in current else '':>12}   (only in one file)")
+            continue
+
+        before, after = baseline[key][args.stat], current[key][args.stat]
+        change = (after - before) / before * 100 if before else 0.0
+        # Ignore sub-noise-floor differences on very fast benchmarks
+        regressed = change > args.threshold and (after - before) > args.noise_floor
+        marker = "❌" if regressed else ("✅" if change < -args.threshold else "  ")
+        print(f"{key:<44} {before * 1000:10.2f}ms {after * 1000:10.2f}ms {change:+8.1f}% {marker}")
+        if regressed:
+            regressions.append(key)
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) over {args.threshold:g}%: {', '.join(regressions)}")
+        return 1
+
+    print(f"\n✅ No regressions over {args.threshold:g}%")
+    return 0
+
+def import_profile(target=IMPORT_TARGET, preloaded=IMPORT_PRELOADED):
+    """Import target in a fresh interpreter with -X importtime; return its cumulative time and what it loaded"""
+    code = f"import {', '.join(preloaded)}; import {target}" if preloaded else f"import {target}"
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+
+    # Lines are "import time: self [us] | cumulative | <indent>module", children before their parent
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        entries.append((name.strip(), (len(name) - len(name.lstrip()) - 1) // 2, int(cumulative) / 1e6))
+
+    # Everything after the last preloaded top-level module was loaded by the target
+    start = max((i + 1 for i, (name, depth, _) in enumerate(entries) if depth == 0 and name in preloaded), default=0)
+    loaded = entries[start:]
+    total = next((seconds for name, depth, seconds in loaded if depth == 0 and name == target), None)
+    if total is None:
+        raise RuntimeError(f"Could not import {target}: {completed.stderr.strip().splitlines()[-1:]}")
+
+    return {
+        "seconds": total,
+        "modules": [name for name, _, _ in loaded],
+        "direct": sorted(((name, seconds) for name, depth, seconds in loaded if depth == 1), key=lambda item: -item[1])
+    }
+
+def imports(args):
+    """Check the login page's cold-start import time against a budget; exit 1 when over it"""
+    runs = [import_profile(args.target) for _ in range(args.runs)]
+    best = min(runs, key=lambda run: run["seconds"])
+    budget = args.budget_ms / 1000
+
+    print(f"📦 import {args.target}: {best['seconds'] * 1000:.1f} ms (best of {args.runs}, Streamlit preloaded)")
+    for name, seconds in best["direct"][:args.top]:
+        print(f"   {name:<32} {seconds * 1000:8.1f} ms")
+
+    failures = []
+    eager = sorted({name.split(".")[0] for name in best["modules"]} & set(DEFERRED_MODULES))
+    if eager:
+        failures.append(f"heavy modules imported at startup: {', '.join(eager)}")
+    if best["seconds"] > budget:
+        failures.append(f"{best['seconds'] * 1000:.1f} ms is over the {args.budget_ms:g} ms budget")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        return 1
+
+    print(f"✅ Within the {args.budget_ms:g} ms import budget")
+    return 0
+
+def parse_args(argv=None):
+    """Parse command-line arguments"""
+    parser = argparse.ArgumentParser(description="EchoVerse performance benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmark suite")
+    run_parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Corpus sizes for the text benchmarks")
+    run_parser.add_argument("--e2e-sizes", default=DEFAULT_E2E_SIZES, help="Text sizes for end-to-end runs (empty to skip)")
+    run_parser.add_argument("--latency", type=float, default=0.05, help="Simulated provider latency in seconds")
+    run_parser.add_argument("--jitter", type=float, default=0.0, help="Extra random provider latency in seconds")
+    run_parser.add_argument("--min-time", type=float, default=0.5, help="Keep repeating a text benchmark for at least this long")
+    run_parser.add_argument("--repeats", type=int, default=5, help="Maximum repeats per text benchmark")
+    run_parser.add_argument("--e2e-repeats", type=int, default=3, help="Repeats per end-to-end benchmark")
+    run_parser.add_argument("--output", help="Results file (default: benchmark_results/bench_<timestamp>.json)")
+    run_parser.add_argument("--quiet", action="store_true")
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="Allowed slowdown in percent")
+    compare_parser.add_argument("--stat", choices=["min", "median", "mean"], default="median")
+    compare_parser.add_argument("--noise-floor", type=float, default=0.001, help="Ignore slowdowns smaller than this many seconds")
+
+    imports_parser = commands.add_parser("imports", help="Check the app's cold-start import time")
+    imports_parser.add_argument("--budget-ms", type=float, default=50.0, help="Maximum import time on top of Streamlit")
+    imports_parser.add_argument("--target", default=IMPORT_TARGET, help="Module to import")
+    imports_parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to try; the fastest counts")
+    imports_parser.add_argument("--top", type=int, default=10, help="Direct imports to list")
+
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    commands = {"run": run, "compare": compare, "imports": imports}
+    return commands[args.command](args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+EchoVerse Chunk Planner
+Sizes rewrite chunks from token estimates so each Gemini answer fits its output budget
+"""
+
+import re
+import threading
+from config import GEMINI_MAX_OUTPUT_TOKENS, CHUNK_BUDGET_SAFETY
+import metrics
+
+# Expected length of the enhanced text relative to its input, before anything is observed
+INTENSITY_EXPANSION = {"Low": 1.15, "Medium": 1.3, "High": 1.5}
+TONE_EXPANSION = {"Neutral": 0.95, "Educational": 1.05, "Suspenseful": 1.1, "Storytelling": 1.15, "Inspiring": 1.05}
+
+PARAGRAPH_BREAK = re.compile(r"(\n\s*\n)")
+# Latin terminators need following whitespace; Chinese/Japanese ones end a sentence without any
+SENTENCE_END = re.compile(r"[.!?…]+[\"'”’)\]]*\s+|[。！？]+[」』”’）]*\s*")
+WORD = re.compile(r"\S+\s*")
+
+_observed = {}
+_observed_lock = threading.Lock()
+
+
+def estimate_tokens(text):
+    """Rough Gemini token count: ~4 characters per token for Latin script, ~1.5 for other scripts"""
+    non_ascii = sum(1 for char in text if ord(char) > 127)
+    return int((len(text) - non_ascii) / 4 + non_ascii / 1.5) + 1
+
+def expected_expansion(tone, intensity):
+    """Output/input length ratio for a tone and intensity: observed if known, else the defaults above"""
+    with _observed_lock:
+        observed = _observed.get((tone, intensity))
+    if observed is not None:
+        return observed
+    return INTENSITY_EXPANSION.get(intensity, 1.3) * TONE_EXPANSION.get(tone, 1.0)
+
+def expected_output_tokens(text, tone, intensity):
+    return int(estimate_tokens(text) * expected_expansion(tone, intensity))
+
+def observe_expansion(tone, intensity, input_text, output_text):
+    """Learn the real expansion from a completed rewrite"""
+    if not input_text.strip() or not output_text.strip():
+        return
+    ratio = min(max(len(output_text) / len(input_text), 0.5), 4.0)
+    with _observed_lock:
+        previous = _observed.get((tone, intensity))
+        _observed[(tone, intensity)] = ratio if previous is None else 0.8 * previous + 0.2 * ratio
+
+def max_chunk_chars(text, tone, intensity, output_budget=GEMINI_MAX_OUTPUT_TOKENS):
+    """Largest input, in characters of this text's script, whose expected answer fits the output budget"""
+    input_tokens = output_budget * CHUNK_BUDGET_SAFETY / expected_expansion(tone, intensity)
+    chars_per_token = len(text) / estimate_tokens(text) if text else 4
+    return max(int(input_tokens * chars_per_token), 200)
+
+def plan_chunks(text, tone, intensity, output_budget=GEMINI_MAX_OUTPUT_TOKENS):
+    """Split text into as few chunks as fit the output budget, at paragraph, then sentence, then word breaks,
+    and at the limit itself for text without spaces (Chinese, Japanese).
+
+    Each chunk keeps its trailing separator, so join_chunks() can restore paragraph breaks.
+    """
+    limit = max_chunk_chars(text, tone, intensity, output_budget)
+    if len(text) <= limit:
+        metrics.counter("echoverse_rewrite_chunks_total", "Planned rewrite chunks").inc()
+        return [text]
+
+    chunks = []
+    current = ""
+    for unit in _units(text, limit):
+        if current and len(current) + len(unit.rstrip()) > limit:
+            chunks.append(current)
+            current = ""
+        current += unit
+    if current:
+        chunks.append(current)
+
+    metrics.counter("echoverse_rewrite_chunks_total", "Planned rewrite chunks").inc(len(chunks))
+    return chunks
+
+def join_chunks(chunks, rewritten):
+    """Join rewritten chunks, keeping the break each original chunk ended on: paragraph, space or none (CJK)"""
+    parts = []
+    for index, (chunk, text) in enumerate(zip(chunks, rewritten)):
+        parts.append(text.strip())
+        if index < len(chunks) - 1:
+            trailing = chunk[len(chunk.rstrip()):]
+            parts.append("\n\n" if "\n" in trailing else " " if trailing else "")
+    return "".join(parts)
+
+def _split_after(text, pattern):
+    """Pieces of text ending after each match of pattern, each keeping its separator"""
+    pieces = []
+    start = 0
+    for match in pattern.finditer(text):
+        if match.end() > start:
+            pieces.append(text[start:match.end()])
+            start = match.end()
+    if start < len(text):
+        pieces.append(text[start:])
+    return pieces
+
+def _units(text, limit):
+    """Paragraphs with their trailing break; paragraphs over the limit become sentences, then words, then
+    limit-sized slices for runs without spaces"""
+    pieces = PARAGRAPH_BREAK.split(text)
+    for paragraph, separator in zip(pieces[0::2], pieces[1::2] + [""]):
+        if len(paragraph) <= limit:
+            yield paragraph + separator
+            continue
+        sentences = _split_after(paragraph, SENTENCE_END)
+        sentences[-1] += separator
+        for sentence in sentences:
+            if len(sentence.rstrip()) <= limit:
+                yield sentence
+                continue
+            for word in _split_after(sentence, WORD):
+                while len(word.rstrip()) > limit:
+                    yield word[:limit]
+                    word = word[limit:]
+                yield word
@@ -0,0 +1,157 @@
+"""
+EchoVerse Circuit Breakers
+Per-provider breakers so a degraded provider is skipped instead of waited on
+"""
+
+import time
+import threading
+from collections import deque
+from config import CIRCUIT_BREAKER_ENABLED, CIRCUIT_WINDOW, CIRCUIT_MIN_CALLS, CIRCUIT_ERROR_RATE
+from config import CIRCUIT_SLOW_CALL, CIRCUIT_OPEN_SECONDS
+import metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over the last CIRCUIT_WINDOW calls to one provider.
+
+    A call is bad when it failed or took longer than slow_call seconds. Once at
+    least min_calls are recorded and the bad share reaches error_rate, the
+    circuit opens and allow() returns False for open_seconds. After that a single
+    probe call is let through (half-open): success closes the circuit, failure
+    opens it again. A probe that is never recorded expires after open_seconds,
+    so a lost probe cannot hold the circuit half-open.
+    """
+
+    def __init__(self, provider, window=CIRCUIT_WINDOW, min_calls=CIRCUIT_MIN_CALLS, error_rate=CIRCUIT_ERROR_RATE,
+                 slow_call=CIRCUIT_SLOW_CALL, open_seconds=CIRCUIT_OPEN_SECONDS, enabled=CIRCUIT_BREAKER_ENABLED):
+        self.provider = provider
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call = slow_call
+        self.open_seconds = open_seconds
+        self.enabled = enabled
+        self.state = CLOSED
+        self.opened_at = None
+        self._calls = deque(maxlen=window)
+        self._probe_started = None
+        self._lock = threading.Lock()
+        self._set_state(CLOSED)
+
+    def allow(self):
+        """Whether a call may go to the provider now; every allowed call must be followed by record()"""
+        if not self.enabled:
+            return True
+
+        with self._lock:
+            if not self._rejects(time.time()):
+                if self.state == HALF_OPEN:
+                    self._probe_started = time.time()
+                return True
+
+        self._count_rejected()
+        return False
+
+    def rejecting(self):
+        """Whether calls are being turned away right now, without taking the half-open probe"""
+        if not self.enabled:
+            return False
+
+        with self._lock:
+            rejects = self._rejects(time.time())
+        if rejects:
+            self._count_rejected()
+        return rejects
+
+    def record(self, ok, seconds):
+        """Report the outcome of an allowed call"""
+        if not self.enabled:
+            return
+
+        bad = not ok or seconds > self.slow_call
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probe_started = None
+                self._calls.clear()
+                if bad:
+                    self._open()
+                else:
+                    self._set_state(CLOSED)
+                return
+
+            if self.state != CLOSED:
+                return
+            self._calls.append(bad)
+            if len(self._calls) >= self.min_calls and sum(self._calls) / len(self._calls) >= self.error_rate:
+                self._open()
+
+    def retry_in(self):
+        """Seconds until the next probe is allowed, or 0"""
+        with self._lock:
+            if self.state != OPEN:
+                return 0
+            return max(self.opened_at + self.open_seconds - time.time(), 0)
+
+    def stats(self):
+        with self._lock:
+            calls = list(self._calls)
+        return {
+            "state": self.state,
+            "calls": len(calls),
+            "bad": sum(calls),
+            "retry_in": self.retry_in()
+        }
+
+    def _rejects(self, now):
+        if self.state == OPEN and now - self.opened_at >= self.open_seconds:
+            self._set_state(HALF_OPEN)
+            self._probe_started = None
+        if self.state == OPEN:
+            return True
+        if self.state == HALF_OPEN:
+            # One probe at a time, unless the last one was never recorded
+            return self._probe_started is not None and now - self._probe_started < self.open_seconds
+        return False
+
+    def _count_rejected(self):
+        metrics.counter("echoverse_circuit_rejected_total", "Calls skipped because the circuit was open",
+                        provider=self.provider).inc()
+
+    def _open(self):
+        self.opened_at = time.time()
+        self._calls.clear()
+        self._set_state(OPEN)
+
+    def _set_state(self, state):
+        if state != self.state:
+            metrics.counter("echoverse_circuit_transitions_total", "Circuit state changes",
+                            provider=self.provider, state=state).inc()
+        self.state = state
+        metrics.gauge("echoverse_circuit_state", "Circuit state (0 closed, 1 half-open, 2 open)",
+                      provider=self.provider).set(STATE_VALUES[state])
+
+
+def get_breaker(provider):
+    """The process-wide breaker for a provider, created on first use"""
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(provider, CircuitBreaker(provider))
+    return breaker
+
+def degraded_providers():
+    """Providers whose circuit is currently not closed, with their breaker"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.provider: breaker for breaker in breakers if breaker.state != CLOSED}
@@ -4,18 +4,29 @@ Contains all API keys, model configurations, and system settings
 """
 
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Local fake providers (python fake_providers.py); when set, every provider below defaults to it
+FAKE_PROVIDERS_URL = os.getenv("ECHOVERSE_FAKE_PROVIDERS", "").rstrip("/")
+
 # API Configuration from environment variables
 HF_API_KEY = os.getenv("HF_API_KEY", "")
-HF_API_BASE = os.getenv("HF_API_BASE", "https://api-inference.huggingface.co/models")
+HF_API_BASE = os.getenv("HF_API_BASE", f"{FAKE_PROVIDERS_URL}/models" if FAKE_PROVIDERS_URL else "https://api-inference.huggingface.co/models")
 
 # Google Gemini Configuration
-GOOGLE_GEMINI_API_KEY = os.getenv("GOOGLE_GEMINI_API_KEY", "")
-GOOGLE_GEMINI_API_BASE = os.getenv("GOOGLE_GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta/models")
+GOOGLE_GEMINI_API_KEY = os.getenv("GOOGLE_GEMINI_API_KEY", "fake-gemini-key" if FAKE_PROVIDERS_URL else "")
+GOOGLE_GEMINI_API_BASE = os.getenv("GOOGLE_GEMINI_API_BASE", f"{FAKE_PROVIDERS_URL}/v1beta/models" if FAKE_PROVIDERS_URL else "https://generativelanguage.googleapis.com/v1beta/models")
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+GEMINI_MAX_OUTPUT_TOKENS = int(os.getenv("ECHOVERSE_GEMINI_MAX_OUTPUT_TOKENS", "1500"))  # per enhancement request
+GEMINI_MAX_CONTINUATIONS = 2  # follow-up requests when an answer stops at MAX_TOKENS
+CHUNK_BUDGET_SAFETY = 0.85  # share of the output budget a chunk's expected answer may use
+
+# Google Translate TTS (gTTS) endpoint; empty means the real translate.google.<tld>
+GTTS_API_BASE = os.getenv("ECHOVERSE_GTTS_BASE", FAKE_PROVIDERS_URL).rstrip("/")
 
 # Model Configurations
 TEXT_TO_TEXT_MODEL = os.getenv("TEXT_TO_TEXT_MODEL", "ibm-granite/granite-3.0-2b-instruct")
@@ -36,6 +47,7 @@ VOICE_OPTIONS = {
     "Emma": "emma",
     "Brian": "brian"
 }
+VOICE_GENDERS = {"Lisa": "female", "Michael": "male", "Allison": "female", "Emma": "female", "Brian": "male"}  # for offline engine voices
 
 # Tone Options
 TONE_OPTIONS = {
@@ -101,6 +113,104 @@ AUDIO_SAMPLE_RATE = 22050
 AUDIO_FORMAT = "mp3"
 MAX_TEXT_LENGTH = 50000  # characters
 
+# Package Settings
+PACKAGE_DIR = os.getenv("ECHOVERSE_PACKAGE_DIR", os.path.join(tempfile.gettempdir(), "echoverse_packages"))
+PACKAGE_COPY_BUFFER_SIZE = 1024 * 1024  # 1MB blocks when streaming audio into a package
+PACKAGE_MAX_AGE = 24 * 60 * 60  # seconds before old packages are cleaned up
+
+# TTS Backend Settings
+TTS_BACKENDS = [name.strip() for name in os.getenv("ECHOVERSE_TTS_BACKENDS", "gtts,espeak,pyttsx3").split(",") if name.strip()]  # preference order
+TTS_LATENCY_BUDGET = float(os.getenv("ECHOVERSE_TTS_LATENCY_BUDGET", "5"))  # seconds per 1,000 characters before a backend is ranked behind faster ones
+TTS_BACKEND_COOLDOWN = int(os.getenv("ECHOVERSE_TTS_BACKEND_COOLDOWN", "60"))  # seconds a failed backend is tried last
+ESPEAK_BINARY = os.getenv("ECHOVERSE_ESPEAK", "espeak-ng")
+ESPEAK_WORKERS = int(os.getenv("ECHOVERSE_ESPEAK_WORKERS", str(os.cpu_count() or 2)))  # espeak-ng processes per synthesis
+ESPEAK_SEGMENT_CHARS = 1000  # long text is split into segments of about this size
+ESPEAK_RATE = 175  # words per minute
+
+# Google TTS Settings
+GTTS_TIMEOUT = float(os.getenv("ECHOVERSE_GTTS_TIMEOUT", "15"))  # seconds per token part; parts run in parallel up to the gtts concurrency
+
+# Offline TTS Settings (pyttsx3)
+OFFLINE_TTS_ENGINES = int(os.getenv("ECHOVERSE_OFFLINE_TTS_ENGINES", "1"))  # warm engines, each on its own thread
+OFFLINE_TTS_MAX_USES = int(os.getenv("ECHOVERSE_OFFLINE_TTS_MAX_USES", "200"))  # recycle an engine after this many jobs
+OFFLINE_TTS_TIMEOUT = float(os.getenv("ECHOVERSE_OFFLINE_TTS_TIMEOUT", "60"))  # seconds before a stuck engine is replaced
+OFFLINE_TTS_RATE = 180  # words per minute
+OFFLINE_TTS_VOLUME = 0.9
+
+# Provider Concurrency Settings
+MAX_PROVIDER_CONCURRENCY = int(os.getenv("ECHOVERSE_MAX_PROVIDER_CONCURRENCY", "8"))  # all providers combined
+PROVIDER_CONCURRENCY = {
+    "gemini": int(os.getenv("ECHOVERSE_GEMINI_CONCURRENCY", "4")),
+    "huggingface": int(os.getenv("ECHOVERSE_HF_CONCURRENCY", "2")),
+    "gtts": int(os.getenv("ECHOVERSE_GTTS_CONCURRENCY", "4"))
+}  # starting limits; with adaptive concurrency each one grows up to MAX_PROVIDER_CONCURRENCY
+ADAPTIVE_CONCURRENCY = os.getenv("ECHOVERSE_ADAPTIVE_CONCURRENCY", "true").lower() == "true"
+ADAPTIVE_BACKOFF = 0.5  # limit multiplier on 429/503/timeout
+ADAPTIVE_DECREASE_INTERVAL = 1.0  # seconds; rejections closer together than this shrink the limit once
+
+# Circuit Breaker Settings
+CIRCUIT_BREAKER_ENABLED = os.getenv("ECHOVERSE_CIRCUIT_BREAKER", "true").lower() == "true"
+CIRCUIT_WINDOW = 20  # recent calls per provider the error rate is measured over
+CIRCUIT_MIN_CALLS = 5  # calls needed before the circuit can open
+CIRCUIT_ERROR_RATE = float(os.getenv("ECHOVERSE_CIRCUIT_ERROR_RATE", "0.5"))  # share of failed or slow calls that opens the circuit
+CIRCUIT_SLOW_CALL = float(os.getenv("ECHOVERSE_CIRCUIT_SLOW_CALL", "8"))  # seconds; slower calls count as failures
+CIRCUIT_OPEN_SECONDS = float(os.getenv("ECHOVERSE_CIRCUIT_OPEN_SECONDS", "30"))  # seconds before a probe call is let through
+
+# Hedging Settings (opt-in, e.g. ECHOVERSE_HEDGE=gemini,huggingface)
+HEDGED_PROVIDERS = [name.strip() for name in os.getenv("ECHOVERSE_HEDGE", "").split(",") if name.strip()]
+HEDGE_PERCENTILE = float(os.getenv("ECHOVERSE_HEDGE_PERCENTILE", "0.9"))  # send a duplicate once a call is slower than this share of recent calls
+HEDGE_BUDGET = float(os.getenv("ECHOVERSE_HEDGE_BUDGET", "0.1"))  # at most this fraction of calls are duplicated
+HEDGE_MIN_SAMPLES = 20  # latencies needed before hedging starts
+HEDGE_MIN_DELAY = 0.05  # seconds
+HEDGE_WORKERS = 32
+
+# Prompt Packing Settings
+PROMPT_PACKING = os.getenv("ECHOVERSE_PROMPT_PACKING", "true").lower() == "true"  # pack small Gemini rewrites of one batch job into one request
+PACK_JOB_MAX_CHARS = 1200  # only texts up to this size are packed
+PACK_MAX_JOBS = 8  # jobs per packed request
+PACK_MAX_CHARS = 6000  # input characters per packed request
+PACK_WINDOW = float(os.getenv("ECHOVERSE_PACK_WINDOW", "0.2"))  # seconds the first small job waits for others in its job
+
+# Single-Flight Settings
+SINGLE_FLIGHT_ENABLED = os.getenv("ECHOVERSE_SINGLE_FLIGHT", "true").lower() == "true"  # share identical in-flight provider calls
+
+# Batch Settings
+BATCH_MAX_WORKERS = int(os.getenv("ECHOVERSE_BATCH_WORKERS", "4"))
+BATCH_JOBS_DIR = os.getenv("ECHOVERSE_BATCH_JOBS_DIR", "batch_jobs")
+
+# Tracing Settings
+TRACING_ENABLED = os.getenv("ECHOVERSE_TRACING", "true").lower() == "true"
+TRACE_FILE = os.getenv("ECHOVERSE_TRACE_FILE", "")  # JSONL export of every span; off unless set
+TRACE_FILE_MAX_BYTES = int(os.getenv("ECHOVERSE_TRACE_FILE_MAX_MB", "50")) * 1024 * 1024  # then moved to <file>.1
+TRACE_BUFFER_TRACES = 256  # recent traces kept in memory for the Results page
+
+# Download Server Settings
+DOWNLOAD_SERVER_ENABLED = os.getenv("ECHOVERSE_DOWNLOAD_SERVER", "true").lower() == "true"
+DOWNLOAD_SERVER_HOST = os.getenv("ECHOVERSE_DOWNLOAD_HOST", "127.0.0.1")
+DOWNLOAD_SERVER_PORT = int(os.getenv("ECHOVERSE_DOWNLOAD_PORT", "8502"))
+DOWNLOAD_BASE_URL = os.getenv("ECHOVERSE_DOWNLOAD_BASE_URL", "")  # public URL of the download server; links are only used when set
+DOWNLOAD_TTL = 6 * 60 * 60  # seconds an unused download link stays valid
+DOWNLOAD_MAX_BYTES = int(os.getenv("ECHOVERSE_DOWNLOAD_MAX_MB", "256")) * 1024 * 1024  # in-memory artifacts kept for links
+
+# Static Asset Settings
+ASSETS_DIR = os.getenv("ECHOVERSE_ASSETS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "static"))
+STATIC_ASSETS_SERVED = os.getenv("ECHOVERSE_SERVE_STATIC", "true").lower() == "true"  # cacheable <link>s via the download server when ECHOVERSE_DOWNLOAD_BASE_URL is set
+LOTTIE_TIMEOUT = float(os.getenv("ECHOVERSE_LOTTIE_TIMEOUT", "3"))  # seconds for a remote Lottie file
+LOTTIE_RETRY_AFTER = 5 * 60  # seconds before a failed remote Lottie file is fetched again
+
+# Metrics Settings
+METRICS_FILE = os.getenv("ECHOVERSE_METRICS_FILE", "metrics.prom")
+METRICS_ENDPOINT_ENABLED = os.getenv("ECHOVERSE_METRICS_ENDPOINT", "true").lower() == "true"  # /metrics on the download server
+ADMIN_USERS = [name.strip() for name in os.getenv("ECHOVERSE_ADMIN_USERS", "").split(",") if name.strip()]
+
+# Profiling Settings
+PROFILING_ENABLED = os.getenv("ECHOVERSE_PROFILE", "false").lower() == "true"  # admins can also toggle it per session
+PROFILE_TOP_N = int(os.getenv("ECHOVERSE_PROFILE_TOP_N", "25"))
+PROFILE_HISTORY = 20  # reruns kept per page
+PROFILE_SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+PROFILE_LOG_FILE = os.getenv("ECHOVERSE_PROFILE_LOG", "profiles.jsonl")
+RELEASE = os.getenv("ECHOVERSE_RELEASE", "dev")  # tags profile summaries so releases can be compared
+
 # Session State Keys
 SESSION_KEYS = {
     "authenticated": "authenticated",
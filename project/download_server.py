@@ -0,0 +1,292 @@
+"""
+EchoVerse Download Server
+Serves generated artifacts by id on demand so pages only send links on rerun
+"""
+
+import os
+import re
+import time
+import hashlib
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote
+from config import DOWNLOAD_SERVER_ENABLED, DOWNLOAD_SERVER_HOST, DOWNLOAD_SERVER_PORT, DOWNLOAD_BASE_URL, DOWNLOAD_TTL
+from config import DOWNLOAD_MAX_BYTES
+from config import METRICS_ENDPOINT_ENABLED
+from assets import read_asset, asset_mime
+import metrics
+
+_artifacts = {}
+_artifact_keys = {}
+_artifact_bytes = 0
+_lock = threading.Lock()
+_server = None
+_server_failed = False
+
+RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)$")
+COPY_BLOCK_SIZE = 256 * 1024
+
+def _drop(artifact_id):
+    global _artifact_bytes
+
+    info = _artifacts.pop(artifact_id)
+    _artifact_keys.pop(info["key"], None)
+    _artifact_bytes -= len(info.get("data", b""))
+
+def _expire_artifacts(incoming=0):
+    """Drop artifacts unused within the TTL, then the least recently used in-memory ones over the byte cap"""
+    cutoff = time.time() - DOWNLOAD_TTL
+    for artifact_id in [a for a, info in _artifacts.items() if info["touched"] < cutoff]:
+        _drop(artifact_id)
+
+    in_memory = sorted((info["touched"], a) for a, info in _artifacts.items() if "data" in info)
+    for _, artifact_id in in_memory:
+        if _artifact_bytes + incoming <= DOWNLOAD_MAX_BYTES:
+            break
+        _drop(artifact_id)
+
+def _register(key, artifact):
+    """Register an artifact under a stable key and return its public id"""
+    global _artifact_bytes
+
+    with _lock:
+        artifact_id = _artifact_keys.get(key)
+        metrics.cache_lookup("download_links", artifact_id is not None)
+        if artifact_id is not None:
+            _drop(artifact_id)
+        else:
+            artifact_id = secrets.token_urlsafe(16)
+
+        size = len(artifact.get("data", b""))
+        _expire_artifacts(size)
+
+        artifact["key"] = key
+        artifact["touched"] = time.time()
+        _artifacts[artifact_id] = artifact
+        _artifact_keys[key] = artifact_id
+        _artifact_bytes += size
+        return artifact_id
+
+def register_file(path, filename, mime="application/octet-stream"):
+    """Register a file on disk for download and return its artifact id"""
+    stat = os.stat(path)
+    key = ("file", os.path.abspath(path), stat.st_size, stat.st_mtime, filename)
+    return _register(key, {"path": path, "filename": filename, "mime": mime})
+
+def register_bytes(data, filename, mime="application/octet-stream"):
+    """Register in-memory data (text or bytes) for download and return its artifact id, or None if it is over the cap"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if len(data) > DOWNLOAD_MAX_BYTES:
+        return None
+    key = ("bytes", hashlib.sha1(data).hexdigest(), filename)
+    return _register(key, {"data": data, "filename": filename, "mime": mime})
+
+def get_artifact(artifact_id):
+    """Look up a registered artifact"""
+    with _lock:
+        artifact = _artifacts.get(artifact_id)
+        if artifact is not None:
+            artifact["touched"] = time.time()
+        return artifact
+
+def ensure_download_server():
+    """Start the download server once per process; returns False if it cannot run"""
+    global _server, _server_failed
+
+    if _server is not None:
+        return True
+    if _server_failed or not DOWNLOAD_SERVER_ENABLED:
+        return False
+
+    with _lock:
+        if _server is None and not _server_failed:
+            try:
+                server = ThreadingHTTPServer((DOWNLOAD_SERVER_HOST, DOWNLOAD_SERVER_PORT), DownloadRequestHandler)
+            except OSError:
+                _server_failed = True
+                return False
+
+            server.daemon_threads = True
+            thread = threading.Thread(target=server.serve_forever, name="echoverse-downloads", daemon=True)
+            thread.start()
+            _server = server
+
+    return _server is not None
+
+def links_enabled():
+    """Whether pages should link to the download server: only with a public base URL, and once it is running"""
+    return bool(DOWNLOAD_BASE_URL) and ensure_download_server()
+
+def download_url(artifact_id, inline=False):
+    """Build the public URL for an artifact"""
+    url = f"{DOWNLOAD_BASE_URL.rstrip('/')}/download/{artifact_id}"
+    return url + "?inline=1" if inline else url
+
+def file_download_url(path, filename, mime="application/octet-stream", inline=False):
+    """Register a file and return its download URL, or None if links are unavailable"""
+    if not links_enabled():
+        return None
+    return download_url(register_file(path, filename, mime), inline)
+
+def bytes_download_url(data, filename, mime="application/octet-stream", inline=False):
+    """Register in-memory data and return its download URL, or None if links are unavailable"""
+    if not links_enabled():
+        return None
+    artifact_id = register_bytes(data, filename, mime)
+    return download_url(artifact_id, inline) if artifact_id else None
+
+def audio_download_url(audio_info, basename="echoverse_audio", inline=False):
+    """Return a download URL for a generated audio dict, or None if links are unavailable"""
+    if not audio_info:
+        return None
+
+    audio_format = audio_info.get("format", "wav")
+    filename = f"{basename}.{audio_format}"
+    mime = f"audio/{audio_format}"
+    audio_file = audio_info.get("audio_file")
+
+    if audio_file and os.path.exists(audio_file):
+        return file_download_url(audio_file, filename, mime, inline)
+    if audio_info.get("audio_data"):
+        return bytes_download_url(audio_info["audio_data"], filename, mime, inline)
+    return None
+
+
+class DownloadRequestHandler(BaseHTTPRequestHandler):
+    """Serves /download/<id> with single-range support, plus /static/<asset> and /metrics"""
+
+    server_version = "EchoVerseDownloads/1.0"
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def log_message(self, format, *args):
+        # Keep the Streamlit console quiet
+        pass
+
+    def _serve(self, send_body):
+        path, _, query = self.path.partition("?")
+        if path == "/metrics" and METRICS_ENDPOINT_ENABLED:
+            self._serve_metrics(send_body)
+            return
+        if path.startswith("/static/"):
+            self._serve_static(path[len("/static/"):], query, send_body)
+            return
+
+        match = re.match(r"^/download/([A-Za-z0-9_-]+)$", path)
+        artifact = get_artifact(match.group(1)) if match else None
+
+        if artifact is None:
+            self.send_error(404, "Artifact not found or expired")
+            return
+
+        if "path" in artifact:
+            try:
+                total = os.path.getsize(artifact["path"])
+            except OSError:
+                self.send_error(404, "Artifact file is missing")
+                return
+        else:
+            total = len(artifact["data"])
+
+        start, end = 0, total - 1
+        status = 200
+        range_header = self.headers.get("Range")
+
+        if range_header:
+            range_match = RANGE_PATTERN.match(range_header.strip())
+            if not range_match or (not range_match.group(1) and not range_match.group(2)):
+                self._send_unsatisfiable(total)
+                return
+
+            first, last = range_match.groups()
+            if first:
+                start = int(first)
+                end = min(int(last), total - 1) if last else total - 1
+            else:
+                # Suffix range: the last N bytes
+                start = max(total - int(last), 0)
+
+            if start > end or start >= total:
+                self._send_unsatisfiable(total)
+                return
+            status = 206
+
+        length = end - start + 1 if total else 0
+        disposition = "inline" if "inline=1" in query else "attachment"
+
+        self.send_response(status)
+        self.send_header("Content-Type", artifact["mime"])
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Disposition", f"{disposition}; filename*=UTF-8''{quote(artifact['filename'])}")
+        self.send_header("Cache-Control", "private, max-age=3600")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{total}")
+        self.end_headers()
+
+        if not send_body or length == 0:
+            return
+
+        try:
+            if "path" in artifact:
+                with open(artifact["path"], "rb") as f:
+                    f.seek(start)
+                    remaining = length
+                    while remaining > 0:
+                        block = f.read(min(COPY_BLOCK_SIZE, remaining))
+                        if not block:
+                            break
+                        self.wfile.write(block)
+                        remaining -= len(block)
+            else:
+                self.wfile.write(memoryview(artifact["data"])[start:end + 1])
+        except (BrokenPipeError, ConnectionResetError):
+            # Browsers routinely abort range requests for media
+            pass
+
+    def _serve_metrics(self, send_body):
+        body = metrics.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _serve_static(self, name, query, send_body):
+        try:
+            data, version = read_asset(name)
+        except (OSError, ValueError):
+            self.send_error(404, "Asset not found")
+            return
+
+        etag = f'"{version}"'
+        # Versioned URLs never change content, so browsers may keep them for a year
+        cache_control = "public, max-age=31536000, immutable" if f"v={version}" in query else "no-cache"
+        not_modified = self.headers.get("If-None-Match") == etag
+
+        self.send_response(304 if not_modified else 200)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", cache_control)
+        if not_modified:
+            self.end_headers()
+            return
+
+        self.send_header("Content-Type", asset_mime(name))
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(data)
+
+    def _send_unsatisfiable(self, total):
+        self.send_response(416)
+        self.send_header("Content-Range", f"bytes */{total}")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
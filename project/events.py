@@ -0,0 +1,147 @@
+"""
+EchoVerse Pipeline Events
+Structured progress events so model code does not depend on Streamlit
+"""
+
+import time
+import logging
+
+LEVELS = ("debug", "info", "success", "warning", "error")
+
+class PipelineEvent:
+    """One structured progress event emitted by the generation pipeline"""
+
+    __slots__ = ("level", "message", "stage", "chunk_index", "total_chunks",
+                 "latency", "bytes", "provider", "timestamp")
+
+    def __init__(self, level, message, stage=None, chunk_index=None, total_chunks=None,
+                 latency=None, bytes=None, provider=None):
+        self.level = level
+        self.message = message
+        self.stage = stage
+        self.chunk_index = chunk_index
+        self.total_chunks = total_chunks
+        self.latency = latency
+        self.bytes = bytes
+        self.provider = provider
+        self.timestamp = time.time()
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if getattr(self, name) is not None}
+
+    def __repr__(self):
+        return f"PipelineEvent({self.to_dict()!r})"
+
+
+class EventSink:
+    """Base sink; subclasses override handle()"""
+
+    def emit(self, level, message, **fields):
+        """Build and dispatch an event"""
+        self.handle(PipelineEvent(level, message, **fields))
+
+    def handle(self, event):
+        raise NotImplementedError
+
+    # Shorthands matching the old st.* calls
+    def info(self, message, **fields):
+        self.emit("info", message, **fields)
+
+    def success(self, message, **fields):
+        self.emit("success", message, **fields)
+
+    def warning(self, message, **fields):
+        self.emit("warning", message, **fields)
+
+    def error(self, message, **fields):
+        self.emit("error", message, **fields)
+
+    def debug(self, message, **fields):
+        self.emit("debug", message, **fields)
+
+
+class NullSink(EventSink):
+    """Discards every event; the cheapest option for headless and parallel runners"""
+
+    def emit(self, level, message, **fields):
+        pass
+
+    def handle(self, event):
+        pass
+
+
+class LoggingSink(EventSink):
+    """Writes events to the standard logging module"""
+
+    LOG_LEVELS = {
+        "debug": logging.DEBUG,
+        "info": logging.INFO,
+        "success": logging.INFO,
+        "warning": logging.WARNING,
+        "error": logging.ERROR
+    }
+
+    def __init__(self, logger_name="echoverse"):
+        self.logger = logging.getLogger(logger_name)
+
+    def handle(self, event):
+        details = {k: v for k, v in event.to_dict().items() if k not in ("level", "message", "timestamp")}
+        suffix = f" {details}" if details else ""
+        self.logger.log(self.LOG_LEVELS.get(event.level, logging.INFO), f"{event.message}{suffix}")
+
+
+class CallbackSink(EventSink):
+    """Forwards every event to a callable, e.g. to update a progress bar"""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def handle(self, event):
+        self.callback(event)
+
+
+class MultiSink(EventSink):
+    """Fans events out to several sinks"""
+
+    def __init__(self, *sinks):
+        self.sinks = list(sinks)
+
+    def subscribe(self, sink):
+        self.sinks.append(sink)
+        return sink
+
+    def unsubscribe(self, sink):
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+
+    def handle(self, event):
+        for sink in self.sinks:
+            sink.handle(event)
+
+
+class StreamlitSink(EventSink):
+    """Renders events as st.info/st.success/... on the script thread.
+
+    Events raised from worker threads have no Streamlit context to draw into, so
+    they are dropped here instead of triggering a UI round trip.
+    """
+
+    def __init__(self, min_level="info"):
+        self.min_level = LEVELS.index(min_level)
+
+    def handle(self, event):
+        if LEVELS.index(event.level) < self.min_level:
+            return
+
+        import streamlit as st
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        if get_script_run_ctx(suppress_warning=True) is None:
+            return
+
+        render = {
+            "success": st.success,
+            "warning": st.warning,
+            "error": st.error
+        }.get(event.level, st.info)
+        render(event.message)
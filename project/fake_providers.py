@@ -0,0 +1,409 @@
+"""
+EchoVerse Fake Providers
+Local stand-in for Gemini, Hugging Face inference and Google Translate TTS,
+with configurable latency, failures and throughput caps for offline testing
+
+Usage:
+    python fake_providers.py --port 8600 --latency 0.3 --error-rate 0.02
+    python fake_providers.py --set gemini.max_rps=5 --set gtts.latency=0.8
+
+Then point the app at it:
+    ECHOVERSE_FAKE_PROVIDERS=http://127.0.0.1:8600 streamlit run app.py
+"""
+
+import re
+import sys
+import json
+import time
+import base64
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PROVIDERS = ("gemini", "huggingface", "gtts")
+
+# One silent MPEG-1 Layer III frame: 32 kbps, 44.1 kHz, mono, 104 bytes, ~26 ms of audio
+MP3_SILENT_FRAME = bytes([0xFF, 0xFB, 0x10, 0xC0]) + bytes(100)
+MP3_FRAME_SECONDS = 1152 / 44100
+WORDS_PER_SECOND = 150 / 60
+PACKED_SECTION = re.compile(r"<<<TEXT (\d+)>>>\n(.*?)\n<<<END \1>>>", re.DOTALL)  # prompt_packing sections
+
+class ProviderBehavior:
+    """How one fake provider responds"""
+
+    FIELDS = {
+        "latency": float,               # base seconds per request
+        "jitter": float,                # extra uniform random seconds
+        "latency_per_1k_chars": float,  # extra seconds per 1000 input characters
+        "error_rate": float,            # fraction of requests answered with 500
+        "rate_limit_rate": float,       # fraction answered with 429
+        "unavailable_rate": float,      # fraction answered with 503
+        "max_rps": float,               # token-bucket cap; excess requests get 429 (0 = unlimited)
+        "max_concurrency": int,         # in-flight cap; excess requests get 503 (0 = unlimited)
+        "retry_after": int              # Retry-After seconds sent with 429/503
+    }
+
+    def __init__(self, latency=0.2, jitter=0.05, latency_per_1k_chars=0.0, error_rate=0.0, rate_limit_rate=0.0,
+                 unavailable_rate=0.0, max_rps=0.0, max_concurrency=0, retry_after=1):
+        self.latency = latency
+        self.jitter = jitter
+        self.latency_per_1k_chars = latency_per_1k_chars
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.unavailable_rate = unavailable_rate
+        self.max_rps = max_rps
+        self.max_concurrency = max_concurrency
+        self.retry_after = retry_after
+
+    def copy(self, **overrides):
+        values = {name: getattr(self, name) for name in self.FIELDS}
+        values.update(overrides)
+        return ProviderBehavior(**values)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class ProviderState:
+    """Token bucket, in-flight count and response counters for one provider"""
+
+    def __init__(self, behavior):
+        self.behavior = behavior
+        self.lock = threading.Lock()
+        self.tokens = behavior.max_rps
+        self.refilled_at = time.monotonic()
+        self.in_flight = 0
+        self.responses = {}
+
+    def admit(self):
+        """Return None to serve the request, or the (status, reason) to reject it with"""
+        behavior = self.behavior
+        with self.lock:
+            if behavior.max_rps:
+                now = time.monotonic()
+                self.tokens = min(behavior.max_rps, self.tokens + (now - self.refilled_at) * behavior.max_rps)
+                self.refilled_at = now
+                if self.tokens < 1:
+                    return 429, "throughput cap exceeded"
+                self.tokens -= 1
+
+            if behavior.max_concurrency and self.in_flight >= behavior.max_concurrency:
+                return 503, "too many concurrent requests"
+
+            self.in_flight += 1
+
+        roll = random.random()
+        if roll < behavior.rate_limit_rate:
+            return self._release(429, "injected rate limit")
+        roll -= behavior.rate_limit_rate
+        if roll < behavior.unavailable_rate:
+            return self._release(503, "injected unavailability")
+        roll -= behavior.unavailable_rate
+        if roll < behavior.error_rate:
+            return self._release(500, "injected server error")
+        return None
+
+    def _release(self, status, reason):
+        self.release()
+        return status, reason
+
+    def release(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def record(self, status):
+        with self.lock:
+            self.responses[status] = self.responses.get(status, 0) + 1
+
+    def delay(self, input_chars):
+        behavior = self.behavior
+        time.sleep(behavior.latency + random.uniform(0, behavior.jitter) + behavior.latency_per_1k_chars * input_chars / 1000)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "in_flight": self.in_flight,
+                "responses": {str(status): count for status, count in sorted(self.responses.items())},
+                "behavior": self.behavior.to_dict()
+            }
+
+
+def fake_rewrite(text, max_chars=None):
+    """Deterministic stand-in for model output: the input with a short lead-in"""
+    output = f"[fake] {text.strip()}"
+    return output[:max_chars] if max_chars else output
+
+def fake_mp3(text):
+    """Silent MP3 whose length follows the text like real speech (~150 words per minute)"""
+    seconds = max(len(text.split()), 1) / WORDS_PER_SECOND
+    return MP3_SILENT_FRAME * max(1, int(seconds / MP3_FRAME_SECONDS))
+
+def _gemini_prompt(body):
+    parts = [part.get("text", "") for content in body.get("contents", []) for part in content.get("parts", [])]
+    return "\n".join(parts)
+
+def _gemini_response(text, prompt, finish_reason="STOP"):
+    return {
+        "candidates": [{
+            "content": {"parts": [{"text": text}], "role": "model"},
+            "finishReason": finish_reason,
+            "index": 0
+        }],
+        "usageMetadata": {
+            "promptTokenCount": len(prompt) // 4,
+            "candidatesTokenCount": len(text) // 4,
+            "totalTokenCount": (len(prompt) + len(text)) // 4
+        }
+    }
+
+
+class FakeProviderHandler(BaseHTTPRequestHandler):
+    """Routes requests to the fake Gemini, Hugging Face and gTTS implementations"""
+
+    server_version = "EchoVerseFakeProviders/1.0"
+    protocol_version = "HTTP/1.1"
+
+    GEMINI_ROUTE = re.compile(r"^/v1beta/models/([^/:]+):(generateContent|streamGenerateContent)$")
+    HF_ROUTE = re.compile(r"^/models/(.+)$")
+    GTTS_ROUTE = "/_/TranslateWebserverUi/data/batchexecute"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif path == "/stats":
+            self._send_json(200, {name: state.stats() for name, state in self.server.states.items()})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        parsed = urlparse(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        raw_body = self.rfile.read(length) if length else b""
+
+        gemini_match = self.GEMINI_ROUTE.match(parsed.path)
+        hf_match = self.HF_ROUTE.match(parsed.path)
+
+        if gemini_match:
+            self._handle("gemini", lambda state: self._gemini(state, gemini_match.group(2), parsed.query, raw_body))
+        elif parsed.path == self.GTTS_ROUTE:
+            self._handle("gtts", lambda state: self._gtts(state, raw_body))
+        elif hf_match:
+            self._handle("huggingface", lambda state: self._huggingface(state, hf_match.group(1), raw_body))
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def _handle(self, provider, serve):
+        state = self.server.states[provider]
+        rejection = state.admit()
+        if rejection:
+            status, reason = rejection
+            state.delay(0)
+            self._send_error(provider, status, reason)
+            state.record(status)
+            return
+
+        try:
+            status = serve(state)
+        except (ValueError, KeyError, IndexError) as e:
+            status = 400
+            self._send_error(provider, 400, f"malformed request: {e}")
+        finally:
+            state.release()
+        state.record(status)
+
+    # Providers
+
+    def _gemini(self, state, method, query, raw_body):
+        body = json.loads(raw_body or b"{}")
+        if not parse_qs(query).get("key") and not self.headers.get("x-goog-api-key"):
+            self._send_error("gemini", 403, "API key not valid")
+            return 403
+
+        prompt = _gemini_prompt(body)
+        generation_config = body.get("generationConfig", {})
+        max_tokens = generation_config.get("maxOutputTokens")
+        finish_reason = "STOP"
+        if generation_config.get("responseSchema", {}).get("type") == "ARRAY":
+            # Packed prompt: answer each <<<TEXT n>>> section as one JSON string
+            sections = PACKED_SECTION.findall(prompt)
+            text = json.dumps([fake_rewrite(section) for _, section in sections])
+        else:
+            # The first user turn holds the text; model turns are an earlier, truncated answer being continued
+            contents = body.get("contents") or [{}]
+            first = "\n".join(part.get("text", "") for part in contents[0].get("parts", []))
+            full = fake_rewrite(first.rsplit("\n\n", 2)[-2] if first.count("\n\n") >= 2 else first)
+            answered = "".join(part.get("text", "") for content in contents if content.get("role") == "model"
+                               for part in content.get("parts", []))
+            text = full[len(answered):]
+            if max_tokens and len(text) > max_tokens * 4:
+                text, finish_reason = text[:max_tokens * 4], "MAX_TOKENS"
+        state.delay(len(prompt))
+
+        if method == "generateContent":
+            self._send_json(200, _gemini_response(text, prompt, finish_reason))
+            return 200
+
+        # streamGenerateContent: SSE with ?alt=sse, otherwise a streamed JSON array
+        sse = "alt=sse" in query
+        words = text.split(" ")
+        pieces = [" ".join(words[i:i + 20]) + (" " if i + 20 < len(words) else "") for i in range(0, len(words), 20)]
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream" if sse else "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index, piece in enumerate(pieces):
+            chunk = json.dumps(_gemini_response(piece, prompt if index == 0 else ""))
+            if sse:
+                self._write_chunk(f"data: {chunk}\r\n\r\n")
+            else:
+                self._write_chunk(("[" if index == 0 else ",\r\n") + chunk + ("]" if index == len(pieces) - 1 else ""))
+            time.sleep(state.behavior.latency_per_1k_chars * len(piece) / 1000)
+        self._write_chunk("")
+        return 200
+
+    def _huggingface(self, state, model_name, raw_body):
+        body = json.loads(raw_body or b"{}")
+        inputs = body.get("inputs", "")
+        inputs = inputs if isinstance(inputs, str) else json.dumps(inputs)
+        state.delay(len(inputs))
+
+        if "tts" in model_name.lower() or "speech" in model_name.lower():
+            self._send_bytes(200, fake_mp3(inputs), "audio/mpeg")
+            return 200
+
+        max_new_tokens = body.get("parameters", {}).get("max_new_tokens")
+        generated = fake_rewrite(inputs, max_chars=max_new_tokens * 4 if max_new_tokens else None)
+        self._send_json(200, [{"generated_text": generated}])
+        return 200
+
+    def _gtts(self, state, raw_body):
+        # Same wire format gTTS sends: f.req=[[["jQ1olc", "[text, lang, speed, null]", null, "generic"]]]
+        rpc = json.loads(parse_qs(raw_body.decode("utf-8"))["f.req"][0])
+        text = json.loads(rpc[0][0][1])[0]
+        state.delay(len(text))
+
+        audio = base64.b64encode(fake_mp3(text)).decode("ascii")
+        payload = json.dumps([["wrb.fr", "jQ1olc", json.dumps([audio]), None, None, None, "generic"]], separators=(",", ":"))
+        self._send_bytes(200, f")]}}'\n\n{len(payload)}\n{payload}\n".encode("utf-8"), "application/json; charset=utf-8")
+        return 200
+
+    # Responses
+
+    def _send_error(self, provider, status, reason):
+        headers = {"Retry-After": str(self.server.states[provider].behavior.retry_after)} if status in (429, 503) else {}
+        if provider == "gemini":
+            names = {400: "INVALID_ARGUMENT", 403: "PERMISSION_DENIED", 429: "RESOURCE_EXHAUSTED",
+                     500: "INTERNAL", 503: "UNAVAILABLE"}
+            self._send_json(status, {"error": {"code": status, "message": reason, "status": names.get(status, "UNKNOWN")}}, headers)
+        elif provider == "huggingface":
+            body = {"error": reason}
+            if status == 503:
+                body = {"error": "Model is currently loading", "estimated_time": float(self.server.states[provider].behavior.retry_after)}
+            self._send_json(status, body, headers)
+        else:
+            self._send_bytes(status, reason.encode("utf-8"), "text/plain; charset=utf-8", headers)
+
+    def _send_json(self, status, payload, headers=None):
+        self._send_bytes(status, json.dumps(payload).encode("utf-8"), "application/json; charset=utf-8", headers)
+
+    def _send_bytes(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+class FakeProviderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, behaviors, verbose=False):
+        super().__init__(address, FakeProviderHandler)
+        self.states = {name: ProviderState(behaviors[name]) for name in PROVIDERS}
+        self.verbose = verbose
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_fake_providers(host="127.0.0.1", port=0, behavior=None, overrides=None, verbose=False):
+    """Start the fake providers on a background thread and return the server (port=0 picks a free port).
+
+    overrides maps a provider name to ProviderBehavior field overrides, e.g. {"gtts": {"latency": 0.8}}.
+    """
+    behavior = behavior or ProviderBehavior()
+    behaviors = {name: behavior.copy(**(overrides or {}).get(name, {})) for name in PROVIDERS}
+    server = FakeProviderServer((host, port), behaviors, verbose)
+    threading.Thread(target=server.serve_forever, name="echoverse-fake-providers", daemon=True).start()
+    return server
+
+def provider_env(base_url):
+    """Environment variables that point EchoVerse at a fake provider server"""
+    return {"ECHOVERSE_FAKE_PROVIDERS": base_url}
+
+def _parse_overrides(items):
+    overrides = {}
+    for item in items:
+        key, _, value = item.partition("=")
+        provider, _, field = key.partition(".")
+        if provider not in PROVIDERS or field not in ProviderBehavior.FIELDS or not value:
+            raise argparse.ArgumentTypeError(f"Invalid --set {item!r}; expected <{'|'.join(PROVIDERS)}>.<field>=<value>")
+        overrides.setdefault(provider, {})[field] = ProviderBehavior.FIELDS[field](value)
+    return overrides
+
+def parse_args(argv=None):
+    """Parse command-line arguments"""
+    parser = argparse.ArgumentParser(description="Run local stand-ins for Gemini, Hugging Face and gTTS.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    for field, field_type in ProviderBehavior.FIELDS.items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=field_type, default=getattr(ProviderBehavior(), field))
+    parser.add_argument("--set", action="append", default=[], metavar="PROVIDER.FIELD=VALUE",
+                        help="Override one setting for one provider, e.g. gemini.max_rps=5")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Run the fake providers in the foreground"""
+    args = parse_args(argv)
+    behavior = ProviderBehavior(**{field: getattr(args, field) for field in ProviderBehavior.FIELDS})
+
+    try:
+        overrides = _parse_overrides(args.set)
+    except argparse.ArgumentTypeError as e:
+        print(f"❌ {e}")
+        return 2
+
+    server = start_fake_providers(args.host, args.port, behavior, overrides, args.verbose)
+    print(f"🧪 Fake providers listening on {server.base_url}")
+    for name, value in provider_env(server.base_url).items():
+        print(f"   export {name}={value}")
+    print("🛑 Press Ctrl+C to stop")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("\n🛑 Fake providers stopped")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
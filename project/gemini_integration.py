@@ -3,40 +3,44 @@ EchoVerse Google Gemini Integration
 Handles text generation from topics using Google Gemini API
 """
 
-import streamlit as st
 import requests
 import json
 import time
-from config import GOOGLE_GEMINI_API_KEY, GOOGLE_GEMINI_API_BASE
+from config import GOOGLE_GEMINI_API_KEY, GOOGLE_GEMINI_API_BASE, GEMINI_MODEL
+from rate_limits import provider_slot
+from events import StreamlitSink
+from tracing import span
+import metrics
 
 class GeminiTextGenerator:
-    def __init__(self):
+    def __init__(self, event_sink=None):
         self.api_key = GOOGLE_GEMINI_API_KEY
         self.api_base = GOOGLE_GEMINI_API_BASE
+        self.events = event_sink or StreamlitSink()
         
     def generate_text_from_topic(self, topic, content_type="article", word_count=500):
         """Generate text content from a given topic using Google Gemini"""
         if not self.api_key:
-            st.error("❌ Google Gemini API key not found. Please check your .env file.")
+            self.events.error("❌ Google Gemini API key not found. Please check your .env file.")
             return None
 
         if not topic.strip():
-            st.error("❌ Please enter a topic to generate content.")
+            self.events.error("❌ Please enter a topic to generate content.")
             return None
 
         try:
             # Create simple prompt
             prompt = f"Write a detailed and engaging {content_type} about '{topic}'. Make it approximately {word_count} words long. The content should be well-structured, informative, and suitable for audio narration."
 
-            st.info("🤖 Generating content with Google Gemini...")
+            self.events.info("🤖 Generating content with Google Gemini...", stage="generate", provider="gemini")
 
             # Debug: Show API key status
             if not self.api_key or len(self.api_key) < 10:
-                st.error("❌ Invalid API key. Please check your .env file.")
+                self.events.error("❌ Invalid API key. Please check your .env file.")
                 return None
 
             # Make API call - Updated to correct model name
-            url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={self.api_key}"
+            url = f"{self.api_base}/{GEMINI_MODEL}:generateContent?key={self.api_key}"
 
             payload = {
                 "contents": [{
@@ -54,7 +58,15 @@ class GeminiTextGenerator:
 
             headers = {"Content-Type": "application/json"}
 
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            started = time.time()
+            with span("gemini.generateContent", request_bytes=len(prompt)) as http_span:
+                with provider_slot("gemini") as slot:
+                    response = requests.post(url, json=payload, headers=headers, timeout=30)
+                    slot.observe(response)
+                http_span.set(status_code=response.status_code, response_bytes=len(response.content))
+            latency = time.time() - started
+            metrics.counter("echoverse_gemini_responses_total", "Gemini responses by HTTP status",
+                            status=response.status_code).inc()
 
             if response.status_code == 200:
                 result = response.json()
@@ -65,26 +77,28 @@ class GeminiTextGenerator:
                         parts = candidate["content"]["parts"]
                         if len(parts) > 0 and "text" in parts[0]:
                             generated_text = parts[0]["text"].strip()
-                            st.success("✅ Content generated successfully!")
+                            self.events.success("✅ Content generated successfully!", stage="generate", provider="gemini",
+                                                latency=latency, bytes=len(response.content))
                             return generated_text
                     else:
-                        st.error("❌ Unexpected response structure from Gemini API")
+                        self.events.error("❌ Unexpected response structure from Gemini API")
                         return None
                 else:
-                    st.error("❌ No content generated by Gemini API")
+                    self.events.error("❌ No content generated by Gemini API")
                     return None
             else:
-                st.error(f"❌ Gemini API error: {response.status_code}")
+                self.events.error(f"❌ Gemini API error: {response.status_code}", stage="generate", provider="gemini",
+                                  latency=latency)
                 if response.status_code == 400:
-                    st.error("Check your API key and request format")
+                    self.events.error("Check your API key and request format")
                 elif response.status_code == 403:
-                    st.error("API key may not have permission or quota exceeded")
+                    self.events.error("API key may not have permission or quota exceeded")
                 elif response.status_code == 404:
-                    st.error("Model not found - using updated model name")
+                    self.events.error("Model not found - using updated model name")
                 return None
 
         except Exception as e:
-            st.error(f"❌ Error generating content: {str(e)}")
+            self.events.error(f"❌ Error generating content: {str(e)}")
             return None
     
 
@@ -0,0 +1,105 @@
+"""
+EchoVerse Parallel gTTS Client
+Google TTS with gTTS's own tokenization, fetching the token parts concurrently over one pooled session
+"""
+
+import re
+import base64
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from config import GTTS_TIMEOUT
+from rate_limits import provider_slot, provider_max_limit
+from tracing import span, run_in_context
+from utils import configure_gtts_endpoint
+import metrics
+
+AUDIO_PATTERN = re.compile(r'jQ1olc","\[\\"(.*)\\"]')
+
+_client = None
+_client_lock = threading.Lock()
+
+
+class ParallelGTTS:
+    """Sends the ~100-character parts of one gTTS request side by side instead of one after another.
+
+    Parts still go through provider_slot("gtts"), so the provider's adaptive limit
+    bounds how many are in flight across all sessions; the audio is joined in text order.
+    """
+
+    def __init__(self, workers=None, timeout=GTTS_TIMEOUT):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.workers = max(workers or provider_max_limit("gtts"), 1)
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="echoverse-gtts")
+
+    def synthesize(self, tts):
+        """Return the MP3 bytes for a gTTS object; raises gTTSError like gTTS.write_to_fp"""
+        configure_gtts_endpoint()
+        prepared = tts._prepare_requests()
+
+        with span("gtts.parallel", parts=len(prepared), workers=self.workers) as parallel_span:
+            futures = [self._executor.submit(run_in_context(self._fetch_part, tts, index, request))
+                       for index, request in enumerate(prepared)]
+            try:
+                parts = [future.result() for future in futures]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+            audio = b"".join(parts)
+            parallel_span.set(bytes=len(audio))
+
+        metrics.counter("echoverse_gtts_parts_total", "gTTS token parts fetched").inc(len(prepared))
+        return audio
+
+    def _fetch_part(self, tts, index, request):
+        import requests
+        from gtts.tts import gTTSError
+
+        with span("gtts.part", index=index, request_bytes=len(request.body or "")) as part_span, provider_slot("gtts") as slot:
+            try:
+                # Session.send() skips environment settings, so pass the proxies gTTS's own stream() uses
+                response = self.session.send(request, timeout=self.timeout, proxies=urllib.request.getproxies())
+            except requests.RequestException:
+                raise gTTSError(tts=tts)
+            slot.observe(response)
+
+            if response.status_code != 200:
+                raise gTTSError(tts=tts, response=response)
+
+            # Like gTTS, decode every line carrying audio, in order
+            chunks = []
+            for line in response.text.splitlines():
+                if "jQ1olc" not in line:
+                    continue
+                audio_search = AUDIO_PATTERN.search(line)
+                if not audio_search:
+                    raise gTTSError(tts=tts, response=response)
+                chunks.append(base64.b64decode(audio_search.group(1).encode("ascii")))
+
+            if not chunks:
+                # Request succeeded but the response carries no audio
+                raise gTTSError(tts=tts, response=response)
+
+            audio = b"".join(chunks)
+            part_span.set(bytes=len(audio))
+            return audio
+
+
+def get_client():
+    """The process-wide client, created on first use"""
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ParallelGTTS()
+    return _client
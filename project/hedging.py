@@ -0,0 +1,127 @@
+"""
+EchoVerse Request Hedging
+Opt-in duplicate requests for calls that are slower than usual, to cut tail latency
+"""
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from config import HEDGED_PROVIDERS, HEDGE_PERCENTILE, HEDGE_BUDGET, HEDGE_MIN_SAMPLES, HEDGE_MIN_DELAY, HEDGE_WORKERS
+from tracing import run_in_context
+import metrics
+
+_policies = {}
+_policies_lock = threading.Lock()
+_executor = None
+
+
+class HedgePolicy:
+    """When to send a duplicate request to one provider, and how many may be sent.
+
+    The hedge delay is the HEDGE_PERCENTILE of recent single-call latencies, so
+    only calls already slower than ~90% of their peers get a duplicate. Each
+    call earns HEDGE_BUDGET of a token and each hedge spends one, which keeps
+    the extra load at or below that fraction of calls.
+    """
+
+    def __init__(self, provider, percentile=HEDGE_PERCENTILE, budget=HEDGE_BUDGET, min_samples=HEDGE_MIN_SAMPLES,
+                 min_delay=HEDGE_MIN_DELAY, window=200):
+        self.provider = provider
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.tokens = 0.0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def delay(self):
+        """Seconds to wait for the first attempt before hedging; None until enough latencies are known"""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(int(len(ordered) * self.percentile), len(ordered) - 1)
+        return max(ordered[index], self.min_delay)
+
+    def observe(self, seconds):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def earn(self):
+        with self._lock:
+            self.tokens = min(self.tokens + self.budget, 10.0)
+
+    def spend(self):
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+def get_policy(provider):
+    policy = _policies.get(provider)
+    if policy is None:
+        with _policies_lock:
+            policy = _policies.setdefault(provider, HedgePolicy(provider))
+    return policy
+
+def hedged(provider, call, is_success=lambda result: True):
+    """Run call(), sending a second call() if the first is slow; returns the first successful result.
+
+    Only providers listed in HEDGED_PROVIDERS are hedged; others run call()
+    directly. If neither attempt succeeds, the first attempt's result (or
+    exception) is returned. The losing attempt cannot be interrupted mid-request;
+    a hedge still queued when the first attempt wins is skipped.
+    """
+    if provider not in HEDGED_PROVIDERS:
+        return call()
+
+    policy = get_policy(provider)
+    policy.earn()
+    settled = threading.Event()
+
+    def attempt(is_hedge):
+        if is_hedge and settled.is_set():
+            return None
+        started = time.perf_counter()
+        result = call()
+        if is_success(result):
+            policy.observe(time.perf_counter() - started)
+        return result
+
+    executor = _get_executor()
+    primary = executor.submit(run_in_context(attempt, False))
+    delay = policy.delay()
+    done, _ = wait([primary], timeout=delay)
+
+    if primary in done or not policy.spend():
+        return primary.result()
+
+    hedge = executor.submit(run_in_context(attempt, True))
+    pending = {primary, hedge}
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and is_success(future.result()):
+                    outcome = "won" if future is hedge else "lost"
+                    metrics.counter("echoverse_hedges_total", "Hedged requests by whether the duplicate answered first",
+                                    provider=provider, outcome=outcome).inc()
+                    return future.result()
+        metrics.counter("echoverse_hedges_total", "Hedged requests by whether the duplicate answered first",
+                        provider=provider, outcome="failed").inc()
+        return primary.result()
+    finally:
+        settled.set()
+
+def _get_executor():
+    global _executor
+
+    if _executor is None:
+        with _policies_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="echoverse-hedge")
+    return _executor
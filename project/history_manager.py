@@ -8,6 +8,8 @@ import json
 import time
 from datetime import datetime
 import os
+from download_server import bytes_download_url
+import metrics
 
 class HistoryManager:
     def __init__(self):
@@ -18,19 +20,26 @@ class HistoryManager:
         """Load user history from file"""
         try:
             if os.path.exists(self.history_file):
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    st.session_state.user_history = json.load(f)
+                with metrics.histogram("echoverse_history_load_seconds", "Time to load the history file").time():
+                    with open(self.history_file, 'r', encoding='utf-8') as f:
+                        st.session_state.user_history = json.load(f)
+                metrics.gauge("echoverse_history_file_bytes", "Size of the history file").set(os.path.getsize(self.history_file))
             else:
                 st.session_state.user_history = []
         except Exception as e:
+            metrics.counter("echoverse_history_errors_total", "History load/save failures", operation="load").inc()
             st.session_state.user_history = []
+        metrics.gauge("echoverse_history_entries", "Entries in the history store").set(len(st.session_state.user_history))
     
     def save_history(self):
         """Save user history to file"""
         try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(st.session_state.user_history, f, indent=2, ensure_ascii=False)
+            with metrics.histogram("echoverse_history_save_seconds", "Time to write the history file").time():
+                with open(self.history_file, 'w', encoding='utf-8') as f:
+                    json.dump(st.session_state.user_history, f, indent=2, ensure_ascii=False)
+            metrics.gauge("echoverse_history_entries", "Entries in the history store").set(len(st.session_state.user_history))
         except Exception as e:
+            metrics.counter("echoverse_history_errors_total", "History load/save failures", operation="save").inc()
             st.error(f"Failed to save history: {str(e)}")
     
     def add_generation_to_history(self, original_text, rewritten_text, tone, voice, language):
@@ -225,14 +234,7 @@ class HistoryManager:
                 st.success("✅ Rewritten text loaded! Go to Generate page.")
         
         with col3:
-            if st.button("📥 Download", key=f"download_{item['id']}"):
-                st.download_button(
-                    "📄 Download Text",
-                    item["full_rewritten"],
-                    file_name=f"echoverse_{item['id']}.txt",
-                    mime="text/plain",
-                    key=f"dl_btn_{item['id']}"
-                )
+            self._show_text_download(item["full_rewritten"], f"echoverse_{item['id']}.txt", item['id'])
     
     def _display_topic_item(self, item):
         """Display topic generation item"""
@@ -258,14 +260,21 @@ class HistoryManager:
                 st.success("✅ Generated content loaded! Go to Generate page.")
         
         with col2:
-            if st.button("📥 Download", key=f"download_topic_{item['id']}"):
-                st.download_button(
-                    "📄 Download Text",
-                    item["full_text"],
-                    file_name=f"echoverse_topic_{item['id']}.txt",
-                    mime="text/plain",
-                    key=f"dl_topic_btn_{item['id']}"
-                )
+            self._show_text_download(item["full_text"], f"echoverse_topic_{item['id']}.txt", f"topic_{item['id']}")
+    
+    def _show_text_download(self, text, filename, key):
+        """Link to the text on the download server instead of embedding it on every rerun"""
+        text_url = bytes_download_url(text, filename, "text/plain; charset=utf-8")
+        if text_url:
+            st.link_button("📥 Download", text_url)
+        elif st.button("📥 Download", key=f"download_{key}"):
+            st.download_button(
+                "📄 Download Text",
+                text,
+                file_name=filename,
+                mime="text/plain",
+                key=f"dl_btn_{key}"
+            )
     
     def get_history_stats(self):
         """Get statistics about user history"""
@@ -0,0 +1,343 @@
+"""
+EchoVerse Load Test
+Drives many simulated sessions through login → text upload → generate → results
+against the local fake providers to find where one server stops scaling
+
+Usage:
+    python load_test.py --sessions 1,4,16,32               # pipeline mode: sessions share one process like one server
+    python load_test.py --mode apptest --sessions 1,4      # real main_app reruns through Streamlit's AppTest
+    python load_test.py --sessions 8 --latency 0.5 --output load.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import datetime
+
+# Add current directory to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STEPS = ("landing", "login", "text_upload", "generate", "results")
+PASSWORD = "loadtest-password"
+SETTINGS = {"tone": "Suspenseful", "intensity": "Medium", "voice": "Lisa", "language": "English"}
+
+def _rss_bytes():
+    """Current resident set size of this process"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def _username(session_id):
+    return f"loadtest_user_{session_id}"
+
+class StepTimer:
+    """Records the latency and outcome of each step of one session"""
+
+    def __init__(self):
+        self.records = []
+
+    def run(self, step, fn):
+        started = time.perf_counter()
+        try:
+            ok = fn() is not False
+            error = None
+        except Exception as e:
+            ok, error = False, f"{type(e).__name__}: {e}"
+        self.records.append({"step": step, "seconds": time.perf_counter() - started, "ok": ok, "error": error})
+        return ok
+
+# Pipeline mode: the page logic without Streamlit, all sessions in this process
+
+def pipeline_session(session_id, text, ai_manager):
+    """One user's walk through the app, calling what each page calls"""
+    from auth import authenticate_user
+    from text_processor import TextProcessor
+    from utils import chunk_text, detect_chapters, generate_summary
+    from package_builder import PackageBuilder
+
+    timer = StepTimer()
+    state = {}  # stands in for st.session_state and is kept alive for the memory measurement
+
+    def landing():
+        state["show_auth"] = True
+
+    def login():
+        success, _ = authenticate_user(_username(session_id), PASSWORD)
+        state["authenticated"] = success
+        return success
+
+    def text_upload():
+        processor = TextProcessor()
+        state["original_text"] = text
+        state["processed_text"] = processor._clean_text(text)
+        state["chapters"] = detect_chapters(text)
+        state["summary"] = generate_summary(text)
+        state["chunks"] = chunk_text(state["processed_text"])
+
+    def generate():
+        state["rewritten_text"] = ai_manager.rewrite_text_with_tone(text, SETTINGS["tone"], SETTINGS["intensity"], SETTINGS["language"])
+        state["audio_data"] = ai_manager.generate_speech(state["rewritten_text"], SETTINGS["voice"], SETTINGS["language"])
+        return state["audio_data"] is not None
+
+    def results():
+        with PackageBuilder() as package:
+            package.add_audio(state["audio_data"])
+            package.add_bytes("original_text.txt", state["original_text"])
+            package.add_bytes("rewritten_text.txt", state["rewritten_text"])
+        state["package_path"] = package.path
+
+    for step, fn in zip(STEPS, (landing, login, text_upload, generate, results)):
+        if not timer.run(step, fn):
+            break
+
+    return timer.records, state
+
+def run_pipeline_level(sessions, text, iterations):
+    """Run sessions concurrently on threads, keeping their state until all finish"""
+    from ai_models import AIModelManager
+    from events import NullSink
+
+    ai_manager = AIModelManager(event_sink=NullSink())
+    rss_before = _rss_bytes()
+    states = []
+    records = []
+    lock = threading.Lock()
+
+    def worker(session_id):
+        for _ in range(iterations):
+            session_records, state = pipeline_session(session_id, text, ai_manager)
+            with lock:
+                records.extend(session_records)
+                states.append(state)
+
+    with ThreadPoolExecutor(max_workers=sessions, thread_name_prefix="echoverse-session") as pool:
+        list(pool.map(worker, range(sessions)))
+
+    memory_per_session = max(_rss_bytes() - rss_before, 0) / max(len(states), 1)
+    for state in states:
+        if state.get("package_path") and os.path.exists(state["package_path"]):
+            os.remove(state["package_path"])
+    return records, memory_per_session
+
+# AppTest mode: the real Streamlit script; AppTest is not thread-safe, so one process per session
+
+def apptest_session(session_id, text, iterations, timeout):
+    """Drive main_app through AppTest in this (child) process"""
+    from streamlit.testing.v1 import AppTest
+
+    records = []
+    rss_before = _rss_bytes()
+
+    for _ in range(iterations):
+        app = AppTest.from_file(os.path.join(APP_DIR, "app.py"), default_timeout=timeout)
+        timer = StepTimer()
+
+        def rerun(prepare=None):
+            def step():
+                if prepare:
+                    prepare()
+                app.run()
+                if app.exception:
+                    raise RuntimeError(app.exception[0].message)
+            return step
+
+        def fill_login():
+            app.session_state["show_auth"] = True
+            app.run()
+            app.text_input[0].input(_username(session_id))
+            app.text_input[1].input(PASSWORD)
+            next(button for button in app.button if button.label == "🚀 Login").click()
+
+        def paste_text():
+            app.session_state["nav_index"] = 1
+            app.run()
+            app.text_area[0].input(text)
+
+        def click_generate():
+            app.session_state["nav_index"] = 2
+            app.run()
+            next(button for button in app.button if button.label == "🎵 Generate Audiobook").click()
+
+        def open_results():
+            app.session_state["nav_index"] = 3
+
+        steps = (rerun(), rerun(fill_login), rerun(paste_text), rerun(click_generate), rerun(open_results))
+        for step, fn in zip(STEPS, steps):
+            if not timer.run(step, fn):
+                break
+        records.extend(timer.records)
+
+    return records, max(_rss_bytes() - rss_before, 0) / max(iterations, 1)
+
+def _init_child(workdir):
+    os.chdir(workdir)
+    sys.path.append(APP_DIR)
+
+def run_apptest_level(sessions, text, iterations, timeout, workdir):
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=sessions, mp_context=context, initializer=_init_child, initargs=(workdir,)) as pool:
+        futures = [pool.submit(apptest_session, session_id, text, iterations, timeout) for session_id in range(sessions)]
+        outcomes = [future.result() for future in futures]
+
+    records = [record for session_records, _ in outcomes for record in session_records]
+    memory_per_session = sum(memory for _, memory in outcomes) / max(len(outcomes), 1)
+    return records, memory_per_session
+
+# Reporting
+
+class ProviderSampler(threading.Thread):
+    """Samples in-flight requests on the fake provider server to estimate provider utilisation"""
+
+    def __init__(self, server, interval=0.05):
+        super().__init__(name="echoverse-load-sampler", daemon=True)
+        self.server = server
+        self.interval = interval
+        self.samples = {name: [] for name in server.states}
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            for name, state in self.server.states.items():
+                self.samples[name].append(state.in_flight)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        return {
+            name: {"mean_in_flight": round(sum(values) / len(values), 2) if values else 0, "peak_in_flight": max(values, default=0)}
+            for name, values in self.samples.items()
+        }
+
+def summarise(sessions, records, elapsed, memory_per_session, cpu_seconds, providers):
+    """Aggregate step records into throughput, latency percentiles and failure counts"""
+    from metrics import Histogram
+    from config import PROVIDER_CONCURRENCY
+
+    steps = {}
+    for step in STEPS:
+        step_records = [record for record in records if record["step"] == step]
+        if not step_records:
+            continue
+        histogram = Histogram()
+        for record in step_records:
+            histogram.observe(record["seconds"])
+        errors = [record["error"] for record in step_records if record["error"]]
+        steps[step] = {
+            "count": len(step_records),
+            "failed": len([record for record in step_records if not record["ok"]]),
+            "p50_ms": round(histogram.percentile(0.5) * 1000, 1),
+            "p95_ms": round(histogram.percentile(0.95) * 1000, 1),
+            "p99_ms": round(histogram.percentile(0.99) * 1000, 1),
+            "first_error": errors[0] if errors else None
+        }
+
+    completed = len([record for record in records if record["step"] == STEPS[-1] and record["ok"]])
+    for name, usage in providers.items():
+        limit = PROVIDER_CONCURRENCY.get(name)
+        usage["utilisation"] = round(usage["mean_in_flight"] / limit, 3) if limit else None
+
+    return {
+        "sessions": sessions,
+        "elapsed_s": round(elapsed, 3),
+        "requests": len(records),
+        "requests_per_s": round(len(records) / elapsed, 2),
+        "completed_sessions": completed,
+        "sessions_per_min": round(completed / elapsed * 60, 2),
+        "memory_per_session_mb": round(memory_per_session / (1024 * 1024), 2),
+        "cpu_utilisation": round(cpu_seconds / elapsed / (os.cpu_count() or 1), 3),
+        "steps": steps,
+        "providers": providers
+    }
+
+def print_level(summary):
+    print(f"\n👥 {summary['sessions']} session(s): {summary['requests_per_s']} req/s, "
+          f"{summary['sessions_per_min']} sessions/min, {summary['memory_per_session_mb']} MB/session, "
+          f"CPU {summary['cpu_utilisation']:.0%}")
+    for step, stats in summary["steps"].items():
+        failed = f"  ❌ {stats['failed']} failed ({stats['first_error']})" if stats["failed"] else ""
+        print(f"   {step:<12} p50 {stats['p50_ms']:>9.1f} ms   p95 {stats['p95_ms']:>9.1f} ms   p99 {stats['p99_ms']:>9.1f} ms{failed}")
+    usage = ", ".join(f"{name} {stats['mean_in_flight']} avg / {stats['peak_in_flight']} peak in flight"
+                      + (f" ({stats['utilisation']:.0%} of cap)" if stats["utilisation"] is not None else "")
+                      for name, stats in summary["providers"].items())
+    print(f"   providers    {usage}")
+
+def parse_args(argv=None):
+    """Parse command-line arguments"""
+    parser = argparse.ArgumentParser(description="Simulate concurrent EchoVerse sessions against fake providers.")
+    parser.add_argument("--sessions", default="1,4,16", help="Comma-separated concurrency levels to run in turn")
+    parser.add_argument("--iterations", type=int, default=1, help="Times each session repeats the flow")
+    parser.add_argument("--mode", choices=["pipeline", "apptest"], default="pipeline")
+    parser.add_argument("--text-size", default="5k", help="Size of the text each session uploads")
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated provider latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.05, help="Extra random provider latency in seconds")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-rerun timeout in apptest mode")
+    parser.add_argument("--output", help="Write all levels as JSON to this file")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Run each concurrency level and print the results"""
+    args = parse_args(argv)
+
+    from benchmark import start_stub_providers, make_corpus, parse_size
+    server = start_stub_providers(args.latency, args.jitter)
+
+    # users.json, history and packages go to a scratch directory, not the real app data
+    workdir = tempfile.mkdtemp(prefix="echoverse_load_")
+    os.chdir(workdir)
+    os.environ.setdefault("ECHOVERSE_PACKAGE_DIR", os.path.join(workdir, "packages"))
+
+    levels = [int(level) for level in args.sessions.split(",") if level]
+    text = make_corpus(parse_size(args.text_size))
+
+    from auth import register_user
+    for session_id in range(max(levels)):
+        register_user(_username(session_id), f"{_username(session_id)}@example.com", PASSWORD)
+
+    print(f"🧪 EchoVerse load test: {args.mode} mode, {len(text):,} chars per session, provider latency {args.latency}s")
+    print(f"📁 Scratch directory: {workdir}")
+
+    summaries = []
+    for sessions in levels:
+        sampler = ProviderSampler(server)
+        sampler.start()
+        cpu_before = sum(os.times()[:4])
+        started = time.perf_counter()
+
+        if args.mode == "pipeline":
+            records, memory = run_pipeline_level(sessions, text, args.iterations)
+        else:
+            records, memory = run_apptest_level(sessions, text, args.iterations, args.timeout, workdir)
+
+        elapsed = time.perf_counter() - started
+        cpu_seconds = sum(os.times()[:4]) - cpu_before
+        summary = summarise(sessions, records, elapsed, memory, cpu_seconds, sampler.stop())
+        summaries.append(summary)
+        print_level(summary)
+
+    server.shutdown()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "created_at": datetime.now().isoformat(),
+                "mode": args.mode,
+                "provider_latency": args.latency,
+                "text_chars": len(text),
+                "levels": summaries
+            }, f, indent=2)
+        print(f"\n📝 Results: {args.output}")
+
+    return 0 if all(not stats["failed"] for summary in summaries for stats in summary["steps"].values()) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
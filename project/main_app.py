@@ -7,14 +7,11 @@ import streamlit as st
 from streamlit_option_menu import option_menu
 import time
 
-# Import all modules
+# Page modules (and their PDF, HTTP, plotting and audio dependencies) are imported
+# on first use of their page, so the landing and login pages start quickly
 from config import *
 from auth import *
-from landing_page import show_landing_page
-from text_processor import TextProcessor
-from audio_pipeline import AudioPipeline
-from advanced_features import AdvancedFeatures
-from history_manager import HistoryManager
+from assets import stylesheet
 
 
 # Configure Streamlit page
@@ -39,11 +36,19 @@ def show_sidebar():
         if is_authenticated():
             st.markdown(f"### 👋 Welcome, {get_current_user()}!")
 
+            nav_options = ["🏠 Home", "📝 Text Input", "🎛️ Generate", "📋 Results", "📚 History", "🔖 Bookmarks", "📦 Batch", "📊 Summary", "📚 Chapters"]
+            nav_icons = ['house', 'file-text', 'gear', 'list-task', 'clock-history', 'bookmark', 'archive', 'bar-chart', 'book']
+
+            # Operational metrics are only shown to admins
+            if is_admin():
+                nav_options.extend(["📈 Metrics", "🔬 Profiler"])
+                nav_icons.extend(['speedometer', 'cpu'])
+
             # Navigation menu with improved styling
             selected = option_menu(
                 "EchoVerse",
-                ["🏠 Home", "📝 Text Input", "🎛️ Generate", "📋 Results", "📚 History", "🔖 Bookmarks", "📦 Batch", "📊 Summary", "📚 Chapters"],
-                icons=['house', 'file-text', 'gear', 'list-task', 'clock-history', 'bookmark', 'archive', 'bar-chart', 'book'],
+                nav_options,
+                icons=nav_icons,
                 menu_icon="headphones",
                 default_index=st.session_state.get('nav_index', 0),
                 styles={
@@ -56,9 +61,12 @@ def show_sidebar():
 
             # Store selected index
             if selected:
-                nav_options = ["🏠 Home", "📝 Text Input", "🎛️ Generate", "📋 Results", "📚 History", "🔖 Bookmarks", "📦 Batch", "📊 Summary", "📚 Chapters"]
                 st.session_state.nav_index = nav_options.index(selected)
 
+            # Per-session rerun profiling for admins (ECHOVERSE_PROFILE=true enables it for everyone)
+            if is_admin():
+                st.toggle("🔬 Profile reruns", key="profiling_enabled")
+
             # Logout button
             st.markdown("---")
             if st.button("🚪 Logout", use_container_width=True, type="secondary"):
@@ -72,43 +80,51 @@ def show_sidebar():
 
 def show_main_content(page):
     """Display main content based on selected page"""
-    # Initialize components
-    text_processor = TextProcessor()
-    audio_pipeline = AudioPipeline()
-    advanced_features = AdvancedFeatures()
-    history_manager = HistoryManager()
-    
     if page == "🏠 Home":
         show_home_dashboard()
     
     elif page == "📝 Text Input":
+        from text_processor import TextProcessor
+        text_processor = TextProcessor()
         text_processor.show_text_input_interface()
         st.markdown("---")
         text_processor.show_text_preview()
     
-    elif page == "🎛️ Generate":
-        audio_pipeline.show_generation_interface()
-    
-    elif page == "📋 Results":
-        audio_pipeline.show_results_interface()
+    elif page in ("🎛️ Generate", "📋 Results"):
+        from audio_pipeline import AudioPipeline
+        audio_pipeline = AudioPipeline()
+        if page == "🎛️ Generate":
+            audio_pipeline.show_generation_interface()
+        else:
+            audio_pipeline.show_results_interface()
 
     elif page == "📚 History":
-        history_manager.show_history_interface()
+        from history_manager import HistoryManager
+        HistoryManager().show_history_interface()
+
+    elif page in ("🔖 Bookmarks", "📦 Batch", "📊 Summary", "📚 Chapters"):
+        from advanced_features import AdvancedFeatures
+        advanced_features = AdvancedFeatures()
+        if page == "🔖 Bookmarks":
+            advanced_features.show_bookmarks_interface()
+        elif page == "📦 Batch":
+            advanced_features.show_batch_processing_interface()
+        elif page == "📊 Summary":
+            advanced_features.show_summary_generator()
+        else:
+            advanced_features.show_chapter_navigator()
 
-    elif page == "🔖 Bookmarks":
-        advanced_features.show_bookmarks_interface()
-    
-    elif page == "📦 Batch":
-        advanced_features.show_batch_processing_interface()
-    
-    elif page == "📊 Summary":
-        advanced_features.show_summary_generator()
-    
-    elif page == "📚 Chapters":
-        advanced_features.show_chapter_navigator()
+    elif page == "📈 Metrics" and is_admin():
+        show_metrics_dashboard()
+
+    elif page == "🔬 Profiler" and is_admin():
+        show_profiler_dashboard()
 
 def show_home_dashboard():
     """Display home dashboard"""
+    from history_manager import HistoryManager
+    history_manager = HistoryManager()
+
     st.markdown("# 🎧 EchoVerse Dashboard")
     st.markdown("### Transform your text into captivating audiobooks with AI")
     
@@ -216,249 +232,147 @@ def show_home_dashboard():
         - **Perfect for**: Content creation, inspiration, educational material, and storytelling
         """)
 
+def show_metrics_dashboard():
+    """Display operational metrics for admins"""
+    import metrics
+
+    st.markdown("# 📈 Operational Metrics")
+    st.markdown("### Latency, cache efficiency and saturation for this EchoVerse process")
+
+    def fmt_ms(seconds):
+        return "—" if seconds is None else f"{seconds * 1000:,.0f} ms"
+
+    # Provider latency percentiles
+    st.markdown("## ⏱️ Provider Latency")
+    rows = []
+    for name, labels, metric in metrics.registry.collect():
+        if name in ("echoverse_provider_latency_seconds", "echoverse_provider_wait_seconds") and metric.count:
+            rows.append({
+                "Provider": labels.get("provider"),
+                "Measure": "call" if name == "echoverse_provider_latency_seconds" else "slot wait",
+                "Calls": metric.count,
+                "p50": fmt_ms(metric.percentile(0.5)),
+                "p95": fmt_ms(metric.percentile(0.95)),
+                "p99": fmt_ms(metric.percentile(0.99)),
+                "Max": fmt_ms(metric.max)
+            })
+    if rows:
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+    else:
+        st.info("No provider calls recorded yet.")
+
+    # Cache hit ratios
+    st.markdown("## 🎯 Cache Hit Ratios")
+    ratios = metrics.cache_hit_ratios()
+    if ratios:
+        cols = st.columns(len(ratios))
+        for col, (cache, (hits, total)) in zip(cols, sorted(ratios.items())):
+            with col:
+                st.metric(cache.replace("_", " ").title(), f"{hits / total:.0%}" if total else "—", f"{int(total)} lookups",
+                          delta_color="off")
+    else:
+        st.info("No cache lookups recorded yet.")
+
+    # Saturation
+    st.markdown("## 🏗️ Worker Pool Saturation")
+    gauges = {}
+    for name, labels, metric in metrics.registry.collect():
+        if name.startswith(("echoverse_provider_in_flight", "echoverse_provider_waiting", "echoverse_provider_limit")):
+            gauges.setdefault(labels["provider"], {})[name.rsplit("_", 1)[-1]] = metric.value
+
+    if gauges:
+        saturation_rows = [{
+            "Provider": provider,
+            "In flight": int(values.get("flight", 0)),
+            "Queued": int(values.get("waiting", 0)),
+            "Limit": int(values.get("limit", 0)),
+            "Utilisation": f"{values.get('flight', 0) / values['limit']:.0%}" if values.get("limit") else "—"
+        } for provider, values in sorted(gauges.items())]
+        st.dataframe(saturation_rows, use_container_width=True, hide_index=True)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("📦 Batch Workers Busy",
+                  f"{metrics.gauge('echoverse_batch_workers_busy').value:.0f} / {metrics.gauge('echoverse_batch_workers').value:.0f}")
+    with col2:
+        st.metric("📥 Batch Queue Depth", f"{metrics.gauge('echoverse_batch_queue_depth').value:.0f}")
+    with col3:
+        st.metric("📚 History Entries", f"{metrics.gauge('echoverse_history_entries').value:.0f}")
+
+    # Export
+    st.markdown("## 📤 Export")
+    prometheus_text = metrics.registry.render_prometheus()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("💾 Write Prometheus File", use_container_width=True):
+            path = metrics.registry.write_prometheus()
+            st.success(f"✅ Metrics written to {path}")
+    with col2:
+        st.download_button("📥 Download metrics.prom", prometheus_text, file_name="metrics.prom",
+                           mime="text/plain", use_container_width=True)
+
+    from download_server import ensure_download_server
+    if METRICS_ENDPOINT_ENABLED and ensure_download_server():
+        st.caption(f"Prometheus can scrape http://{DOWNLOAD_SERVER_HOST}:{DOWNLOAD_SERVER_PORT}/metrics while the download server is running.")
+
+    with st.expander("🔍 Raw Prometheus Output"):
+        st.code(prometheus_text, language="text")
+
+def show_profiler_dashboard():
+    """Display per-page rerun profiles for admins"""
+    import profiler
+
+    st.markdown("# 🔬 Rerun Profiler")
+    st.markdown("### Where each Streamlit rerun spends its time, per page")
+
+    if not profiler.is_profiling_enabled(st.session_state):
+        st.info("💡 Turn on **🔬 Profile reruns** in the sidebar (or set ECHOVERSE_PROFILE=true), then use the app to collect profiles.")
+
+    summary = profiler.page_summary()
+    if not summary:
+        st.info("No reruns profiled yet.")
+        return
+
+    st.markdown("## 📊 Rerun Cost by Page")
+    st.dataframe(summary, use_container_width=True, hide_index=True)
+
+    page = st.selectbox("Page", [row["page"] for row in summary])
+    profiles = profiler.get_profiles(page)
+    latest = profiles[-1]
+
+    st.line_chart({"Rerun time (ms)": [profile.duration * 1000 for profile in profiles]})
+
+    st.markdown(f"## 🔥 Top Functions – latest {page} rerun ({latest.duration * 1000:.0f} ms)")
+    st.dataframe(profiler.compare_latest(page), use_container_width=True, hide_index=True)
+    st.caption("Δ compares self time with the previous rerun of the same page.")
+
+    col1, col2 = st.columns(2)
+    slug = page.encode("ascii", "ignore").decode().strip().lower().replace(" ", "_") or "page"
+    with col1:
+        st.download_button("📥 Download .pstats", latest.to_pstats(), file_name=f"echoverse_{slug}.pstats",
+                           mime="application/octet-stream", use_container_width=True)
+    with col2:
+        st.download_button("📥 Download speedscope JSON", latest.to_speedscope(), file_name=f"echoverse_{slug}.speedscope.json",
+                           mime="application/json", use_container_width=True)
+
+    if st.button("🗑️ Clear Profiles"):
+        profiler.clear_profiles()
+        st.rerun()
+
 def main():
     """Main application function"""
     init_session_state()
+
+    from profiler import profile_rerun, is_profiling_enabled
+    with profile_rerun(enabled=is_profiling_enabled(st.session_state)) as rerun:
+        rerun.page = render_app()
+
+def render_app():
+    """Render one rerun of the app and return the name of the page shown"""
     
     # Custom CSS for better styling with green theme and animations
     st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;600;700&display=swap');
-
-    .main > div {
-        padding-top: 2rem;
-        font-family: 'Poppins', sans-serif;
-    }
-
-    /* Animated background */
-    .stApp {
-        background: linear-gradient(-45deg, #e8f5e8, #f0f8f0, #e8f5e8, #f5f9f5);
-        background-size: 400% 400%;
-        animation: gradientShift 15s ease infinite;
-    }
-
-    @keyframes gradientShift {
-        0% { background-position: 0% 50%; }
-        50% { background-position: 100% 50%; }
-        100% { background-position: 0% 50%; }
-    }
-
-    /* Floating animation elements */
-    .floating-icons {
-        position: fixed;
-        top: 0;
-        left: 0;
-        width: 100%;
-        height: 100%;
-        pointer-events: none;
-        z-index: -1;
-        overflow: hidden;
-    }
-
-    .floating-icon {
-        position: absolute;
-        opacity: 0.1;
-        animation: float 8s ease-in-out infinite;
-        font-size: 2rem;
-    }
-
-    .floating-icon:nth-child(1) { top: 10%; left: 10%; animation-delay: 0s; }
-    .floating-icon:nth-child(2) { top: 20%; right: 10%; animation-delay: 2s; }
-    .floating-icon:nth-child(3) { top: 60%; left: 5%; animation-delay: 4s; }
-    .floating-icon:nth-child(4) { top: 70%; right: 15%; animation-delay: 6s; }
-    .floating-icon:nth-child(5) { top: 40%; left: 80%; animation-delay: 1s; }
-
-    @keyframes float {
-        0%, 100% { transform: translateY(0px) rotate(0deg); }
-        50% { transform: translateY(-20px) rotate(180deg); }
-    }
-
-    /* Green button styling */
-    .stButton > button {
-        width: 100%;
-        border-radius: 12px;
-        border: none;
-        padding: 0.75rem 1.5rem;
-        font-weight: 600;
-        font-family: 'Poppins', sans-serif;
-        background: linear-gradient(135deg, #28a745, #20c997, #28a745);
-        background-size: 200% 200%;
-        color: white;
-        transition: all 0.4s ease;
-        box-shadow: 0 4px 15px rgba(40, 167, 69, 0.3);
-        animation: buttonGlow 2s ease-in-out infinite alternate;
-    }
-
-    .stButton > button:hover {
-        transform: translateY(-3px) scale(1.02);
-        box-shadow: 0 8px 25px rgba(40, 167, 69, 0.4);
-        background-position: 100% 0;
-        animation: none;
-    }
-
-    .stButton > button:active {
-        transform: translateY(-1px) scale(0.98);
-    }
-
-    @keyframes buttonGlow {
-        0% { box-shadow: 0 4px 15px rgba(40, 167, 69, 0.3); }
-        100% { box-shadow: 0 6px 20px rgba(40, 167, 69, 0.5); }
-    }
-
-    /* Primary button special styling */
-    .stButton > button[kind="primary"] {
-        background: linear-gradient(135deg, #198754, #20c997, #0d6efd);
-        animation: primaryPulse 3s ease-in-out infinite;
-    }
-
-    @keyframes primaryPulse {
-        0%, 100% { transform: scale(1); }
-        50% { transform: scale(1.05); }
-    }
-
-    /* Metrics styling */
-    .stMetric {
-        background: linear-gradient(135deg, #f8f9fa, #e9ecef);
-        border: 2px solid #28a745;
-        padding: 1.5rem;
-        border-radius: 15px;
-        text-align: center;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-        transition: all 0.3s ease;
-        animation: metricFloat 4s ease-in-out infinite;
-    }
-
-    .stMetric:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 8px 25px rgba(40, 167, 69, 0.2);
-    }
-
-    @keyframes metricFloat {
-        0%, 100% { transform: translateY(0px); }
-        50% { transform: translateY(-3px); }
-    }
-
-    /* Success messages */
-    .success-message {
-        background: linear-gradient(135deg, #d4edda, #c3e6cb);
-        border: 2px solid #28a745;
-        color: #155724;
-        padding: 1rem;
-        border-radius: 12px;
-        margin: 1rem 0;
-        animation: successSlide 0.5s ease-out;
-    }
-
-    @keyframes successSlide {
-        from { opacity: 0; transform: translateX(-20px); }
-        to { opacity: 1; transform: translateX(0); }
-    }
-
-    /* Info messages */
-    .info-message {
-        background: linear-gradient(135deg, #d1ecf1, #bee5eb);
-        border: 2px solid #17a2b8;
-        color: #0c5460;
-        padding: 1rem;
-        border-radius: 12px;
-        margin: 1rem 0;
-        animation: infoFade 0.5s ease-in;
-    }
-
-    @keyframes infoFade {
-        from { opacity: 0; }
-        to { opacity: 1; }
-    }
-
-    /* Sidebar styling */
-    .css-1d391kg {
-        background: linear-gradient(180deg, #f8f9fa, #e9ecef);
-        border-right: 3px solid #28a745;
-    }
-
-    /* Progress bar styling */
-    .stProgress > div > div > div {
-        background: linear-gradient(90deg, #28a745, #20c997);
-        animation: progressGlow 2s ease-in-out infinite alternate;
-    }
-
-    @keyframes progressGlow {
-        0% { box-shadow: 0 0 5px rgba(40, 167, 69, 0.5); }
-        100% { box-shadow: 0 0 15px rgba(40, 167, 69, 0.8); }
-    }
-
-    /* Loading spinner */
-    .stSpinner > div {
-        border-top-color: #28a745 !important;
-        animation: spinGlow 1s linear infinite;
-    }
-
-    @keyframes spinGlow {
-        0% { filter: drop-shadow(0 0 5px rgba(40, 167, 69, 0.5)); }
-        50% { filter: drop-shadow(0 0 10px rgba(40, 167, 69, 0.8)); }
-        100% { filter: drop-shadow(0 0 5px rgba(40, 167, 69, 0.5)); }
-    }
-
-    /* Audio player styling */
-    audio {
-        width: 100%;
-        border-radius: 10px;
-        box-shadow: 0 4px 15px rgba(40, 167, 69, 0.2);
-    }
-
-    /* Text area styling */
-    .stTextArea > div > div > textarea {
-        border: 2px solid #28a745;
-        border-radius: 10px;
-        transition: all 0.3s ease;
-        color: #212529 !important;
-        font-weight: 500 !important;
-        font-size: 14px !important;
-        background-color: #ffffff !important;
-    }
-
-    .stTextArea > div > div > textarea:focus {
-        box-shadow: 0 0 15px rgba(40, 167, 69, 0.3);
-        border-color: #20c997;
-        color: #000000 !important;
-    }
-
-    /* Text input styling */
-    .stTextInput > div > div > input {
-        border: 2px solid #28a745;
-        border-radius: 8px;
-        color: #212529 !important;
-        font-weight: 500 !important;
-        background-color: #ffffff !important;
-    }
-
-    .stTextInput > div > div > input:focus {
-        box-shadow: 0 0 10px rgba(40, 167, 69, 0.3);
-        border-color: #20c997;
-        color: #000000 !important;
-    }
-
-    /* Selectbox styling */
-    .stSelectbox > div > div > select {
-        border: 2px solid #28a745;
-        border-radius: 8px;
-        color: #212529 !important;
-        font-weight: 500 !important;
-    }
-
-    /* Make all text darker and more visible */
-    .stMarkdown, .stText, p, span, div {
-        color: #212529 !important;
-    }
-
-    /* Placeholder text styling */
-    .stTextArea > div > div > textarea::placeholder,
-    .stTextInput > div > div > input::placeholder {
-        color: #6c757d !important;
-        font-weight: 400 !important;
-    }
-    </style>
-
     <!-- Floating animation elements -->
     <div class="floating-icons">
         <div class="floating-icon">🎧</div>
@@ -467,7 +381,7 @@ def main():
         <div class="floating-icon">🎙️</div>
         <div class="floating-icon">📖</div>
     </div>
-    """, unsafe_allow_html=True)
+    """ + stylesheet("app.css"), unsafe_allow_html=True)
     
     # Check authentication
     if not is_authenticated():
@@ -475,16 +389,21 @@ def main():
         if st.session_state.get('show_auth'):
             st.markdown("# 🎧 EchoVerse")
             show_auth_page()
+            return "🔐 Auth"
         else:
+            from landing_page import show_landing_page
             show_landing_page()
+            return "🌟 Landing"
     else:
         # Show main application
         selected_page = show_sidebar()
 
         if selected_page:
             show_main_content(selected_page)
+            return selected_page
         else:
             show_home_dashboard()
+            return "🏠 Home"
 
 
 
@@ -0,0 +1,254 @@
+"""
+EchoVerse Metrics
+In-process counters, gauges and latency histograms with Prometheus text export
+"""
+
+import os
+import time
+import math
+import threading
+from contextlib import contextmanager
+from config import METRICS_FILE
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+class Counter:
+    """Monotonically increasing value"""
+
+    kind = "counter"
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        return self._value
+
+
+class Gauge:
+    """Value that can go up and down, e.g. in-flight requests or queue depth"""
+
+    kind = "gauge"
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    @property
+    def value(self):
+        return self._value
+
+
+class Histogram:
+    """HDR-style latency histogram.
+
+    Values are recorded in microseconds into log-linear buckets: every power of
+    two is split into 2**(precision_bits - 1) equal sub-buckets, so any reported
+    percentile is within 1 / 2**(precision_bits - 1) of the true value while the
+    memory used stays proportional to the dynamic range, not the sample count.
+    """
+
+    kind = "summary"
+
+    def __init__(self, precision_bits=8):
+        self.precision_bits = precision_bits
+        self._buckets = {}
+        self._count = 0
+        self._sum = 0.0
+        self._min = None
+        self._max = None
+        self._lock = threading.Lock()
+
+    def _bucket(self, micros):
+        shift = max(0, micros.bit_length() - self.precision_bits)
+        return (micros >> shift) << shift, (1 << shift) - 1
+
+    def observe(self, seconds):
+        micros = max(0, int(seconds * 1_000_000))
+        lower, _ = self._bucket(micros)
+        with self._lock:
+            self._buckets[lower] = self._buckets.get(lower, 0) + 1
+            self._count += 1
+            self._sum += seconds
+            self._min = seconds if self._min is None else min(self._min, seconds)
+            self._max = seconds if self._max is None else max(self._max, seconds)
+
+    @contextmanager
+    def time(self):
+        """Observe the wall time of a block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def percentile(self, quantile):
+        """Return the value (in seconds) at or below which the given fraction of samples fall"""
+        with self._lock:
+            if not self._count:
+                return None
+            rank = max(1, math.ceil(quantile * self._count))
+            seen = 0
+            for lower in sorted(self._buckets):
+                seen += self._buckets[lower]
+                if seen >= rank:
+                    _, width = self._bucket(lower)
+                    # Report the bucket midpoint, clamped to the observed range
+                    value = (lower + width / 2) / 1_000_000
+                    return min(max(value, self._min), self._max)
+        return self._max
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def sum(self):
+        return self._sum
+
+    @property
+    def mean(self):
+        return self._sum / self._count if self._count else None
+
+    @property
+    def max(self):
+        return self._max
+
+
+class MetricsRegistry:
+    """Holds every metric, keyed by name and label set"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._help = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help_text, labels):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = self._metrics[key] = cls()
+                    if help_text:
+                        self._help.setdefault(name, help_text)
+        if not isinstance(metric, cls):
+            raise TypeError(f"Metric {name} is already registered as a {metric.kind}")
+        return metric
+
+    def counter(self, name, help_text="", **labels):
+        return self._get(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text="", **labels):
+        return self._get(Gauge, name, help_text, labels)
+
+    def histogram(self, name, help_text="", **labels):
+        return self._get(Histogram, name, help_text, labels)
+
+    def collect(self):
+        """Return (name, labels dict, metric) for every metric, sorted by name"""
+        with self._lock:
+            items = list(self._metrics.items())
+        return [(name, dict(labels), metric) for (name, labels), metric in sorted(items, key=lambda item: item[0])]
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+            self._help.clear()
+
+    def render_prometheus(self, quantiles=DEFAULT_QUANTILES):
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        declared = set()
+
+        for name, labels, metric in self.collect():
+            if name not in declared:
+                declared.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {metric.kind}")
+
+            if isinstance(metric, Histogram):
+                for quantile in quantiles:
+                    value = metric.percentile(quantile)
+                    lines.append(f"{name}{_format_labels(labels, quantile=quantile)} {_format_value(value)}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(metric.sum)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {metric.count}")
+            else:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(metric.value)}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path=None):
+        """Write the Prometheus text export to a file (atomically) and return its path"""
+        path = path or METRICS_FILE
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+        return path
+
+
+def _format_labels(labels, **extra):
+    merged = dict(labels)
+    merged.update({k: str(v) for k, v in extra.items()})
+    if not merged:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(merged.items())) + "}"
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_value(value):
+    if value is None:
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# Process-wide registry shared by the app, the batch runner and the download server
+registry = MetricsRegistry()
+
+def counter(name, help_text="", **labels):
+    return registry.counter(name, help_text, **labels)
+
+def gauge(name, help_text="", **labels):
+    return registry.gauge(name, help_text, **labels)
+
+def histogram(name, help_text="", **labels):
+    return registry.histogram(name, help_text, **labels)
+
+def cache_lookup(cache, hit):
+    """Count one lookup against a named cache"""
+    counter("echoverse_cache_requests_total", "Cache lookups by cache and result",
+            cache=cache, result="hit" if hit else "miss").inc()
+
+def cache_hit_ratios():
+    """Return {cache name: (hits, total)} from the cache counters"""
+    ratios = {}
+    for name, labels, metric in registry.collect():
+        if name != "echoverse_cache_requests_total":
+            continue
+        hits, total = ratios.get(labels["cache"], (0, 0))
+        if labels["result"] == "hit":
+            hits += metric.value
+        ratios[labels["cache"]] = (hits, total + metric.value)
+    return ratios
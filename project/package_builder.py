@@ -0,0 +1,126 @@
+"""
+EchoVerse Package Builder
+Streams audiobook packages straight to disk instead of building them in memory
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import time
+import zipfile
+from config import PACKAGE_DIR, PACKAGE_COPY_BUFFER_SIZE, PACKAGE_MAX_AGE
+
+# Audio formats are already compressed (or not worth deflating), so they are stored as-is
+STORED_EXTENSIONS = (".mp3", ".wav", ".ogg", ".m4a", ".flac")
+
+class PackageBuilder:
+    def __init__(self, package_dir=None, package_path=None):
+        if package_path:
+            # Explicit destination, e.g. the headless batch runner's output directory
+            self.package_dir = os.path.dirname(os.path.abspath(package_path))
+            os.makedirs(self.package_dir, exist_ok=True)
+            self.path = package_path
+            self._file = open(package_path, "wb")
+        else:
+            self.package_dir = package_dir or PACKAGE_DIR
+            os.makedirs(self.package_dir, exist_ok=True)
+            cleanup_old_packages(self.package_dir)
+
+            fd, self.path = tempfile.mkstemp(prefix="echoverse_package_", suffix=".zip", dir=self.package_dir)
+            self._file = os.fdopen(fd, "wb")
+        self._zip = zipfile.ZipFile(self._file, "w", zipfile.ZIP_DEFLATED)
+        self.entries = []
+
+    def _compress_type(self, arcname):
+        """Store audio uncompressed and deflate everything else"""
+        if arcname.lower().endswith(STORED_EXTENSIONS):
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+
+    def add_file(self, arcname, source_path):
+        """Stream a file from disk into the package in fixed-size blocks"""
+        info = zipfile.ZipInfo.from_file(source_path, arcname)
+        info.compress_type = self._compress_type(arcname)
+
+        with open(source_path, "rb") as source, self._zip.open(info, "w", force_zip64=True) as target:
+            shutil.copyfileobj(source, target, PACKAGE_COPY_BUFFER_SIZE)
+
+        self.entries.append(arcname)
+
+    def add_bytes(self, arcname, data):
+        """Add in-memory data (text or bytes) to the package"""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        self._zip.writestr(arcname, data, compress_type=self._compress_type(arcname))
+        self.entries.append(arcname)
+
+    def add_audio(self, audio_info, basename="audiobook"):
+        """Add generated audio, preferring the file on disk over the in-memory copy"""
+        if not audio_info:
+            return None
+
+        audio_format = audio_info.get("format", "wav")
+        arcname = f"{basename}.{audio_format}"
+        audio_file = audio_info.get("audio_file")
+
+        if audio_file and os.path.exists(audio_file):
+            self.add_file(arcname, audio_file)
+        elif audio_info.get("audio_data"):
+            self.add_bytes(arcname, audio_info["audio_data"])
+        else:
+            return None
+
+        return arcname
+
+    def add_json(self, arcname, payload):
+        """Add a JSON document to the package"""
+        self.add_bytes(arcname, json.dumps(payload, indent=2))
+
+    def close(self):
+        """Finish the archive and return the path of the package on disk"""
+        if self._zip is not None:
+            self._zip.close()
+            self._file.close()
+            self._zip = None
+        return self.path
+
+    def discard(self):
+        """Close and remove a partially written package"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.discard()
+        else:
+            self.close()
+        return False
+
+
+def cleanup_old_packages(package_dir=None, max_age=PACKAGE_MAX_AGE):
+    """Remove packages older than max_age seconds"""
+    package_dir = package_dir or PACKAGE_DIR
+    cutoff = time.time() - max_age
+
+    try:
+        names = os.listdir(package_dir)
+    except OSError:
+        return
+
+    for name in names:
+        if not (name.startswith("echoverse_package_") and name.endswith(".zip")):
+            continue
+        path = os.path.join(package_dir, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,216 @@
+"""
+EchoVerse Rerun Profiler
+Opt-in cProfile + stack sampling around each Streamlit rerun, kept per page
+"""
+
+import os
+import sys
+import json
+import time
+import marshal
+import pstats
+import cProfile
+import threading
+from collections import deque
+from contextlib import contextmanager
+from config import PROFILING_ENABLED, PROFILE_TOP_N, PROFILE_HISTORY, PROFILE_SAMPLE_INTERVAL, PROFILE_LOG_FILE, RELEASE
+
+_profiles = {}
+_lock = threading.Lock()
+
+class RerunProfile:
+    """Profile of one rerun: cProfile stats, sampled stacks and the top-N functions"""
+
+    def __init__(self):
+        self.page = "Unknown"
+        self.started_at = time.time()
+        self.duration = 0.0
+        self.top = []
+        self.stats = {}
+        self.frames = []
+        self.samples = []
+        self.weights = []
+
+    def to_pstats(self):
+        """Serialize in the format written by pstats.Stats.dump_stats (loadable with pstats/snakeviz)"""
+        return marshal.dumps(self.stats)
+
+    def to_speedscope(self):
+        """Serialize the sampled stacks as a speedscope JSON document"""
+        return json.dumps({
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"EchoVerse rerun – {self.page}",
+            "exporter": "echoverse-profiler",
+            "shared": {"frames": [{"name": name, "file": file, "line": line} for name, file, line in self.frames]},
+            "profiles": [{
+                "type": "sampled",
+                "name": self.page,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(self.weights),
+                "samples": self.samples,
+                "weights": self.weights
+            }]
+        })
+
+    def summary(self):
+        return {
+            "page": self.page,
+            "release": RELEASE,
+            "started_at": self.started_at,
+            "duration": round(self.duration, 4),
+            "top": self.top[:5]
+        }
+
+
+class StackSampler(threading.Thread):
+    """Samples the stack of one thread at a fixed interval for speedscope output"""
+
+    def __init__(self, thread_id, interval=PROFILE_SAMPLE_INTERVAL):
+        super().__init__(name="echoverse-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.frame_index = {}
+        self.frames = []
+        self.samples = []
+        self.weights = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        last = time.perf_counter()
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                key = (code.co_name, code.co_filename, code.co_firstlineno)
+                if key not in self.frame_index:
+                    self.frame_index[key] = len(self.frames)
+                    self.frames.append(key)
+                stack.append(self.frame_index[key])
+                frame = frame.f_back
+
+            stack.reverse()  # speedscope wants root first
+            self.samples.append(stack)
+            self.weights.append(round(now - last, 6))
+            last = now
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def is_profiling_enabled(session_state=None):
+    """Profiling is on when ECHOVERSE_PROFILE is set or an admin toggled it for their session"""
+    return PROFILING_ENABLED or bool(session_state and session_state.get("profiling_enabled"))
+
+def _top_functions(stats, limit):
+    """Return the functions with the most self time"""
+    rows = []
+    for (file, line, name), (_, ncalls, tottime, cumtime, _) in stats.items():
+        if file == __file__:
+            continue
+        rows.append({
+            "function": f"{os.path.basename(file)}:{line}({name})" if line else name,
+            "calls": ncalls,
+            "self_time": round(tottime, 6),
+            "cumulative_time": round(cumtime, 6)
+        })
+    rows.sort(key=lambda row: row["self_time"], reverse=True)
+    return rows[:limit]
+
+def _log_summary(profile):
+    try:
+        with open(PROFILE_LOG_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(profile.summary(), ensure_ascii=False) + "\n")
+    except OSError:
+        pass
+
+@contextmanager
+def profile_rerun(enabled=True):
+    """Profile the enclosed rerun; set .page on the yielded profile once the page is known"""
+    profile = RerunProfile()
+    if not enabled:
+        yield profile
+        return
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12+ allows one cProfile per process; another session is already profiling
+        yield profile
+        return
+
+    sampler = StackSampler(threading.get_ident())
+    sampler.start()
+    started = time.perf_counter()
+
+    try:
+        yield profile
+    finally:
+        # Also runs when Streamlit ends the script early with st.rerun()/st.stop()
+        profiler.disable()
+        profile.duration = time.perf_counter() - started
+        sampler.stop()
+
+        stats = pstats.Stats(profiler).stats
+        profile.stats = stats
+        profile.top = _top_functions(stats, PROFILE_TOP_N)
+        profile.frames = sampler.frames
+        profile.samples = sampler.samples
+        profile.weights = sampler.weights
+
+        with _lock:
+            _profiles.setdefault(profile.page, deque(maxlen=PROFILE_HISTORY)).append(profile)
+        _log_summary(profile)
+
+def get_profiles(page=None):
+    """Return recent profiles for one page, or {page: [profiles]} for all pages"""
+    with _lock:
+        if page is not None:
+            return list(_profiles.get(page, []))
+        return {name: list(profiles) for name, profiles in _profiles.items()}
+
+def page_summary():
+    """Rolling rerun cost per page: count, latest, median and worst duration"""
+    rows = []
+    for page, profiles in sorted(get_profiles().items()):
+        durations = sorted(profile.duration for profile in profiles)
+        rows.append({
+            "page": page,
+            "reruns": len(durations),
+            "latest_ms": round(profiles[-1].duration * 1000, 1),
+            "median_ms": round(durations[len(durations) // 2] * 1000, 1),
+            "max_ms": round(durations[-1] * 1000, 1)
+        })
+    return rows
+
+def compare_latest(page):
+    """Compare each top function of the latest rerun of a page with the previous rerun"""
+    profiles = get_profiles(page)
+    if not profiles:
+        return []
+
+    latest = profiles[-1]
+    previous = {row["function"]: row for row in profiles[-2].top} if len(profiles) > 1 else {}
+
+    rows = []
+    for row in latest.top:
+        before = previous.get(row["function"])
+        rows.append({
+            "function": row["function"],
+            "calls": row["calls"],
+            "self_ms": round(row["self_time"] * 1000, 2),
+            "cumulative_ms": round(row["cumulative_time"] * 1000, 2),
+            "self_delta_ms": round((row["self_time"] - before["self_time"]) * 1000, 2) if before else None
+        })
+    return rows
+
+def clear_profiles():
+    with _lock:
+        _profiles.clear()
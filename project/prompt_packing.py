@@ -0,0 +1,165 @@
+"""
+EchoVerse Prompt Packing
+Small Gemini rewrite jobs from one owner that arrive together go out as one request and are split back per job
+"""
+
+import json
+import threading
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import Future
+from config import PACK_WINDOW, PACK_MAX_JOBS, PACK_MAX_CHARS
+import metrics
+
+SECTION_START = "<<<TEXT {}>>>"
+SECTION_END = "<<<END {}>>>"
+
+_packer = None
+_packer_lock = threading.Lock()
+_scope = contextvars.ContextVar("echoverse_pack_scope", default=None)
+_active = {}
+_active_lock = threading.Lock()
+
+
+@contextmanager
+def packing_scope(scope):
+    """Mark work done for one owner, e.g. one file of a batch job; only jobs in the same scope are packed together"""
+    token = _scope.set(scope)
+    with _active_lock:
+        _active[scope] = _active.get(scope, 0) + 1
+    try:
+        yield
+    finally:
+        with _active_lock:
+            _active[scope] -= 1
+            if not _active[scope]:
+                del _active[scope]
+        _scope.reset(token)
+
+def _peers(scope):
+    """Other units of work running in the same scope"""
+    with _active_lock:
+        return _active.get(scope, 0) - 1
+
+
+def build_packed_prompt(texts, tone):
+    """One prompt holding every text in its own numbered, delimited section"""
+    sections = "\n\n".join(f"{SECTION_START.format(i)}\n{text}\n{SECTION_END.format(i)}"
+                           for i, text in enumerate(texts, 1))
+    return f"""Enhance each of the {len(texts)} texts below with {tone} tone. Add details and make each engaging for audio. Keep each concise but improved. Treat every section on its own and do not merge them.
+Answer with a JSON array of exactly {len(texts)} strings: the enhanced version of text 1 first, then text 2, and so on.
+
+{sections}"""
+
+def packed_schema(count):
+    """Gemini responseSchema for a list of exactly count strings"""
+    return {"type": "ARRAY", "items": {"type": "STRING"}, "minItems": count, "maxItems": count}
+
+def parse_packed_response(result, count):
+    """The enhanced texts from a Gemini response, or None unless it is a complete list of count strings"""
+    try:
+        candidate = result["candidates"][0]
+        if candidate.get("finishReason") == "MAX_TOKENS":
+            return None
+        texts = json.loads(candidate["content"]["parts"][0]["text"])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+
+    if not isinstance(texts, list) or len(texts) != count:
+        return None
+    if not all(isinstance(text, str) and text.strip() for text in texts):
+        return None
+    return [text.strip() for text in texts]
+
+
+class _Batch:
+    def __init__(self):
+        self.texts = []
+        self.futures = []
+        self.chars = 0
+        self.closed = threading.Event()
+
+    def fits(self, text):
+        return len(self.texts) < PACK_MAX_JOBS and self.chars + len(text) <= PACK_MAX_CHARS
+
+
+class PromptPacker:
+    """Collects small jobs for PACK_WINDOW seconds and sends them as one packed request.
+
+    Jobs are only packed inside a packing_scope(), and only with jobs of the same
+    scope and key (tone, intensity, language), so one owner's text never shares
+    a prompt with another's. The first job opens a batch and waits for the
+    window, or until every peer in the scope has joined or the batch is full,
+    then sends it with its own send function. Every job gets its enhanced text,
+    or None when it was alone or the packed answer could not be split, in which
+    case the caller makes its usual single request. A job with no scope, or no
+    peers running in its scope, returns None at once instead of waiting.
+    """
+
+    def __init__(self, window=PACK_WINDOW):
+        self.window = window
+        self._open = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, text, send):
+        """send(texts) -> list of enhanced texts or None; runs once per batch, on the first job's thread"""
+        scope = _scope.get()
+        peers = _peers(scope) if scope is not None else 0
+        if peers < 1:
+            return None
+
+        key = (scope, key)
+        future = Future()
+        with self._lock:
+            batch = self._open.get(key)
+            if batch is not None and not batch.fits(text):
+                self._close(key, batch)
+                batch = None
+
+            leader = batch is None
+            if leader:
+                batch = self._open[key] = _Batch()
+            batch.texts.append(text)
+            batch.futures.append(future)
+            batch.chars += len(text)
+            if len(batch.texts) >= min(PACK_MAX_JOBS, peers + 1):
+                self._close(key, batch)
+
+        if leader:
+            batch.closed.wait(self.window)
+            with self._lock:
+                self._close(key, batch)
+            self._flush(batch, send)
+        return future.result()
+
+    def _close(self, key, batch):
+        if self._open.get(key) is batch:
+            del self._open[key]
+        batch.closed.set()
+
+    def _flush(self, batch, send):
+        count = len(batch.texts)
+        results = None
+        if count > 1:
+            try:
+                results = send(list(batch.texts))
+            except Exception:
+                results = None
+            metrics.counter("echoverse_packed_requests_total", "Packed Gemini requests by outcome",
+                            outcome="ok" if results else "fallback").inc()
+            if results:
+                metrics.counter("echoverse_packed_jobs_total", "Rewrite jobs answered by a packed request").inc(count)
+
+        for index, future in enumerate(batch.futures):
+            future.set_result(results[index] if results else None)
+
+
+def get_packer():
+    """The process-wide packer, created on first use"""
+    global _packer
+
+    if _packer is None:
+        with _packer_lock:
+            if _packer is None:
+                _packer = PromptPacker()
+    return _packer
@@ -0,0 +1,200 @@
+"""
+EchoVerse Provider Rate Limits
+Process-wide concurrency caps shared by every caller of the external providers
+"""
+
+import time
+import threading
+from email.utils import parsedate_to_datetime
+from contextlib import contextmanager
+from config import MAX_PROVIDER_CONCURRENCY, PROVIDER_CONCURRENCY
+from config import ADAPTIVE_CONCURRENCY, ADAPTIVE_BACKOFF, ADAPTIVE_DECREASE_INTERVAL
+import metrics
+
+OVERLOAD_STATUSES = (429, 503)
+
+
+class AdaptiveLimit:
+    """How many calls to one provider may be in flight, adjusted by AIMD.
+
+    Every successful call adds 1/limit (about +1 per round of calls); a 429, 503
+    or timeout multiplies the limit by ADAPTIVE_BACKOFF, at most once per
+    ADAPTIVE_DECREASE_INTERVAL so one burst of rejections counts once. A
+    Retry-After (or Hugging Face estimated_time) also holds back new calls until
+    it has passed.
+    """
+
+    def __init__(self, provider, initial, maximum, minimum=1, adaptive=ADAPTIVE_CONCURRENCY):
+        self.provider = provider
+        self.maximum = max(maximum, minimum)
+        self.minimum = minimum
+        self.limit = float(min(max(initial, minimum), self.maximum))
+        self.adaptive = adaptive
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while True:
+                pause = self.paused_until - time.monotonic()
+                if pause <= 0 and self.in_flight < int(self.limit):
+                    break
+                self._condition.wait(timeout=pause if pause > 0 else None)
+            self.in_flight += 1
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self):
+        if not self.adaptive:
+            return
+        with self._condition:
+            previous = int(self.limit)
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            if int(self.limit) > previous:
+                self._condition.notify_all()
+
+    def on_overload(self, reason, retry_after=None):
+        now = time.monotonic()
+        with self._condition:
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+            if self.adaptive and now - self._last_decrease >= ADAPTIVE_DECREASE_INTERVAL:
+                self.limit = max(self.minimum, self.limit * ADAPTIVE_BACKOFF)
+                self._last_decrease = now
+        metrics.counter("echoverse_provider_throttled_total", "Provider calls rejected or timed out under load",
+                        provider=self.provider, reason=reason).inc()
+
+
+class ProviderSlot:
+    """Handed to the caller inside provider_slot() to report how the provider answered"""
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self.observed = False
+
+    def observe(self, response):
+        """Feed an HTTP response into the limit; returns the delay the provider asked for, if any"""
+        self.observed = True
+        if response.status_code in OVERLOAD_STATUSES:
+            retry_after = retry_after_seconds(response)
+            if self.limiter is not None:
+                self.limiter.on_overload(str(response.status_code), retry_after)
+            return retry_after
+        if response.status_code < 400 and self.limiter is not None:
+            self.limiter.on_success()
+        return None
+
+
+# One global cap across all providers plus one adaptive cap per provider
+_global_slots = threading.BoundedSemaphore(MAX_PROVIDER_CONCURRENCY)
+_provider_limits = {
+    provider: AdaptiveLimit(provider, limit, MAX_PROVIDER_CONCURRENCY)
+    for provider, limit in PROVIDER_CONCURRENCY.items()
+}
+
+@contextmanager
+def provider_slot(provider):
+    """Hold a global and a per-provider slot for the duration of one outbound call.
+
+    Yields a ProviderSlot; callers pass the HTTP response to slot.observe() so
+    the provider's limit can adapt. A call that ends without observe() counts as
+    a success, and a timeout counts as overload.
+
+    Also records how long callers waited for a slot, how many calls are in
+    flight and how long each call took, per provider.
+    """
+    limiter = _provider_limits.get(provider)
+    waiting = metrics.gauge("echoverse_provider_waiting", "Callers queued for a provider slot", provider=provider)
+    in_flight = metrics.gauge("echoverse_provider_in_flight", "Provider calls currently running", provider=provider)
+    limit_gauge = metrics.gauge("echoverse_provider_limit", "Maximum concurrent calls per provider", provider=provider)
+    limit_gauge.set(provider_limit(provider))
+
+    queued_at = time.perf_counter()
+    waiting.inc()
+    try:
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            _global_slots.acquire()
+        except BaseException:
+            if limiter is not None:
+                limiter.release()
+            raise
+    finally:
+        waiting.dec()
+
+    started = time.perf_counter()
+    metrics.histogram("echoverse_provider_wait_seconds", "Time spent waiting for a provider slot",
+                      provider=provider).observe(started - queued_at)
+    in_flight.inc()
+    slot = ProviderSlot(limiter)
+    outcome = "ok"
+    try:
+        yield slot
+    except BaseException as e:
+        outcome = "error"
+        if limiter is not None and _is_timeout(e):
+            limiter.on_overload("timeout")
+        raise
+    else:
+        if limiter is not None and not slot.observed:
+            limiter.on_success()
+    finally:
+        in_flight.dec()
+        metrics.histogram("echoverse_provider_latency_seconds", "Provider call latency",
+                          provider=provider).observe(time.perf_counter() - started)
+        metrics.counter("echoverse_provider_calls_total", "Provider calls by outcome",
+                        provider=provider, outcome=outcome).inc()
+        _global_slots.release()
+        if limiter is not None:
+            limiter.release()
+        limit_gauge.set(provider_limit(provider))
+
+def provider_limit(provider):
+    """Return how many concurrent calls are currently allowed for a provider"""
+    limiter = _provider_limits.get(provider)
+    return min(int(limiter.limit), MAX_PROVIDER_CONCURRENCY) if limiter else MAX_PROVIDER_CONCURRENCY
+
+def provider_max_limit(provider):
+    """Return the most concurrent calls a provider's limit can grow to"""
+    limiter = _provider_limits.get(provider)
+    return limiter.maximum if limiter else MAX_PROVIDER_CONCURRENCY
+
+def retry_after_seconds(response):
+    """Seconds the provider asked callers to wait: Retry-After (seconds or HTTP date) or HF estimated_time"""
+    header = response.headers.get("Retry-After")
+    if header:
+        try:
+            return max(float(header), 0.0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(header).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                pass
+
+    if "json" in response.headers.get("Content-Type", ""):
+        try:
+            estimated = response.json().get("estimated_time")
+        except (ValueError, AttributeError):
+            estimated = None
+        if isinstance(estimated, (int, float)):
+            return max(float(estimated), 0.0)
+    return None
+
+def _is_timeout(error):
+    """True for socket and requests timeouts, also when a caller re-raised one as its own error"""
+    try:
+        from requests.exceptions import Timeout
+    except ImportError:
+        Timeout = TimeoutError
+
+    while error is not None:
+        if isinstance(error, (TimeoutError, Timeout)):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
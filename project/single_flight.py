@@ -0,0 +1,74 @@
+"""
+EchoVerse Single-Flight
+Concurrent identical provider calls in one process share a single in-flight call
+"""
+
+import json
+import hashlib
+import threading
+from concurrent.futures import Future
+from config import SINGLE_FLIGHT_ENABLED
+import metrics
+
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+def make_key(*parts):
+    """Stable digest of a call's inputs, hashed the same way batch job ids are"""
+    encoded = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class SingleFlightGroup:
+    """Calls keyed by their inputs; while one is running, callers with the same key wait for its result.
+
+    Nothing is kept after the call returns: this only merges calls that overlap
+    in time. A failure is raised in every caller that was waiting on it.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        metrics.cache_lookup(f"in_flight_{self.name}", not leader)
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+def get_group(name):
+    group = _groups.get(name)
+    if group is None:
+        with _groups_lock:
+            group = _groups.setdefault(name, SingleFlightGroup(name))
+    return group
+
+def coalesce(name, key_parts, fn):
+    """Run fn() once for all concurrent callers passing the same name and key_parts"""
+    if not SINGLE_FLIGHT_ENABLED:
+        return fn()
+    return get_group(name).do(make_key(*key_parts), fn)
@@ -22,8 +22,8 @@ def test_audio_generation():
     if st.button("🎵 Generate Test Audio"):
         if test_text.strip():
             with st.spinner("Generating audio..."):
-                # Generate audio using fallback method
-                audio_result = ai_manager._generate_speech_fallback(test_text)
+                # Generate audio on the best available TTS backend
+                audio_result = ai_manager.generate_speech(test_text)
                 
                 if audio_result:
                     st.success("✅ Audio generated successfully!")
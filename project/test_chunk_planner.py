@@ -0,0 +1,73 @@
+"""
+Tests for the EchoVerse chunk planner
+Run with: python -m pytest test_chunk_planner.py
+"""
+
+from chunk_planner import plan_chunks, join_chunks, max_chunk_chars
+
+ENGLISH_PARAGRAPH = "The quick brown fox jumps over the lazy dog. " * 40
+CHINESE_SENTENCE = "这是一个很长的句子，用来测试分块功能。"
+JAPANESE_SENTENCE = "これは分割の動作を確かめるための長い文です！"
+
+def _assert_fits(text, chunks):
+    limit = max_chunk_chars(text, "Neutral", "Medium")
+    assert "".join(chunks) == text
+    assert all(len(chunk.rstrip()) <= limit for chunk in chunks)
+
+def test_short_text_is_one_chunk():
+    text = "A short paragraph."
+    assert plan_chunks(text, "Neutral", "Medium") == [text]
+
+def test_english_splits_at_paragraphs():
+    text = "\n\n".join([ENGLISH_PARAGRAPH.strip()] * 8)
+    chunks = plan_chunks(text, "Neutral", "Medium")
+
+    assert len(chunks) > 1
+    _assert_fits(text, chunks)
+    assert all(chunk.endswith("\n\n") for chunk in chunks[:-1])
+
+def test_long_english_paragraph_splits_at_sentences():
+    text = ENGLISH_PARAGRAPH * 6
+    chunks = plan_chunks(text, "Neutral", "Medium")
+
+    assert len(chunks) > 1
+    _assert_fits(text, chunks)
+    assert all(chunk.rstrip().endswith(".") for chunk in chunks)
+
+def test_chinese_splits_at_sentence_terminators():
+    text = CHINESE_SENTENCE * 300
+    chunks = plan_chunks(text, "Neutral", "Medium")
+
+    assert len(chunks) > 1
+    _assert_fits(text, chunks)
+    assert all(chunk.endswith("。") for chunk in chunks)
+
+def test_japanese_exclamation_ends_a_sentence():
+    text = JAPANESE_SENTENCE * 300
+    chunks = plan_chunks(text, "Neutral", "Medium")
+
+    assert len(chunks) > 1
+    _assert_fits(text, chunks)
+    assert all(chunk.endswith("！") for chunk in chunks)
+
+def test_text_without_spaces_or_terminators_is_sliced():
+    text = "あ" * 5000
+    chunks = plan_chunks(text, "Neutral", "Medium")
+
+    assert len(chunks) > 1
+    _assert_fits(text, chunks)
+
+def test_join_restores_paragraph_breaks():
+    chunks = ["First paragraph.\n\n", "Second one. ", "Third."]
+    assert join_chunks(chunks, ["First!", "Second!", "Third!"]) == "First!\n\nSecond! Third!"
+
+def test_join_adds_no_space_between_cjk_chunks():
+    text = CHINESE_SENTENCE * 300
+    chunks = plan_chunks(text, "Neutral", "Medium")
+    assert join_chunks(chunks, chunks) == text
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -4,7 +4,7 @@ Test script for Google Gemini API
 
 import requests
 import json
-from config import GOOGLE_GEMINI_API_KEY
+from config import GOOGLE_GEMINI_API_KEY, GOOGLE_GEMINI_API_BASE, GEMINI_MODEL
 
 def test_gemini_api():
     api_key = GOOGLE_GEMINI_API_KEY
@@ -16,7 +16,7 @@ def test_gemini_api():
         print("❌ No API key found")
         return
     
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={api_key}"
+    url = f"{GOOGLE_GEMINI_API_BASE}/{GEMINI_MODEL}:generateContent?key={api_key}"
     
     payload = {
         "contents": [{
@@ -4,7 +4,6 @@ Handles text input, file uploads, and text preprocessing
 """
 
 import streamlit as st
-import PyPDF2
 import io
 import re
 from utils import extract_text_from_pdf, chunk_text, detect_chapters, generate_summary
@@ -0,0 +1,255 @@
+"""
+EchoVerse Tracing
+Lightweight span-based timing for the generation pipeline, kept in memory and optionally exported as JSONL
+
+Usage (with ECHOVERSE_TRACE_FILE set):
+    python tracing.py              # waterfall of the most recent trace
+    python tracing.py <trace_id>   # waterfall of a specific trace
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import functools
+import threading
+import contextvars
+from collections import OrderedDict
+from contextlib import contextmanager
+from config import TRACING_ENABLED, TRACE_FILE, TRACE_FILE_MAX_BYTES, TRACE_BUFFER_TRACES
+
+_current_span = contextvars.ContextVar("echoverse_current_span", default=None)
+_write_lock = threading.Lock()
+_trace_file = None
+_recent = OrderedDict()
+_recent_lock = threading.Lock()
+
+class Span:
+    """One timed operation; attributes hold payload size, chunk index, retries, cache hits..."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start", "end", "attributes", "status")
+
+    def __init__(self, name, trace_id, parent_id=None, attributes=None):
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time()
+        self.end = None
+        self.attributes = dict(attributes or {})
+        self.status = "ok"
+
+    def set(self, **attributes):
+        """Attach attributes to the span"""
+        self.attributes.update(attributes)
+
+    def increment(self, key, amount=1):
+        """Bump a counter attribute such as retries"""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    @property
+    def duration(self):
+        return (self.end or time.time()) - self.start
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration": self.duration,
+            "status": self.status,
+            "thread": threading.current_thread().name,
+            "attributes": self.attributes
+        }
+
+
+class _NoopSpan:
+    """Returned when tracing is disabled so call sites never need to check"""
+
+    trace_id = None
+    span_id = None
+
+    def set(self, **attributes):
+        pass
+
+    def increment(self, key, amount=1):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+def _export(span):
+    """Keep a finished span in the recent-trace buffer and append it to the trace file, if one is configured"""
+    record = span.to_dict()
+    with _recent_lock:
+        spans = _recent.get(span.trace_id)
+        if spans is None:
+            spans = _recent[span.trace_id] = []
+            while len(_recent) > TRACE_BUFFER_TRACES:
+                _recent.popitem(last=False)
+        spans.append(record)
+
+    if TRACE_FILE:
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with _write_lock:
+            _write_line(line)
+
+def _write_line(line):
+    """Append to the open trace file, moving it to <file>.1 once it reaches TRACE_FILE_MAX_BYTES"""
+    global _trace_file
+
+    if _trace_file is not None and _trace_file.tell() >= TRACE_FILE_MAX_BYTES:
+        _trace_file.close()
+        _trace_file = None
+        os.replace(TRACE_FILE, TRACE_FILE + ".1")
+    if _trace_file is None:
+        _trace_file = open(TRACE_FILE, "a", encoding="utf-8")
+    _trace_file.write(line + "\n")
+    _trace_file.flush()
+
+@contextmanager
+def span(name, **attributes):
+    """Time a block as a child of the current span (or as a new trace root)"""
+    if not TRACING_ENABLED:
+        yield _NOOP_SPAN
+        return
+
+    parent = _current_span.get()
+    current = Span(
+        name,
+        trace_id=parent.trace_id if parent else uuid.uuid4().hex[:16],
+        parent_id=parent.span_id if parent else None,
+        attributes=attributes
+    )
+    token = _current_span.set(current)
+
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "error"
+        current.attributes["error"] = str(e)[:200]
+        raise
+    finally:
+        current.end = time.time()
+        _current_span.reset(token)
+        try:
+            _export(current)
+        except OSError:
+            pass
+
+def traced(name):
+    """Decorator that wraps every call of a function in a span"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def current_span():
+    """Return the active span, or a no-op span outside any trace"""
+    return _current_span.get() or _NOOP_SPAN
+
+def current_trace_id():
+    return current_span().trace_id
+
+def run_in_context(fn, *args, **kwargs):
+    """Bind fn to the caller's trace so spans from worker threads nest correctly"""
+    context = contextvars.copy_context()
+    return lambda: context.run(fn, *args, **kwargs)
+
+def get_trace(trace_id):
+    """Spans of a recent trace recorded in this process, from memory"""
+    with _recent_lock:
+        return list(_recent.get(trace_id, []))
+
+def load_traces(trace_file=None):
+    """Read all spans from the trace file grouped by trace id, in file order"""
+    traces = {}
+    path = trace_file or TRACE_FILE
+    if not path or not os.path.exists(path):
+        return traces
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            traces.setdefault(record["trace_id"], []).append(record)
+    return traces
+
+def waterfall_rows(spans):
+    """Order spans depth-first from the root and compute offsets relative to the trace start"""
+    if not spans:
+        return []
+
+    children = {}
+    for record in spans:
+        children.setdefault(record["parent_id"], []).append(record)
+    for siblings in children.values():
+        siblings.sort(key=lambda record: record["start"])
+
+    trace_start = min(record["start"] for record in spans)
+    known_ids = {record["span_id"] for record in spans}
+    roots = [record for record in spans if record["parent_id"] not in known_ids]
+    roots.sort(key=lambda record: record["start"])
+
+    rows = []
+
+    def visit(record, depth):
+        rows.append({
+            "name": record["name"],
+            "depth": depth,
+            "offset": record["start"] - trace_start,
+            "duration": record["duration"],
+            "status": record["status"],
+            "attributes": record.get("attributes", {})
+        })
+        for child in children.get(record["span_id"], []):
+            visit(child, depth + 1)
+
+    for root in roots:
+        visit(root, 0)
+    return rows
+
+def format_waterfall(spans, width=50):
+    """Render a trace as a text waterfall"""
+    rows = waterfall_rows(spans)
+    if not rows:
+        return "No spans recorded."
+
+    total = max(row["offset"] + row["duration"] for row in rows) or 1e-9
+    lines = []
+    for row in rows:
+        start_col = int(row["offset"] / total * width)
+        bar_len = max(1, int(row["duration"] / total * width))
+        bar = " " * start_col + "█" * bar_len
+        label = ("  " * row["depth"] + row["name"])[:32]
+        marker = " ✗" if row["status"] == "error" else ""
+        lines.append(f"{label:<32} {bar:<{width}} {row['duration'] * 1000:9.1f} ms{marker}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    """Print the waterfall for a trace"""
+    argv = sys.argv[1:] if argv is None else argv
+    traces = load_traces()
+    if not traces:
+        print(f"No traces found in {TRACE_FILE}" if TRACE_FILE else "Set ECHOVERSE_TRACE_FILE to export traces")
+        return 1
+
+    trace_id = argv[0] if argv else list(traces)[-1]
+    if trace_id not in traces:
+        print(f"Trace {trace_id} not found")
+        return 1
+
+    print(f"Trace {trace_id}")
+    print(format_waterfall(traces[trace_id]))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""
+EchoVerse TTS Backends
+Speech synthesis engines behind one interface, picked per request by availability and observed latency
+"""
+
+import io
+import os
+import time
+import wave
+import shutil
+import tempfile
+import threading
+import subprocess
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from config import LANGUAGE_OPTIONS, VOICE_OPTIONS, VOICE_GENDERS
+from config import TTS_BACKENDS, TTS_LATENCY_BUDGET, TTS_BACKEND_COOLDOWN
+from config import ESPEAK_BINARY, ESPEAK_WORKERS, ESPEAK_SEGMENT_CHARS, ESPEAK_RATE
+from tracing import span, run_in_context
+import metrics
+
+class TTSBackendError(RuntimeError):
+    """A backend could not synthesize the request"""
+
+
+class TTSBackend:
+    """One speech engine; subclasses implement available() and synthesize()"""
+
+    name = ""
+    label = ""
+    format = "wav"
+    offline = False
+    max_chars = None  # longer text is truncated before synthesis
+    languages = None  # language names the engine speaks; None means all of LANGUAGE_OPTIONS
+
+    def available(self):
+        return False
+
+    def supports(self, language):
+        return self.languages is None or language in self.languages
+
+    def synthesize(self, text, voice, language):
+        """Return the audio bytes for text; raise on failure"""
+        raise NotImplementedError
+
+
+class GoogleTTSBackend(TTSBackend):
+    """gTTS over the network, with its token parts fetched in parallel"""
+
+    name = "gtts"
+    label = "Google TTS"
+    format = "mp3"
+    max_chars = 10000
+
+    def available(self):
+        return _module_installed("gtts")
+
+    def synthesize(self, text, voice, language):
+        from gtts import gTTS
+        from gtts_client import get_client as get_gtts_client
+
+        try:
+            tts = gTTS(text=text, lang=LANGUAGE_OPTIONS.get(language, "en"), slow=False, tld="com")
+        except ValueError:
+            # Language not supported by this gTTS version
+            tts = gTTS(text=text, lang="en", slow=False, tld="com")
+
+        with span("gtts.write", request_bytes=len(text)) as tts_span:
+            audio_data = get_gtts_client().synthesize(tts)
+            tts_span.set(bytes=len(audio_data))
+        return audio_data
+
+
+class ESpeakBackend(TTSBackend):
+    """espeak-ng run as local processes; long text is split and the segments are spoken in parallel"""
+
+    name = "espeak"
+    label = "eSpeak NG"
+    offline = True
+    VOICES = {
+        "English": "en", "Spanish": "es", "Hindi": "hi", "French": "fr", "German": "de",
+        "Italian": "it", "Portuguese": "pt", "Chinese": "cmn", "Japanese": "ja", "Korean": "ko"
+    }
+    languages = tuple(VOICES)
+
+    def __init__(self, binary=ESPEAK_BINARY, workers=ESPEAK_WORKERS, segment_chars=ESPEAK_SEGMENT_CHARS):
+        self.binary = binary
+        self.workers = max(workers, 1)
+        self.segment_chars = segment_chars
+        self.variants = _voice_variants()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def available(self):
+        return shutil.which(self.binary) is not None
+
+    def synthesize(self, text, voice, language):
+        from utils import chunk_text
+
+        espeak_voice = self.VOICES.get(language, "en")
+        variant = self.variants.get(str(voice).lower())
+        if variant:
+            espeak_voice = f"{espeak_voice}+{variant}"
+
+        segments = chunk_text(text, self.segment_chars)
+        with span("espeak.synthesize", segments=len(segments), workers=self.workers):
+            if len(segments) == 1:
+                parts = [self._speak(segments[0], espeak_voice)]
+            else:
+                executor = self._get_executor()
+                futures = [executor.submit(run_in_context(self._speak, segment, espeak_voice)) for segment in segments]
+                parts = [future.result() for future in futures]
+        return join_wav(parts)
+
+    def _speak(self, text, espeak_voice):
+        """One espeak-ng process for one segment; returns WAV bytes"""
+        result = subprocess.run(
+            [self.binary, "--stdout", "-v", espeak_voice, "-s", str(ESPEAK_RATE)],
+            input=text.encode("utf-8"), capture_output=True, timeout=max(30, len(text) / 20)
+        )
+        if result.returncode != 0 or not result.stdout:
+            raise TTSBackendError(f"espeak-ng failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+        return result.stdout
+
+    def _get_executor(self):
+        # Each segment runs in its own process; these threads only wait on them
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="echoverse-espeak")
+            return self._executor
+
+
+class Pyttsx3Backend(TTSBackend):
+    """The system speech engine through the warm pyttsx3 pool"""
+
+    name = "pyttsx3"
+    label = "Windows TTS"
+    offline = True
+    max_chars = 3000
+
+    def available(self):
+        return _module_installed("pyttsx3")
+
+    def synthesize(self, text, voice, language):
+        from tts_pool import get_pool as get_offline_tts_pool
+
+        # pyttsx3 can only write files, so read the audio back and remove the file
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
+        temp_file.close()
+        try:
+            get_offline_tts_pool().synthesize(text, voice, temp_file.name)
+            with open(temp_file.name, "rb") as f:
+                return f.read()
+        finally:
+            if os.path.exists(temp_file.name):
+                os.remove(temp_file.name)
+
+
+class TTSBackendRegistry:
+    """Registered backends in preference order (TTS_BACKENDS), with per-backend health.
+
+    select() keeps the configured order but moves a backend to the back while it
+    is cooling down after a failure, or while its recent speed is worse than
+    TTS_LATENCY_BUDGET seconds per 1,000 characters.
+    """
+
+    def __init__(self, order=None, latency_budget=TTS_LATENCY_BUDGET, cooldown=TTS_BACKEND_COOLDOWN):
+        self.order = list(order or [])
+        self.latency_budget = latency_budget
+        self.cooldown = cooldown
+        self._backends = {}
+        self._health = {}
+        self._available = {}
+        self._lock = threading.Lock()
+
+    def register(self, backend):
+        with self._lock:
+            self._backends[backend.name] = backend
+            self._health.setdefault(backend.name, {"seconds_per_1k": None, "failed_at": None, "calls": 0, "failures": 0})
+        return backend
+
+    def names(self):
+        """Enabled backend names: the configured order, or registration order if none is configured"""
+        return [name for name in self.order or list(self._backends) if name in self._backends]
+
+    def get(self, name):
+        return self._backends.get(name)
+
+    def is_available(self, name):
+        """Availability is probed once per process; installing an engine needs a restart"""
+        if name not in self._available:
+            backend = self._backends.get(name)
+            self._available[name] = bool(backend and backend.available())
+        return self._available[name]
+
+    def select(self, language):
+        """Available backends that speak language, best first"""
+        now = time.time()
+        candidates = [self._backends[name] for name in self.names()
+                      if self.is_available(name) and self._backends[name].supports(language)]
+
+        def rank(backend):
+            health = self._health[backend.name]
+            cooling = health["failed_at"] is not None and now - health["failed_at"] < self.cooldown
+            slow = health["seconds_per_1k"] is not None and health["seconds_per_1k"] > self.latency_budget
+            return (cooling, slow)
+
+        return sorted(candidates, key=rank)  # stable, so ties keep the configured order
+
+    def record(self, name, seconds, chars, ok):
+        """Feed one call's outcome into the backend's health"""
+        with self._lock:
+            health = self._health[name]
+            health["calls"] += 1
+            if not ok:
+                health["failures"] += 1
+                health["failed_at"] = time.time()
+                return
+
+            health["failed_at"] = None
+            rate = seconds * 1000 / max(chars, 1)
+            previous = health["seconds_per_1k"]
+            health["seconds_per_1k"] = rate if previous is None else 0.7 * previous + 0.3 * rate
+
+        metrics.histogram("echoverse_tts_backend_seconds", "Speech synthesis time by backend", backend=name).observe(seconds)
+
+    def stats(self):
+        with self._lock:
+            return {
+                name: dict(self._health[name], available=self.is_available(name), offline=self._backends[name].offline)
+                for name in self.names()
+            }
+
+
+def join_wav(parts):
+    """Concatenate WAV files that share one format into a single WAV"""
+    if len(parts) == 1:
+        return parts[0]
+
+    frames = []
+    params = None
+    for part in parts:
+        with wave.open(io.BytesIO(part), "rb") as wav_file:
+            params = params or wav_file.getparams()
+            frames.append(wav_file.readframes(wav_file.getnframes()))
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(params.nchannels)
+        wav_file.setsampwidth(params.sampwidth)
+        wav_file.setframerate(params.framerate)
+        wav_file.writeframes(b"".join(frames))
+    return buffer.getvalue()
+
+def _voice_variants():
+    """espeak-ng voice variant per EchoVerse voice, so each name sounds different"""
+    variants = {}
+    used = {"female": 0, "male": 0}
+    for name in VOICE_OPTIONS:
+        gender = VOICE_GENDERS.get(name, "female")
+        used[gender] += 1
+        variants[name.lower()] = f"{gender[0]}{used[gender]}"
+    return variants
+
+def _module_installed(module):
+    return importlib.util.find_spec(module) is not None
+
+
+registry = TTSBackendRegistry(TTS_BACKENDS)
+registry.register(GoogleTTSBackend())
+registry.register(ESpeakBackend())
+registry.register(Pyttsx3Backend())
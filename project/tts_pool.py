@@ -0,0 +1,220 @@
+"""
+EchoVerse Offline TTS Pool
+Warm pyttsx3 engines with a cached voice map, so the offline fallback skips engine start-up
+"""
+
+import os
+import re
+import time
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from config import VOICE_OPTIONS, VOICE_GENDERS, OFFLINE_TTS_ENGINES, OFFLINE_TTS_MAX_USES, OFFLINE_TTS_TIMEOUT
+from config import OFFLINE_TTS_RATE, OFFLINE_TTS_VOLUME
+import metrics
+
+_pool = None
+_pool_lock = threading.Lock()
+
+class OfflineTTSError(RuntimeError):
+    """The offline engine failed, produced no audio or timed out"""
+
+
+def create_engine():
+    """Start one pyttsx3 engine; pyttsx3.init() would hand every caller the same shared instance"""
+    import pyttsx3
+
+    engine = pyttsx3.Engine()
+    engine.setProperty("rate", OFFLINE_TTS_RATE)
+    engine.setProperty("volume", OFFLINE_TTS_VOLUME)
+    return engine
+
+def voice_gender(voice):
+    """'female', 'male' or None for a pyttsx3 voice, from its gender attribute or its name"""
+    description = f"{getattr(voice, 'gender', '') or ''} {getattr(voice, 'name', '') or ''}".lower()
+    if "female" in description:
+        return "female"
+    if re.search(r"(?<!fe)male", description):
+        return "male"
+    return None
+
+def build_voice_map(voices):
+    """Map each VOICE_OPTIONS key to an engine voice id of the right gender.
+
+    Names of the same gender are spread over the matching engine voices, so
+    Lisa, Allison and Emma sound different when the system has several.
+    """
+    by_gender = {"female": [], "male": []}
+    for voice in voices or []:
+        gender = voice_gender(voice)
+        if gender:
+            by_gender[gender].append(voice.id)
+
+    voice_map = {}
+    used = {"female": 0, "male": 0}
+    for name in VOICE_OPTIONS:
+        gender = VOICE_GENDERS.get(name)
+        candidates = by_gender.get(gender)
+        if candidates:
+            voice_map[name.lower()] = candidates[used[gender] % len(candidates)]
+            used[gender] += 1
+    return voice_map
+
+
+class _EngineWorker(threading.Thread):
+    """Owns one engine for its whole life; speech engines are not safe to share across threads"""
+
+    def __init__(self, pool, index):
+        super().__init__(name=f"echoverse-tts-{index}", daemon=True)
+        self.pool = pool
+        self.engine = None
+        self.uses = 0
+        self.current = None
+        self.abandoned = False
+
+    def run(self):
+        # Start the engine before the first job so it is warm when one arrives
+        try:
+            self._ensure_engine()
+        except Exception:
+            pass
+
+        while not self.abandoned:
+            job = self.pool._jobs.get()
+            if job is None:
+                break
+
+            future, text, voice, path = job
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            self.current = future
+            try:
+                future.set_result(self._synthesize(text, voice, path))
+            except Exception as e:
+                self._recycle("failed")
+                future.set_exception(e)
+            finally:
+                self.current = None
+
+        self._recycle("shutdown" if not self.abandoned else "stuck")
+
+    def _ensure_engine(self):
+        if self.engine is None:
+            self.engine = self.pool.engine_factory()
+            self.uses = 0
+            self.pool._learn_voices(self.engine)
+            metrics.gauge("echoverse_offline_tts_engines", "Warm offline TTS engines").inc()
+        return self.engine
+
+    def _synthesize(self, text, voice, path):
+        engine = self._ensure_engine()
+        voice_id = self.pool.voice_map.get(str(voice).lower())
+        if voice_id:
+            engine.setProperty("voice", voice_id)
+
+        with metrics.histogram("echoverse_offline_tts_seconds", "Offline TTS synthesis time").time():
+            engine.save_to_file(text, path)
+            engine.runAndWait()
+
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            raise OfflineTTSError("Offline TTS engine produced no audio")
+
+        self.uses += 1
+        if self.uses >= self.pool.max_uses:
+            self._recycle("max_uses")
+        return path
+
+    def _recycle(self, reason):
+        """Drop the engine; the next job starts a fresh one"""
+        if self.engine is None:
+            return
+        try:
+            self.engine.stop()
+        except Exception:
+            pass
+        self.engine = None
+        metrics.gauge("echoverse_offline_tts_engines", "Warm offline TTS engines").dec()
+        metrics.counter("echoverse_offline_tts_recycles_total", "Offline TTS engines discarded", reason=reason).inc()
+
+
+class OfflineTTSPool:
+    """A fixed number of engine threads taking synthesis jobs from one queue"""
+
+    def __init__(self, size=OFFLINE_TTS_ENGINES, max_uses=OFFLINE_TTS_MAX_USES, timeout=OFFLINE_TTS_TIMEOUT,
+                 engine_factory=create_engine):
+        self.size = max(size, 1)
+        self.max_uses = max(max_uses, 1)
+        self.timeout = timeout
+        self.engine_factory = engine_factory
+        self.voice_map = {}
+        self._voices_known = False
+        self._jobs = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def warm(self):
+        """Start the engine threads (idempotent); each one initializes its engine straight away"""
+        with self._lock:
+            self._workers = [worker for worker in self._workers if worker.is_alive() and not worker.abandoned]
+            while len(self._workers) < self.size:
+                worker = _EngineWorker(self, len(self._workers))
+                worker.start()
+                self._workers.append(worker)
+
+    def synthesize(self, text, voice, path, timeout=None):
+        """Write speech for text to path (WAV) on a warm engine; raises OfflineTTSError on failure"""
+        self.warm()
+        future = Future()
+        queued_at = time.perf_counter()
+        self._jobs.put((future, text, voice, path))
+
+        try:
+            return future.result(timeout=timeout or self.timeout)
+        except FutureTimeout:
+            if not future.cancel():
+                self._replace_stuck_worker(future)
+            raise OfflineTTSError(f"Offline TTS timed out after {time.perf_counter() - queued_at:.0f}s")
+
+    def _replace_stuck_worker(self, future):
+        """An engine that hangs in runAndWait cannot be interrupted; abandon its thread and start another"""
+        with self._lock:
+            for worker in self._workers:
+                if worker.current is future:
+                    worker.abandoned = True
+        self.warm()
+
+    def _learn_voices(self, engine):
+        """Enumerate the system voices once for the whole pool"""
+        with self._lock:
+            if self._voices_known:
+                return
+            self.voice_map = build_voice_map(engine.getProperty("voices"))
+            self._voices_known = True
+
+    def stats(self):
+        with self._lock:
+            workers = [worker for worker in self._workers if not worker.abandoned]
+        return {
+            "engines": len([worker for worker in workers if worker.engine is not None]),
+            "busy": len([worker for worker in workers if worker.current is not None]),
+            "queued": self._jobs.qsize(),
+            "voices": dict(self.voice_map)
+        }
+
+    def shutdown(self):
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for _ in workers:
+            self._jobs.put(None)
+
+
+def get_pool():
+    """The process-wide pool, created on first use"""
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = OfflineTTSPool()
+    return _pool
@@ -8,12 +8,18 @@ import json
 import base64
 import io
 import time
-import PyPDF2
-import streamlit as st
 from config import *
+from rate_limits import provider_slot
+from events import StreamlitSink
+from tracing import span
+from hedging import hedged
+from single_flight import coalesce
 
-def extract_text_from_pdf(pdf_file):
+def extract_text_from_pdf(pdf_file, event_sink=None):
     """Extract text from uploaded PDF file"""
+    import PyPDF2
+
+    events = event_sink or StreamlitSink()
     try:
         pdf_reader = PyPDF2.PdfReader(pdf_file)
         text = ""
@@ -21,9 +27,17 @@ def extract_text_from_pdf(pdf_file):
             text += page.extract_text() + "\n"
         return text.strip()
     except Exception as e:
-        st.error(f"Error reading PDF: {str(e)}")
+        events.error(f"Error reading PDF: {str(e)}", stage="extract")
         return None
 
+def configure_gtts_endpoint():
+    """Send gTTS requests to GTTS_API_BASE (e.g. the fake provider server) instead of translate.google.*"""
+    if not GTTS_API_BASE:
+        return
+
+    import gtts.tts
+    gtts.tts._translate_url = lambda tld="com", path="": f"{GTTS_API_BASE}/{path}"
+
 def chunk_text(text, max_length=2000):
     """Split text into chunks for processing"""
     words = text.split()
@@ -48,8 +62,9 @@ def chunk_text(text, max_length=2000):
     
     return chunks
 
-def call_huggingface_api(model_name, payload, max_retries=3):
+def call_huggingface_api(model_name, payload, max_retries=3, event_sink=None):
     """Make API call to Hugging Face with retry logic"""
+    events = event_sink or StreamlitSink()
     headers = {
         "Authorization": f"Bearer {HF_API_KEY}",
         "Content-Type": "application/json"
@@ -57,30 +72,54 @@ def call_huggingface_api(model_name, payload, max_retries=3):
     
     url = f"{HF_API_BASE}/{model_name}"
     
+    with span("hf.inference", model=model_name) as call_span:
+        return _call_huggingface_with_retries(url, headers, model_name, payload, max_retries, events, call_span)
+
+def _call_huggingface_with_retries(url, headers, model_name, payload, max_retries, events, call_span):
+    """Retry loop for call_huggingface_api"""
     for attempt in range(max_retries):
+        call_span.set(retries=attempt)
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            started = time.time()
+            response, retry_after = coalesce("huggingface", (url, payload), lambda: hedged(
+                "huggingface", lambda: _post_huggingface(url, headers, payload), lambda result: result[0].status_code == 200
+            ))
+            latency = time.time() - started
+            call_span.set(status_code=response.status_code, response_bytes=len(response.content))
             
-            if response.status_code == 503:
-                # Model is loading, wait and retry
-                time.sleep(10)
+            if response.status_code in (429, 503):
+                # Model is loading or rate limited; the next slot waits out Retry-After/estimated_time
+                events.debug(f"Model {model_name} is busy ({response.status_code}), retrying...", stage="hf_api",
+                             provider="huggingface", latency=latency)
+                if retry_after is None:
+                    time.sleep(10)
                 continue
             elif response.status_code == 200:
+                events.debug(f"Hugging Face response from {model_name}", stage="hf_api", provider="huggingface",
+                             latency=latency, bytes=len(response.content))
                 return response.json()
             else:
-                st.error(f"API Error: {response.status_code} - {response.text}")
+                events.error(f"API Error: {response.status_code} - {response.text}", stage="hf_api",
+                             provider="huggingface", latency=latency)
                 return None
                 
         except requests.exceptions.Timeout:
-            st.warning(f"Request timeout, retrying... (Attempt {attempt + 1}/{max_retries})")
+            events.warning(f"Request timeout, retrying... (Attempt {attempt + 1}/{max_retries})", stage="hf_api",
+                           provider="huggingface")
             time.sleep(5)
         except Exception as e:
-            st.error(f"API call failed: {str(e)}")
+            events.error(f"API call failed: {str(e)}", stage="hf_api", provider="huggingface")
             return None
     
-    st.error("Failed to get response after multiple attempts")
+    events.error("Failed to get response after multiple attempts", stage="hf_api", provider="huggingface")
     return None
 
+def _post_huggingface(url, headers, payload):
+    """One Hugging Face request; returns (response, retry_after)"""
+    with provider_slot("huggingface") as slot:
+        response = requests.post(url, headers=headers, json=payload, timeout=30)
+        return response, slot.observe(response)
+
 def rewrite_text_with_tone(text, tone, intensity):
     """Rewrite text with specified tone and intensity using IBM Granite model"""
     if not text.strip():